@@ -0,0 +1,304 @@
+# Almacenes de la caché de listas (CACHE_BACKEND)
+# CacheListas guarda siempre las listas en un LRU dentro de cada proceso; el almacén
+# decide dónde viven las versiones de cada clave y si las listas se comparten:
+# - "local": todo queda en el proceso (un solo worker, o workers independientes)
+# - "mmap": archivos en memoria compartida (/dev/shm) para los workers de una máquina
+# - "redis": un servidor Redis (o compatible) para los workers de varias máquinas
+# Invalidar una clave incrementa su versión en el almacén y cada worker compara la
+# versión de su copia antes de usarla: crear/actualizar/eliminar en un worker
+# invalida la lista en todos. Las listas se guardan serializadas con pickle, así
+# que el directorio o el servidor Redis deben ser de confianza (uso interno).
+import fcntl
+import mmap
+import os
+import pickle
+import socket
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from urllib.parse import quote, unquote, urlsplit
+
+from circuito import Circuito
+
+# Cabecera de cada lista compartida: versión de la clave y momento en que se guardó
+_CABECERA = struct.Struct("<Qd")
+
+
+def _serializar(version, datos):
+    return _CABECERA.pack(version, time.time()) + pickle.dumps(datos, pickle.HIGHEST_PROTOCOL)
+
+
+def _deserializar(contenido):
+    version, guardado = _CABECERA.unpack_from(contenido)
+    return version, guardado, pickle.loads(memoryview(contenido)[_CABECERA.size:])
+
+
+class AlmacenLocal:
+    """
+    Almacén del proceso: solo lleva las versiones; las listas quedan en el LRU de CacheListas.
+    Métodos que implementan todos los almacenes:
+    - version(clave) / invalidar(clave): versión actual / incrementarla
+    - leer(clave): (versión, momento time.time(), datos) guardados por cualquier worker, o None
+    - guardar(clave, version, datos, duracion): compartir la lista durante "duracion" segundos
+    """
+    compartido = False
+
+    def __init__(self):
+        self._versiones = {}
+        self._candado = threading.Lock()
+
+    def version(self, clave):
+        return self._versiones.get(clave, 0)
+
+    def invalidar(self, clave):
+        with self._candado:
+            self._versiones[clave] = self._versiones.get(clave, 0) + 1
+
+    def leer(self, clave):
+        return None
+
+    def guardar(self, clave, version, datos, duracion):
+        pass
+
+
+class AlmacenMmap:
+    """
+    Almacén en memoria compartida para los workers de una misma máquina.
+    - Las versiones son contadores de 8 bytes en un archivo mapeado con mmap que
+      todos los procesos leen sin llamadas al sistema; cada clave usa la ranura
+      crc32(clave) % ranuras (dos claves en la misma ranura se invalidan juntas).
+    - Cada lista es un archivo que se reemplaza de forma atómica (os.replace) y
+      se lee con mmap.
+    El directorio por defecto está en /dev/shm (memoria, no disco) si existe.
+    """
+    compartido = True
+
+    def __init__(self, directorio="", ranuras=1024):
+        if not directorio:
+            base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+            directorio = os.path.join(base, "cache_listas")
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        self.ranuras = ranuras
+        self._pid = None
+        self._archivo = None
+        self._versiones = None
+        self._candado = threading.Lock()
+
+    def _abrir(self):
+        # Se abre de nuevo en cada proceso: flock no excluye a procesos que comparten el descriptor
+        if self._pid == os.getpid():
+            return
+        with self._candado:
+            if self._pid == os.getpid():
+                return
+            archivo = open(os.path.join(self.directorio, "versiones"), "a+b")
+            fcntl.flock(archivo, fcntl.LOCK_EX)
+            try:
+                if os.fstat(archivo.fileno()).st_size < 8 * self.ranuras:
+                    archivo.truncate(8 * self.ranuras)
+            finally:
+                fcntl.flock(archivo, fcntl.LOCK_UN)
+            self._archivo = archivo
+            self._versiones = mmap.mmap(archivo.fileno(), 8 * self.ranuras)
+            self._pid = os.getpid()
+
+    def _posicion(self, clave):
+        return 8 * (zlib.crc32(clave.encode("utf-8")) % self.ranuras)
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, "lista-" + quote(clave, safe=""))
+
+    def version(self, clave):
+        self._abrir()
+        return struct.unpack_from("<Q", self._versiones, self._posicion(clave))[0]
+
+    def invalidar(self, clave):
+        self._abrir()
+        posicion = self._posicion(clave)
+        fcntl.flock(self._archivo, fcntl.LOCK_EX)
+        try:
+            actual = struct.unpack_from("<Q", self._versiones, posicion)[0]
+            struct.pack_into("<Q", self._versiones, posicion, actual + 1)
+        finally:
+            fcntl.flock(self._archivo, fcntl.LOCK_UN)
+
+    def leer(self, clave):
+        try:
+            with open(self._ruta(clave), "rb") as archivo, \
+                    mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as contenido:
+                return _deserializar(contenido)
+        except (FileNotFoundError, ValueError):
+            # ValueError: archivo vacío (no se puede mapear)
+            return None
+
+    def guardar(self, clave, version, datos, duracion):
+        ruta = self._ruta(clave)
+        temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}"
+        with open(temporal, "wb") as archivo:
+            archivo.write(_serializar(version, datos))
+        os.replace(temporal, ruta)
+
+
+def _codificar_comando(partes):
+    """
+    Comando en formato RESP: un arreglo de cadenas binarias.
+    """
+    mensaje = [b"*%d\r\n" % len(partes)]
+    for parte in partes:
+        if not isinstance(parte, bytes):
+            parte = str(parte).encode("utf-8")
+        mensaje.append(b"$%d\r\n%s\r\n" % (len(parte), parte))
+    return b"".join(mensaje)
+
+
+class ErrorRedis(Exception):
+    """
+    Respuesta de error (-ERR ...) del servidor Redis.
+    """
+
+
+class AlmacenRedis:
+    """
+    Almacén en un servidor Redis (o compatible, ver herramientas/redis_falso.py)
+    para los workers de varias máquinas. Habla el protocolo RESP directamente
+    sobre un socket, sin dependencias, con una conexión por hilo y por proceso.
+    - Versión de una clave: "<prefijo>:version:<clave>" (INCR al invalidar)
+    - Lista: "<prefijo>:lista:<clave>", que Redis borra sola al pasar "duracion" (PX)
+    Con "circuito" (circuito.Circuito), si el servidor no responde se deja de
+    intentar durante un tiempo en lugar de esperar el timeout en cada petición.
+    """
+    compartido = True
+
+    def __init__(self, url="redis://localhost:6379/0", prefijo="cache_listas", timeout=0.5, circuito=None):
+        partes = urlsplit(url)
+        self.servidor = (partes.hostname or "localhost", partes.port or 6379)
+        self.clave_acceso = unquote(partes.password) if partes.password else None
+        self.base = int(partes.path.lstrip("/") or 0)
+        self.prefijo = prefijo
+        self.timeout = timeout
+        self.circuito = circuito
+        self._local = threading.local()
+
+    # ------------------- Protocolo RESP -------------------
+    def _conexion(self):
+        pid, conexion = getattr(self._local, "conexion", (None, None))
+        if pid != os.getpid():
+            conexion = socket.create_connection(self.servidor, timeout=self.timeout)
+            conexion.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._local.conexion = (os.getpid(), conexion)
+            self._local.lector = conexion.makefile("rb")
+            if self.clave_acceso:
+                conexion.sendall(_codificar_comando(("AUTH", self.clave_acceso)))
+                self._respuesta(self._local.lector)
+            if self.base:
+                conexion.sendall(_codificar_comando(("SELECT", self.base)))
+                self._respuesta(self._local.lector)
+        return conexion
+
+    def _comando(self, *partes):
+        """
+        Envía un comando y retorna la respuesta (bytes, int, lista o None).
+        Ante un error de red o una respuesta que no se pudo leer se cierra la
+        conexión para abrir otra en la siguiente llamada: si quedara abierta, la
+        parte sin leer se tomaría como la respuesta del próximo comando.
+        """
+        if self.circuito is not None:
+            self.circuito.antes()
+        try:
+            self._conexion().sendall(_codificar_comando(partes))
+            respuesta = self._respuesta(self._local.lector)
+        except ErrorRedis:
+            # Un -ERR también es una respuesta completa: el servidor funciona
+            if self.circuito is not None:
+                self.circuito.exito()
+            raise
+        except Exception:
+            self._cerrar()
+            if self.circuito is not None:
+                self.circuito.fallo()
+            raise
+        if self.circuito is not None:
+            self.circuito.exito()
+        return respuesta
+
+    def _respuesta(self, lector):
+        linea = lector.readline()
+        if not linea.endswith(b"\r\n"):
+            raise ConnectionError("El servidor Redis cerró la conexión")
+        tipo, contenido = linea[:1], linea[1:-2]
+        if tipo == b"+":
+            return contenido
+        if tipo == b"-":
+            raise ErrorRedis(contenido.decode("utf-8", "replace"))
+        if tipo == b":":
+            return int(contenido)
+        if tipo == b"$":
+            largo = int(contenido)
+            if largo < 0:
+                return None
+            valor = lector.read(largo + 2)
+            if len(valor) < largo + 2:
+                raise ConnectionError("El servidor Redis cerró la conexión")
+            return valor[:-2]
+        if tipo == b"*":
+            cantidad = int(contenido)
+            if cantidad < 0:
+                return None
+            # Un error dentro de la lista se lanza después de leerla completa
+            elementos, error = [], None
+            for _ in range(cantidad):
+                try:
+                    elementos.append(self._respuesta(lector))
+                except ErrorRedis as e:
+                    elementos.append(None)
+                    error = error or e
+            if error is not None:
+                raise error
+            return elementos
+        raise ConnectionError(f"Respuesta RESP inválida: {linea!r}")
+
+    def _cerrar(self):
+        _, conexion = getattr(self._local, "conexion", (None, None))
+        self._local.conexion = (None, None)
+        if conexion is not None:
+            self._local.lector.close()
+            conexion.close()
+
+    # ------------------- Almacén -------------------
+    def version(self, clave):
+        valor = self._comando("GET", f"{self.prefijo}:version:{clave}")
+        return int(valor) if valor is not None else 0
+
+    def invalidar(self, clave):
+        self._comando("INCR", f"{self.prefijo}:version:{clave}")
+
+    def leer(self, clave):
+        contenido = self._comando("GET", f"{self.prefijo}:lista:{clave}")
+        return None if contenido is None else _deserializar(contenido)
+
+    def guardar(self, clave, version, datos, duracion):
+        self._comando(
+            "SET", f"{self.prefijo}:lista:{clave}", _serializar(version, datos),
+            "PX", max(int(duracion * 1000), 1)
+        )
+
+
+def crear_almacen(config):
+    """
+    Crea el almacén indicado en CACHE_BACKEND ("local", "mmap" o "redis").
+    """
+    tipo = config["CACHE_BACKEND"]
+    if tipo == "local":
+        return AlmacenLocal()
+    if tipo == "mmap":
+        return AlmacenMmap(config["CACHE_DIRECTORIO"])
+    if tipo == "redis":
+        circuito = None
+        if config["CIRCUITO_FALLOS"] > 0:
+            circuito = Circuito("cache_redis", config["CIRCUITO_FALLOS"], config["CIRCUITO_ESPERA"])
+        return AlmacenRedis(config["CACHE_REDIS_URL"], config["CACHE_PREFIJO"], config["CACHE_REDIS_TIMEOUT"],
+                            circuito)
+    raise ValueError(f"CACHE_BACKEND debe ser 'local', 'mmap' o 'redis', no {tipo!r}")
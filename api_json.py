@@ -0,0 +1,75 @@
+# Modo JSON de las rutas de entidades, para scripts y tableros internos
+# Los mismos listados de las vistas HTML (réplica, caché, paginación) se pueden
+# pedir en JSON con "Accept: application/json" o con el prefijo /api/v1
+# (/api/v1/productos?page=2&size=100, /api/v1/productos/<codigo>), sin pasar por Jinja.
+# Se serializa con orjson si está instalado (pip install orjson), que convierte
+# los modelos directamente; si no, con el módulo json. decodificar() también lo
+# usa para leer las listas completas que responde la API.
+import json
+
+from modelos import Registro
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Prefijo de las rutas JSON: /api/v1/<plural> y /api/v1/<plural>/<codigo>
+PREFIJO_API = "/api/v1"
+
+# Tipos que se comparan con la cabecera Accept; el primero gana ante "*/*"
+TIPOS_ACEPTADOS = ("text/html", "application/json")
+
+
+def _convertir(valor):
+    # Los modelos (ver modelos.py) se escriben como un objeto con sus campos
+    if isinstance(valor, Registro):
+        return dict(zip(valor.__slots__, valor.values()))
+    raise TypeError(f"No se puede convertir a JSON: {type(valor).__name__}")
+
+
+def serializar(valor):
+    """
+    Convierte "valor" (diccionarios, listas, modelos) en JSON codificado en UTF-8.
+    """
+    if orjson is not None:
+        return orjson.dumps(valor)
+    return json.dumps(valor, ensure_ascii=False, separators=(",", ":"), default=_convertir).encode("utf-8")
+
+
+def decodificar(contenido):
+    """
+    Convierte un cuerpo JSON (bytes) en diccionarios y listas de Python.
+    Lanza ValueError si no es JSON válido.
+    """
+    if orjson is not None:
+        return orjson.loads(contenido)
+    return json.loads(contenido)
+
+
+def quiere_json(peticion):
+    """
+    Indica si la petición pide JSON: por el prefijo /api/v1 o porque la
+    cabecera Accept prefiere application/json a text/html (un navegador, o
+    "Accept: */*", recibe HTML).
+    """
+    if peticion.path.startswith(PREFIJO_API + "/"):
+        return True
+    return peticion.accept_mimetypes.best_match(TIPOS_ACEPTADOS) == "application/json"
+
+
+def listado(pagina, desactualizados=False):
+    """
+    Cuerpo JSON de una página de listado (paginacion.Pagina); las filas van en
+    "datos", como en las respuestas de la API.
+    """
+    return {
+        "datos": pagina.filas,
+        "pagina": pagina.pagina,
+        "tamano": pagina.tamano,
+        "total": pagina.total,
+        "paginas": pagina.paginas,
+        "orden": pagina.orden,
+        "q": pagina.q,
+        "desactualizados": desactualizados
+    }
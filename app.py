@@ -1,26 +1,65 @@
 # Importar la clase principal de Flask y la función para renderizar plantillas
 from flask import Flask, render_template
 
-# Importar el Blueprint que contiene las rutas de productos
-from rutas_productos import rutas_productos
-from rutas_clientes import rutas_clientes
-from rutas_facturas import rutas_facturas
-from rutas_vendedores import rutas_vendedores
-from rutas_personas import rutas_personas
-from rutas_empresas import rutas_empresas
+# Configuración central y cliente HTTP compartido por todos los Blueprints
+from configuracion import Configuracion
+from cliente_api import ClienteAPI
+from cache_listas import CacheListas
+from cache_http import pagina_estatica
+from fragmentos import CacheFragmentos
+from metricas import MetricasAplicacion
+from plantillas import configurar_plantillas
+from estaticos import configurar_estaticos
+from compresion import instalar_compresion
+from replica import instalar_replica
+from busqueda import instalar_busqueda
+from tablero import instalar_tablero
+
+# Registro de entidades y fábrica que genera un Blueprint CRUD por cada una
+from entidades import ENTIDADES
+from rutas_entidades import crear_blueprint, listar_registros
 
 
 # Crear la instancia de la aplicación Flask
 aplicacion = Flask(__name__)
+aplicacion.config.from_object(Configuracion)
+
+# ------------------- Cliente de la API -------------------
+# Un único cliente por proceso (worker) con su propio pool de conexiones keep-alive.
+# Las conexiones se abren bajo demanda, así que cada worker crea las suyas tras el fork.
+aplicacion.extensions["cliente_api"] = ClienteAPI.desde_configuracion(aplicacion.config)
+
+# Caché de las listas de cada entidad, compartida por todos los Blueprints del proceso
+aplicacion.extensions["cache_listas"] = CacheListas.desde_configuracion(aplicacion.config)
+
+# HTML ya renderizado de las filas y cuerpos de las tablas (ver fragmentos.py)
+aplicacion.extensions["fragmentos"] = CacheFragmentos.desde_configuracion(aplicacion.config)
+
+# Latencia de cada ruta y tiempo de render de cada plantilla, publicados en /metrics
+MetricasAplicacion().instalar(aplicacion)
+
+# Réplica local de las colecciones (opcional, REPLICA), sincronizada en segundo plano
+instalar_replica(aplicacion, ENTIDADES)
 
 # ------------------- Registro de Blueprints -------------------
-# Registrar el Blueprint de productos en la aplicación principal
-aplicacion.register_blueprint(rutas_productos)
-aplicacion.register_blueprint(rutas_clientes)
-aplicacion.register_blueprint(rutas_facturas)
-aplicacion.register_blueprint(rutas_vendedores)
-aplicacion.register_blueprint(rutas_personas)
-aplicacion.register_blueprint(rutas_empresas)
+# Registrar un Blueprint por cada entidad (productos, clientes, facturas, ...)
+for entidad in ENTIDADES:
+    aplicacion.register_blueprint(crear_blueprint(entidad))
+
+# Índice en memoria para buscar por texto en todas las entidades (/buscar?q=)
+instalar_busqueda(aplicacion, ENTIDADES, listar_registros)
+
+# Resumen de todas las entidades pedidas en paralelo (/tablero)
+instalar_tablero(aplicacion, ENTIDADES, listar_registros)
+
+# Compresión gzip/brotli de las páginas (opcional, COMPRESION_HTML)
+instalar_compresion(aplicacion)
+
+# Servir los estáticos con huella y comprimidos si se ejecutó "python estaticos.py"
+configurar_estaticos(aplicacion)
+
+# Compilar (o leer del bytecode ya generado) todas las plantillas antes de atender peticiones
+configurar_plantillas(aplicacion)
 
 # ------------------- Rutas principales -------------------
 
@@ -28,9 +67,10 @@ aplicacion.register_blueprint(rutas_empresas)
 def inicio():
     """
     Función asociada a la ruta principal (/).
-    Retorna la plantilla index.html.
+    Retorna la plantilla index.html; el navegador puede guardarla (Cache-Control)
+    y revalidarla con su ETag.
     """
-    return render_template("index.html")
+    return pagina_estatica("index.html", lambda: render_template("index.html"))
 
 
 @aplicacion.route("/acerca")
@@ -39,7 +79,24 @@ def acerca():
     Función asociada a la ruta /acerca.
     Retorna la plantilla acerca.html con información sobre el proyecto.
     """
-    return render_template("acerca.html")
+    return pagina_estatica("acerca.html", lambda: render_template("acerca.html"))
+
+
+@aplicacion.route("/metrics")
+def metricas():
+    """
+    Función asociada a la ruta /metrics.
+    Retorna las métricas de las rutas y plantillas, del cliente de la API, su pool,
+    la caché de listas y de fragmentos, la búsqueda, el tablero y la réplica en formato Prometheus.
+    """
+    texto = (aplicacion.extensions["metricas"].metricas()
+             + aplicacion.extensions["cliente_api"].metricas()
+             + aplicacion.extensions["cache_listas"].metricas()
+             + aplicacion.extensions["fragmentos"].metricas())
+    texto += aplicacion.extensions["busqueda"].metricas() + aplicacion.extensions["tablero"].metricas()
+    if "replica" in aplicacion.extensions:
+        texto += aplicacion.extensions["replica"].metricas()
+    return texto, 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
 
 # ---------------------------------------------------------
 
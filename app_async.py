@@ -0,0 +1,104 @@
+# Aplicación en modo ASGI con vistas asíncronas (alternativa a app.py)
+# Usa las mismas entidades, plantillas, caché y paginación que la aplicación WSGI,
+# de modo que se pueden comparar ambos modos con la misma carga.
+# Requiere las dependencias opcionales: pip install quart httpx hypercorn
+# Ejecutar con: hypercorn app_async:aplicacion_async --bind 0.0.0.0:5000
+import time
+
+from quart import Quart, Response, g, render_template, request
+
+from api_json import PREFIJO_API, quiere_json, serializar
+from configuracion import Configuracion
+from cache_listas import CacheListas
+from cliente_api_async import ClienteAPIAsync
+from fragmentos import CacheFragmentos
+from entidades import ENTIDADES
+from plantillas import configurar_plantillas
+from rutas_entidades_async import crear_blueprint_async, en_cache, listar_registros
+from tablero import Tablero
+
+
+# Crear la instancia de la aplicación ASGI
+aplicacion_async = Quart(__name__)
+aplicacion_async.config.from_object(Configuracion)
+
+# Caché de las listas de cada entidad (misma implementación que en app.py)
+aplicacion_async.extensions["cache_listas"] = CacheListas.desde_configuracion(aplicacion_async.config)
+aplicacion_async.extensions["fragmentos"] = CacheFragmentos.desde_configuracion(aplicacion_async.config)
+
+# Resumen de todas las entidades (/tablero), el mismo que en app.py
+tablero = aplicacion_async.extensions["tablero"] = Tablero.desde_configuracion(ENTIDADES, aplicacion_async.config)
+
+# Registrar un Blueprint asíncrono por cada entidad
+for entidad in ENTIDADES:
+    aplicacion_async.register_blueprint(crear_blueprint_async(entidad))
+
+# Mismo bytecode y precarga de plantillas que app.py
+configurar_plantillas(aplicacion_async)
+
+
+# ------------------- Cliente de la API -------------------
+@aplicacion_async.before_serving
+async def abrir_cliente_api():
+    """
+    El cliente httpx se crea dentro del bucle de eventos del servidor,
+    uno por proceso, con su propio pool de conexiones.
+    """
+    aplicacion_async.extensions["cliente_api"] = ClienteAPIAsync.desde_configuracion(aplicacion_async.config)
+
+
+@aplicacion_async.after_serving
+async def cerrar_cliente_api():
+    await aplicacion_async.extensions["cliente_api"].cerrar()
+
+
+# ------------------- Rutas principales -------------------
+@aplicacion_async.route("/")
+async def inicio():
+    return await render_template("index.html")
+
+
+@aplicacion_async.route("/acerca")
+async def acerca():
+    return await render_template("acerca.html")
+
+
+@aplicacion_async.route("/tablero", endpoint="tablero")
+@aplicacion_async.route(f"{PREFIJO_API}/tablero", endpoint="api_tablero")
+async def ver_tablero():
+    """
+    Resumen de todas las entidades; las listas se esperan al mismo tiempo (asyncio.gather).
+    """
+    versiones = await en_cache(tablero.versiones, aplicacion_async.extensions["cache_listas"])
+    datos = tablero.leer(versiones)
+    if datos is None:
+        inicio = time.perf_counter()
+        resumenes = await aplicacion_async.extensions["cliente_api"].en_paralelo(
+            *(tablero.resumen_async(entidad, listar_registros) for entidad in tablero.entidades)
+        )
+        datos = tablero.guardar(versiones, resumenes, time.perf_counter() - inicio,
+                                bool(g.get("datos_desactualizados")))
+
+    if quiere_json(request):
+        respuesta = Response(serializar(datos), mimetype="application/json")
+    else:
+        respuesta = Response(await render_template("tablero.html", tablero=datos), mimetype="text/html")
+    respuesta.vary.add("Accept")
+    return respuesta
+
+
+@aplicacion_async.route("/metrics")
+async def metricas():
+    """
+    Métricas del cliente asíncrono, de la caché y de los fragmentos en formato Prometheus.
+    """
+    texto = (aplicacion_async.extensions["cliente_api"].metricas()
+             + aplicacion_async.extensions["cache_listas"].metricas()
+             + aplicacion_async.extensions["fragmentos"].metricas()
+             + tablero.metricas())
+    return texto, 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+
+# Punto de entrada para desarrollo (en producción usar hypercorn o uvicorn)
+if __name__ == "__main__":
+    aplicacion_async.run(host="0.0.0.0", port=5000)
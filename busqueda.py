@@ -0,0 +1,418 @@
+# Búsqueda por texto y por prefijo en todas las entidades (/buscar?q=)
+# Cada recurso tiene un índice invertido en memoria: término -> códigos de los
+# registros que lo contienen, más la lista ordenada de términos para encontrar
+# por bisección todos los que empiezan con lo que se lleva escrito. El índice se
+# arma con la misma lista que muestran las vistas (réplica, caché o API), se
+# reconstruye en segundo plano cada BUSQUEDA_TTL segundos y crear/actualizar/
+# eliminar lo actualizan al momento.
+import heapq
+import os
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from itertools import chain
+
+from flask import current_app, jsonify, request
+
+from coalescencia import Coalescedor
+
+# Palabras de un valor: letras y dígitos (el correo "ana.gil@x.co" da "ana", "gil", "x", "co")
+_PALABRAS = re.compile(r"\w+")
+_SEPARADORES = re.compile(r"\W+")
+
+# Cómo se resuelve cada palabra de la consulta según los términos que abarca
+# (ver _IndiceRecurso._candidatos): hasta TERMINOS_POR_GRUPO se busca el código en
+# cada uno, hasta TERMINOS_POR_CONJUNTO se reúnen en un set y con más se compara el prefijo
+TERMINOS_POR_GRUPO = 8
+TERMINOS_POR_CONJUNTO = 4096
+
+
+def normalizar(texto):
+    """
+    Minúsculas y sin tildes, para que "José" se encuentre escribiendo "jose".
+    """
+    descompuesto = unicodedata.normalize("NFKD", str(texto).lower())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def terminos(texto):
+    """
+    Términos con los que se indexa un valor: cada palabra y, si es un número con
+    separadores, el número completo ("300-555-1234" también se encuentra como "3005551234").
+    """
+    normalizado = normalizar(texto)
+    palabras = set(_PALABRAS.findall(normalizado))
+    if len(palabras) > 1:
+        compacto = _SEPARADORES.sub("", normalizado)
+        if compacto.isdigit():
+            palabras.add(compacto)
+    return palabras
+
+
+class _IndiceRecurso:
+    """
+    Índice de un recurso. Solo se indexan el código y los campos de texto
+    (nombre, correo, telefono, cliente, fecha, ...): los números no se buscan por prefijo.
+    """
+    __slots__ = ("campos", "registros", "por_registro", "por_termino", "ordenados", "construido")
+
+    def __init__(self, campos):
+        self.campos = campos
+        self.registros = {}
+        self.por_registro = {}
+        self.por_termino = {}
+        self.ordenados = []
+        self.construido = time.monotonic()
+
+    @classmethod
+    def construir(cls, campos, filas):
+        indice = cls(campos)
+        for fila in filas:
+            codigo = str(fila.get("codigo"))
+            indice.registros[codigo] = fila
+            propios = indice.terminos_de(fila)
+            indice.por_registro[codigo] = propios
+            for termino in propios:
+                indice.por_termino.setdefault(termino, set()).add(codigo)
+        indice.ordenados = sorted(indice.por_termino)
+        return indice
+
+    def terminos_de(self, fila):
+        propios = set()
+        for campo in self.campos:
+            valor = fila.get(campo)
+            if valor is not None:
+                propios |= terminos(valor)
+        return frozenset(propios)
+
+    def guardar(self, registro):
+        codigo = str(registro.get("codigo"))
+        self.eliminar(codigo)
+        self.registros[codigo] = registro
+        propios = self.terminos_de(registro)
+        self.por_registro[codigo] = propios
+        for termino in propios:
+            codigos = self.por_termino.get(termino)
+            if codigos is None:
+                self.por_termino[termino] = {codigo}
+                insort(self.ordenados, termino)
+            else:
+                codigos.add(codigo)
+
+    def eliminar(self, codigo):
+        self.registros.pop(codigo, None)
+        for termino in self.por_registro.pop(codigo, ()):
+            codigos = self.por_termino[termino]
+            codigos.discard(codigo)
+            if not codigos:
+                del self.por_termino[termino]
+                del self.ordenados[bisect_left(self.ordenados, termino)]
+
+    def rango(self, prefijo):
+        """
+        Posiciones [inicio, fin) de los términos que empiezan con "prefijo" en la lista ordenada.
+        """
+        inicio = bisect_left(self.ordenados, prefijo)
+        return inicio, bisect_left(self.ordenados, prefijo + "\uffff", inicio)
+
+    def buscar(self, consulta, limite):
+        """
+        Códigos de los registros que tienen, para cada término de la consulta,
+        algún término que empieza con él. Retorna (códigos, hay_mas).
+        Los candidatos salen de _candidatos() y se filtran con las palabras
+        restantes. Se retornan los "limite" primeros por código: el orden de
+        los sets cambia entre procesos y reconstrucciones, así que cortar en el
+        orden en que aparecen daría otra primera página cada vez. heapq solo
+        guarda limite + 1 códigos, sin ordenar todas las coincidencias.
+        """
+        candidatos, grupos, prefijos = self._candidatos(consulta)
+        primeros = heapq.nsmallest(limite + 1, self._coincidencias(candidatos, grupos, prefijos))
+        return primeros[:limite], len(primeros) > limite
+
+    def _coincidencias(self, candidatos, grupos, prefijos):
+        vistos = set()
+        for codigo in candidatos:
+            if codigo in vistos:
+                continue
+            vistos.add(codigo)
+            if not all(any(codigo in codigos for codigos in grupo) for grupo in grupos):
+                continue
+            propios = self.por_registro[codigo]
+            if all(any(t.startswith(prefijo) for t in propios) for prefijo in prefijos):
+                yield codigo
+
+    def _candidatos(self, consulta):
+        """
+        Elige cómo resolver cada palabra según cuántos términos abarca.
+        Retorna (candidatos, grupos, prefijos): los candidatos deben estar en
+        algún conjunto de cada grupo y tener un término que empiece con cada prefijo.
+        - Las palabras de un solo término (la palabra completa) se cruzan con una
+          intersección de sets, en C.
+        - Si no hay dos así, las de hasta TERMINOS_POR_CONJUNTO términos se
+          reúnen en un set para cruzarlas, y si tampoco alcanza se recorren los
+          registros de la palabra más específica.
+        - Las de hasta TERMINOS_POR_GRUPO términos se comprueban buscando el
+          código en cada uno; las más generales ("a"), comparando el prefijo.
+        Si alguna palabra no abarca ningún término no hay candidatos.
+        """
+        rangos = sorted((fin - inicio, inicio, fin, termino)
+                        for termino in consulta for inicio, fin in [self.rango(termino)])
+        if rangos[0][0] == 0:
+            # Una palabra que no empieza ningún término: ningún registro tiene todas
+            return (), [], []
+        unicos = [self.por_termino[self.ordenados[inicio]] for cantidad, inicio, _, _ in rangos if cantidad == 1]
+        if len(unicos) >= 2:
+            grupos = [[self.por_termino[t] for t in self.ordenados[inicio:fin]]
+                      for cantidad, inicio, fin, _ in rangos if 1 < cantidad <= TERMINOS_POR_GRUPO]
+            prefijos = [termino for cantidad, _, _, termino in rangos if cantidad > TERMINOS_POR_GRUPO]
+            return set.intersection(*sorted(unicos, key=len)), grupos, prefijos
+
+        grupos, prefijos = [], []
+        if len(rangos) > 1:
+            for cantidad, inicio, fin, termino in rangos:
+                if cantidad > TERMINOS_POR_CONJUNTO:
+                    prefijos.append(termino)
+                    continue
+                grupo = [self.por_termino[t] for t in self.ordenados[inicio:fin]]
+                grupos.append([set().union(*grupo)] if cantidad > TERMINOS_POR_GRUPO else grupo)
+            conjuntos = sorted((grupo[0] for grupo in grupos if len(grupo) == 1), key=len)
+            if len(conjuntos) >= 2:
+                return set.intersection(*conjuntos), [grupo for grupo in grupos if len(grupo) > 1], prefijos
+            if grupos:
+                grupos.sort(key=lambda grupo: sum(map(len, grupo)))
+                return chain.from_iterable(grupos[0]), grupos[1:], prefijos
+
+        # Una sola palabra, o todas muy generales: se recorren los registros de la más específica
+        _, inicio, fin, termino = rangos[0]
+        candidatos = chain.from_iterable(self.por_termino[self.ordenados[i]] for i in range(inicio, fin))
+        return candidatos, grupos, [prefijo for prefijo in prefijos if prefijo != termino]
+
+
+class IndiceBusqueda:
+    """
+    Índices de búsqueda de todas las entidades del proceso.
+    - cargar(entidad) retorna la lista de la entidad (ver listar_registros()).
+    - precargar() construye todos los índices en un hilo con la primera petición
+      de cada proceso. Un índice
+      que todavía no existe se construye en la petición, una sola vez aunque
+      lleguen varias a la vez (las demás esperan ese mismo índice); uno con más
+      de "ttl" segundos se sigue usando mientras un hilo lo reconstruye.
+    - Una reconstrucción que empezó antes de una escritura se descarta y se
+      repite, igual que en la caché de listas.
+    """
+
+    def __init__(self, entidades, cargar, ttl=30.0):
+        self.entidades = {entidad.plural: entidad for entidad in entidades}
+        self.cargar = cargar
+        self.ttl = ttl
+        self._indices = {}
+        self._versiones = {}
+        self._reconstruyendo = set()
+        self._pid_precarga = None
+        # Construcciones en curso de índices que todavía no existen (single-flight)
+        self._construcciones = Coalescedor()
+        self._candado = threading.Lock()
+        self._contadores = {"consultas": 0, "reconstrucciones": 0, "descartadas": 0}
+
+    @classmethod
+    def desde_configuracion(cls, entidades, cargar, config):
+        return cls(entidades, cargar, ttl=config["BUSQUEDA_TTL"])
+
+    # ------------------- Construcción -------------------
+    def _construir(self, entidad):
+        with self._candado:
+            version = self._versiones.get(entidad.recurso, 0)
+        indice = _IndiceRecurso.construir(["codigo", *_campos_texto(entidad)], self.cargar(entidad))
+        with self._candado:
+            if self._versiones.get(entidad.recurso, 0) != version:
+                self._contadores["descartadas"] += 1
+                # Hubo una escritura mientras se construía: el próximo acceso reconstruye
+                self._indices.setdefault(entidad.recurso, indice).construido = 0.0
+                return indice
+            self._indices[entidad.recurso] = indice
+            self._contadores["reconstrucciones"] += 1
+        return indice
+
+    def _construir_unico(self, entidad):
+        # Las peticiones y el hilo de precarga que piden el mismo índice comparten una construcción
+        return self._construcciones.ejecutar(entidad.recurso, lambda: self._construir(entidad))
+
+    def precargar(self, aplicacion):
+        """
+        Construye en un hilo los índices de todas las entidades, uno tras otro,
+        para que la primera búsqueda no pague la construcción. Las entidades
+        cuya lista no se puede cargar se construyen en la primera búsqueda.
+        Se llama en cada petición y solo arranca el hilo una vez por proceso;
+        retorna ese hilo o None si ya se había arrancado.
+        """
+        if self._pid_precarga == os.getpid():
+            return None
+        with self._candado:
+            if self._pid_precarga == os.getpid():
+                return None
+            self._pid_precarga = os.getpid()
+
+        def construir_todos():
+            for entidad in self.entidades.values():
+                # Los que ya construyó una búsqueda no se vuelven a pedir a la API
+                if entidad.recurso in self._indices:
+                    continue
+                try:
+                    with aplicacion.app_context():
+                        self._construir_unico(entidad)
+                except Exception:
+                    pass
+
+        hilo = threading.Thread(target=construir_todos, name="busqueda_precarga", daemon=True)
+        hilo.start()
+        return hilo
+
+    def _reconstruir(self, aplicacion, entidad):
+        try:
+            with aplicacion.app_context():
+                self._construir(entidad)
+        except Exception:
+            pass
+        finally:
+            with self._candado:
+                self._reconstruyendo.discard(entidad.recurso)
+
+    def indice(self, entidad):
+        """
+        Retorna el índice de la entidad, construyéndolo si todavía no existe.
+        """
+        with self._candado:
+            indice = self._indices.get(entidad.recurso)
+            if indice is not None:
+                if (time.monotonic() - indice.construido >= self.ttl
+                        and entidad.recurso not in self._reconstruyendo):
+                    self._reconstruyendo.add(entidad.recurso)
+                    threading.Thread(
+                        target=self._reconstruir, args=(current_app._get_current_object(), entidad),
+                        daemon=True
+                    ).start()
+                return indice
+        return self._construir_unico(entidad)
+
+    # ------------------- Escrituras -------------------
+    def guardar(self, recurso, registro):
+        with self._candado:
+            self._versiones[recurso] = self._versiones.get(recurso, 0) + 1
+            indice = self._indices.get(recurso)
+            if indice is not None:
+                indice.guardar(registro)
+
+    def eliminar(self, recurso, codigo):
+        with self._candado:
+            self._versiones[recurso] = self._versiones.get(recurso, 0) + 1
+            indice = self._indices.get(recurso)
+            if indice is not None:
+                indice.eliminar(str(codigo))
+
+    def solicitar(self, recurso):
+        """
+        Marca el índice para reconstruirlo en el próximo acceso (p. ej. después de una importación).
+        """
+        with self._candado:
+            self._versiones[recurso] = self._versiones.get(recurso, 0) + 1
+            indice = self._indices.get(recurso)
+            if indice is not None:
+                indice.construido = 0.0
+
+    # ------------------- Consulta -------------------
+    def buscar(self, texto, plurales=None, limite=20):
+        """
+        Busca "texto" en las entidades indicadas (todas si es None).
+        Retorna (resultados, hay_mas, incompletas): cada resultado es
+        {"entidad", "codigo", "registro"} e "incompletas" son las entidades
+        cuya lista no se pudo cargar.
+        """
+        consulta = sorted(set(_PALABRAS.findall(normalizar(texto))))
+        resultados, hay_mas, incompletas = [], False, []
+        if not consulta:
+            return resultados, hay_mas, incompletas
+
+        for plural in plurales or self.entidades:
+            entidad = self.entidades[plural]
+            try:
+                indice = self.indice(entidad)
+            except Exception:
+                incompletas.append(plural)
+                continue
+            with self._candado:
+                self._contadores["consultas"] += 1
+                codigos, mas = indice.buscar(consulta, limite - len(resultados))
+                resultados += [
+                    {"entidad": plural, "codigo": codigo, "registro": indice.registros[codigo]}
+                    for codigo in codigos
+                ]
+            if mas or len(resultados) >= limite:
+                hay_mas = True
+                break
+        return resultados, hay_mas, incompletas
+
+    # ------------------- Métricas -------------------
+    def metricas(self):
+        """
+        Genera las métricas de la búsqueda en formato de texto de Prometheus.
+        """
+        with self._candado:
+            contadores = dict(self._contadores)
+            tamanos = {recurso: len(indice.ordenados) for recurso, indice in self._indices.items()}
+        lineas = []
+        for nombre, valor in contadores.items():
+            lineas.append(f"# TYPE busqueda_{nombre}_total counter")
+            lineas.append(f"busqueda_{nombre}_total {valor}")
+        lineas.append("# TYPE busqueda_terminos gauge")
+        lineas += [f'busqueda_terminos{{recurso="{r}"}} {n}' for r, n in sorted(tamanos.items())]
+        return "\n".join(lineas) + "\n"
+
+
+def _campos_texto(entidad):
+    return [campo for campo, tipo in entidad.campos.items() if tipo is str]
+
+
+def instalar_busqueda(aplicacion, entidades, cargar):
+    """
+    Crea el índice de búsqueda de la aplicación y registra la ruta /buscar:
+    - q: texto a buscar; cada palabra se compara como prefijo ("ana gi" encuentra "Ana Gil")
+    - entidad: limita la búsqueda a una entidad por su plural (p. ej. "clientes"); se puede repetir
+    - limite: cantidad máxima de resultados (BUSQUEDA_LIMITE por defecto, hasta 100)
+    Con BUSQUEDA_PRECARGAR los índices se empiezan a construir en segundo plano
+    con la primera petición de cada proceso (como la réplica): importar la
+    aplicación no llama a la API.
+    """
+    indice = IndiceBusqueda.desde_configuracion(entidades, cargar, aplicacion.config)
+    aplicacion.extensions["busqueda"] = indice
+
+    if aplicacion.config["BUSQUEDA_PRECARGAR"]:
+        @aplicacion.before_request
+        def precargar_busqueda():
+            indice.precargar(aplicacion)
+
+    @aplicacion.route("/buscar")
+    def buscar():
+        """
+        Función asociada a la ruta /buscar.
+        Retorna en JSON los registros que coinciden con ?q=, para mostrarlos mientras se escribe.
+        """
+        plurales = request.args.getlist("entidad")
+        desconocidas = [plural for plural in plurales if plural not in indice.entidades]
+        if desconocidas:
+            return jsonify(error=f"Entidad desconocida: {', '.join(desconocidas)}"), 400
+        limite = request.args.get("limite", aplicacion.config["BUSQUEDA_LIMITE"], type=int)
+        limite = min(max(limite, 1), 100)
+
+        resultados, hay_mas, incompletas = indice.buscar(request.args.get("q", ""), plurales, limite)
+        return jsonify(resultados=resultados, hay_mas=hay_mas, incompletas=incompletas)
+
+    return indice
+
+
+def obtener_busqueda():
+    """
+    Retorna el índice de búsqueda de la aplicación actual o None si no está instalado.
+    """
+    return current_app.extensions.get("busqueda")
@@ -0,0 +1,79 @@
+# Caché HTTP de las páginas renderizadas: ETag, If-None-Match (304) y Cache-Control
+# El navegador o el proxy inverso guardan la página y preguntan si cambió; si no
+# cambió se responde 304 sin volver a renderizar la plantilla.
+import hashlib
+import json
+
+from flask import current_app, make_response, request
+
+from modelos import Registro
+
+
+def huella_plantillas():
+    """
+    Huella de todas las plantillas de la aplicación (y de los nombres de los
+    estáticos con huella, ver estaticos.py), calculada una vez por proceso.
+    Forma parte de cada ETag para que un despliegue con plantillas o estilos
+    nuevos no responda 304 con una página vieja.
+    """
+    huella = current_app.extensions.get("huella_plantillas")
+    if huella is None:
+        entorno = current_app.jinja_env
+        resumen = hashlib.blake2b(digest_size=8)
+        manifiesto = current_app.extensions.get("manifiesto_estaticos", {})
+        resumen.update(json.dumps(manifiesto, sort_keys=True).encode("utf-8"))
+        for nombre in sorted(entorno.list_templates()):
+            fuente, _, _ = entorno.loader.get_source(entorno, nombre)
+            resumen.update(nombre.encode("utf-8"))
+            resumen.update(fuente.encode("utf-8"))
+        huella = current_app.extensions["huella_plantillas"] = resumen.hexdigest()
+    return huella
+
+
+def _serializar(valor):
+    # Los modelos (ver modelos.py) se resumen con la tupla de sus valores
+    if isinstance(valor, Registro):
+        return valor.values()
+    return str(valor)
+
+
+def etiqueta(*partes):
+    """
+    ETag a partir de los datos que determinan la página (filas, parámetros, ...).
+    Es un hash del contenido, así que todos los workers generan la misma etiqueta
+    para los mismos datos y el 304 funciona aunque cada petición vaya a otro proceso.
+    """
+    contenido = json.dumps([huella_plantillas(), *partes], separators=(",", ":"), default=_serializar)
+    return hashlib.blake2b(contenido.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def respuesta_condicional(etiqueta_pagina, generar, cache_control="no-cache"):
+    """
+    Responde 304 sin llamar a "generar" si el cliente ya tiene la versión
+    "etiqueta_pagina" (If-None-Match); si no, genera la respuesta y le agrega
+    el ETag y el Cache-Control indicados.
+    """
+    if request.if_none_match.contains_weak(etiqueta_pagina):
+        respuesta = current_app.response_class(status=304)
+    else:
+        respuesta = make_response(generar())
+    respuesta.set_etag(etiqueta_pagina)
+    respuesta.headers["Cache-Control"] = cache_control
+    return respuesta
+
+
+def etiqueta_listado(pagina, *extra):
+    """
+    ETag de una página de listado: las filas que muestra, el total y sus
+    parámetros. Solo se serializan las filas de la página, no la lista completa.
+    """
+    return etiqueta(pagina.filas, pagina.total, pagina.parametros(), *extra)
+
+
+def pagina_estatica(plantilla, generar):
+    """
+    Respuesta de una página sin datos de la API (/, /acerca): se puede guardar
+    CACHE_PAGINAS_ESTATICAS segundos sin preguntar y luego se revalida con el ETag.
+    """
+    segundos = current_app.config["CACHE_PAGINAS_ESTATICAS"]
+    return respuesta_condicional(etiqueta(plantilla), generar, f"public, max-age={segundos}")
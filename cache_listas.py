@@ -0,0 +1,267 @@
+# Caché en memoria de las listas completas que retorna la API (una entrada por entidad)
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+from almacenes_cache import AlmacenLocal, crear_almacen
+
+
+class _Entrada:
+    """
+    Lista guardada en la caché junto con la versión de la clave con que se cargó
+    y el momento en que se cargó.
+    """
+    __slots__ = ("datos", "version", "guardado")
+
+    def __init__(self, datos, version, guardado=None):
+        self.datos = datos
+        self.version = version
+        self.guardado = time.monotonic() if guardado is None else guardado
+
+
+class CacheListas:
+    """
+    Caché de listas con tiempo de vida (TTL), límite de memoria y
+    modo stale-while-revalidate.
+    - Cada clave es el recurso de la API ("producto", "factura", ...).
+    - max_filas limita la suma de filas guardadas; se descartan primero
+      las entradas usadas hace más tiempo (LRU).
+    - Con stale > 0, una entrada vencida hace menos de "stale" segundos
+      se sigue sirviendo mientras un hilo en segundo plano la recarga.
+    - invalidar() incrementa la versión de la clave en el almacén (ver
+      almacenes_cache.py) para que la siguiente lectura vaya a la API; una carga
+      que empezó antes de invalidar no puede guardar datos viejos.
+    - Con un almacén compartido ("mmap" o "redis") las versiones son comunes a
+      todos los workers, así que una invalidación llega a todos, y una lista que
+      cargó un worker la pueden usar los demás sin pedirla a la API.
+    - Si el almacén no responde, la caché se comporta como desactivada: se
+      prefiere ir a la API antes que servir una lista que quizás se invalidó.
+    """
+
+    def __init__(self, ttl=10.0, max_filas=200_000, stale=0.0, almacen=None):
+        self.ttl = ttl
+        self.max_filas = max_filas
+        self.stale = stale
+        self.almacen = almacen if almacen is not None else AlmacenLocal()
+        self._entradas = OrderedDict()
+        self._recargando = set()
+        self._filas = 0
+        self._candado = threading.Lock()
+        self._contadores = dict.fromkeys(
+            ("aciertos", "aciertos_compartidos", "fallos", "vencidas_servidas", "recargas", "errores_recarga",
+             "descartadas", "ultimas_conocidas_servidas", "errores_almacen"), 0
+        )
+
+    @classmethod
+    def desde_configuracion(cls, config):
+        """
+        Crea la caché a partir de la configuración de Flask (ver configuracion.py).
+        """
+        return cls(
+            ttl=config["CACHE_TTL"],
+            max_filas=config["CACHE_MAX_FILAS"],
+            stale=config["CACHE_STALE"],
+            almacen=crear_almacen(config)
+        )
+
+    @property
+    def activa(self):
+        return self.ttl > 0
+
+    # ------------------- Lectura -------------------
+    def obtener(self, clave, cargar):
+        """
+        Retorna la lista guardada en "clave" o la carga con la función "cargar".
+        Los errores de "cargar" se propagan sin guardar nada.
+        """
+        if not self.activa:
+            return cargar()
+
+        datos, version = self.leer(clave, cargar)
+        if datos is not None:
+            return datos
+        datos = cargar()
+        self.guardar(clave, datos, version)
+        return datos
+
+    def leer(self, clave, cargar=None):
+        """
+        Retorna (datos, version) sin ir a la API: datos es None si no hay una
+        lista vigente y version se pasa luego a guardar().
+        Si se indica "cargar", una entrada vencida dentro de la ventana "stale"
+        se sirve y se recarga en un hilo en segundo plano.
+        """
+        version = self.version(clave)
+        if version is None:
+            return None, None
+        with self._candado:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and entrada.version == version:
+                edad = time.monotonic() - entrada.guardado
+                if edad < self.ttl:
+                    self._entradas.move_to_end(clave)
+                    self._contadores["aciertos"] += 1
+                    return entrada.datos, None
+                if cargar is not None and edad < self.ttl + self.stale:
+                    self._entradas.move_to_end(clave)
+                    self._contadores["vencidas_servidas"] += 1
+                    if clave not in self._recargando:
+                        self._recargando.add(clave)
+                        threading.Thread(
+                            target=self._recargar, args=(clave, cargar), daemon=True
+                        ).start()
+                    return entrada.datos, None
+
+        if self.almacen.compartido:
+            datos = self._leer_compartida(clave, version)
+            if datos is not None:
+                return datos, None
+        with self._candado:
+            self._contadores["fallos"] += 1
+        return None, version
+
+    def _leer_compartida(self, clave, version):
+        """
+        Retorna la lista que otro worker guardó en el almacén compartido si es
+        de la versión actual y no venció, copiándola en el LRU del proceso.
+        """
+        try:
+            guardada = self.almacen.leer(clave)
+        except Exception:
+            self._contar("errores_almacen")
+            return None
+        if guardada is None:
+            return None
+        version_guardada, momento, datos = guardada
+        edad = time.time() - momento
+        if version_guardada != version or edad >= self.ttl:
+            return None
+        self._guardar_local(clave, _Entrada(datos, version, time.monotonic() - edad))
+        self._contar("aciertos_compartidos")
+        return datos
+
+    def _recargar(self, clave, cargar):
+        """
+        Recarga una entrada vencida en segundo plano (modo stale-while-revalidate).
+        """
+        version = self.version(clave)
+        try:
+            datos = cargar()
+        except Exception:
+            self._contar("errores_recarga")
+        else:
+            self.guardar(clave, datos, version)
+            self._contar("recargas")
+        finally:
+            with self._candado:
+                self._recargando.discard(clave)
+
+    def version(self, clave):
+        """
+        Versión actual de la clave en el almacén o None si el almacén no responde.
+        Cambia con cada invalidar(), así que sirve de clave para datos derivados
+        de la lista (p. ej. los resúmenes de tablero.py).
+        """
+        try:
+            return self.almacen.version(clave)
+        except Exception:
+            self._contar("errores_almacen")
+            return None
+
+    def _contar(self, nombre):
+        with self._candado:
+            self._contadores[nombre] += 1
+
+    # ------------------- Escritura -------------------
+    def guardar(self, clave, datos, version):
+        """
+        Guarda la lista si nadie invalidó la clave mientras se cargaba
+        y descarta entradas antiguas hasta respetar max_filas.
+        Con un almacén compartido también la deja disponible para los demás workers.
+        """
+        if version is None or len(datos) > self.max_filas or self.version(clave) != version:
+            return
+        self._guardar_local(clave, _Entrada(datos, version))
+        if self.almacen.compartido:
+            try:
+                self.almacen.guardar(clave, version, datos, self.ttl + self.stale)
+            except Exception:
+                self._contar("errores_almacen")
+
+    def _guardar_local(self, clave, entrada):
+        with self._candado:
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self._filas -= len(anterior.datos)
+            self._entradas[clave] = entrada
+            self._filas += len(entrada.datos)
+            while self._filas > self.max_filas:
+                _, descartada = self._entradas.popitem(last=False)
+                self._filas -= len(descartada.datos)
+                self._contadores["descartadas"] += 1
+
+    def invalidar(self, clave):
+        """
+        Invalida solo la lista de "clave" después de crear, actualizar o eliminar,
+        en este worker y (con un almacén compartido) en todos los demás.
+        """
+        try:
+            self.almacen.invalidar(clave)
+        except Exception:
+            self._contar("errores_almacen")
+
+    def ultima_conocida(self, clave):
+        """
+        Retorna la última lista guardada de "clave" sin importar si venció o fue
+        invalidada, o None si nunca se cargó. Se usa cuando la API no responde
+        para mostrar datos desactualizados en lugar de una página vacía.
+        """
+        with self._candado:
+            entrada = self._entradas.get(clave)
+        datos = entrada.datos if entrada is not None else None
+        if datos is None and self.almacen.compartido:
+            try:
+                guardada = self.almacen.leer(clave)
+            except Exception:
+                guardada = None
+            if guardada is not None:
+                datos = guardada[2]
+        if datos is not None:
+            self._contar("ultimas_conocidas_servidas")
+        return datos
+
+    # ------------------- Métricas -------------------
+    def metricas(self):
+        """
+        Genera las métricas de la caché en formato de texto de Prometheus.
+        """
+        with self._candado:
+            contadores = dict(self._contadores)
+            entradas = len(self._entradas)
+            filas = self._filas
+
+        lineas = []
+        for nombre, valor in contadores.items():
+            lineas.append(f"# TYPE cache_{nombre}_total counter")
+            lineas.append(f"cache_{nombre}_total {valor}")
+        # Proporción de lecturas atendidas desde la caché (incluye las vencidas servidas)
+        servidas = contadores["aciertos"] + contadores["aciertos_compartidos"] + contadores["vencidas_servidas"]
+        lecturas = servidas + contadores["fallos"]
+        lineas += [
+            "# TYPE cache_ratio_aciertos gauge",
+            f"cache_ratio_aciertos {servidas / lecturas if lecturas else 0:.4f}",
+            "# TYPE cache_entradas gauge",
+            f"cache_entradas {entradas}",
+            "# TYPE cache_filas gauge",
+            f"cache_filas {filas}"
+        ]
+        return "\n".join(lineas) + "\n"
+
+
+def obtener_cache():
+    """
+    Retorna la caché de listas que app.py registra en la aplicación actual.
+    """
+    return current_app.extensions["cache_listas"]
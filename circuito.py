@@ -0,0 +1,107 @@
+# Circuit breaker por recurso de la API: si la API falla repetidamente,
+# las peticiones fallan de inmediato en lugar de esperar a un socket muerto
+import threading
+import time
+
+
+class CircuitoAbierto(Exception):
+    """
+    La API se considera caída para este recurso; la petición no se envió.
+    """
+
+
+class Circuito:
+    """
+    Estado del circuito de un recurso (producto, cliente, ...).
+    - cerrado: las peticiones pasan; tras "fallos_maximos" fallos seguidos se abre
+    - abierto: toda petición falla al instante con CircuitoAbierto durante "espera" segundos
+    - semiabierto: pasado ese tiempo se deja pasar una sola petición de prueba;
+      si funciona el circuito se cierra, si falla vuelve a abrirse
+    """
+    CERRADO = "cerrado"
+    ABIERTO = "abierto"
+    SEMIABIERTO = "semiabierto"
+
+    def __init__(self, nombre, fallos_maximos=5, espera=10.0):
+        self.nombre = nombre
+        self.fallos_maximos = fallos_maximos
+        self.espera = espera
+        self.estado = self.CERRADO
+        self.fallos = 0
+        self.aperturas = 0
+        self.rechazadas = 0
+        self._abierto_desde = 0.0
+        self._probando = False
+        self._candado = threading.Lock()
+
+    def antes(self):
+        """
+        Se llama antes de cada petición; lanza CircuitoAbierto si no debe enviarse.
+        """
+        with self._candado:
+            if self.estado == self.ABIERTO:
+                if time.monotonic() - self._abierto_desde < self.espera:
+                    self.rechazadas += 1
+                    raise CircuitoAbierto(f"La API no responde para '{self.nombre}' (circuito abierto)")
+                self.estado = self.SEMIABIERTO
+                self._probando = False
+            if self.estado == self.SEMIABIERTO:
+                # Si la prueba anterior nunca terminó (p. ej. se canceló) se permite otra
+                if self._probando and time.monotonic() - self._abierto_desde < self.espera:
+                    self.rechazadas += 1
+                    raise CircuitoAbierto(f"La API no responde para '{self.nombre}' (probando conexión)")
+                self._probando = True
+                self._abierto_desde = time.monotonic()
+
+    def exito(self):
+        with self._candado:
+            self.estado = self.CERRADO
+            self.fallos = 0
+            self._probando = False
+
+    def fallo(self):
+        with self._candado:
+            self.fallos += 1
+            if self.estado == self.SEMIABIERTO or self.fallos >= self.fallos_maximos:
+                if self.estado != self.ABIERTO:
+                    self.aperturas += 1
+                self.estado = self.ABIERTO
+                self._abierto_desde = time.monotonic()
+                self._probando = False
+
+
+class RegistroCircuitos:
+    """
+    Un circuito por recurso, creado la primera vez que se usa.
+    """
+    _CODIGOS_ESTADO = {Circuito.CERRADO: 0, Circuito.ABIERTO: 1, Circuito.SEMIABIERTO: 2}
+
+    def __init__(self, fallos_maximos=5, espera=10.0):
+        self.fallos_maximos = fallos_maximos
+        self.espera = espera
+        self._circuitos = {}
+        self._candado = threading.Lock()
+
+    def obtener(self, nombre):
+        circuito = self._circuitos.get(nombre)
+        if circuito is None:
+            with self._candado:
+                circuito = self._circuitos.setdefault(
+                    nombre, Circuito(nombre, self.fallos_maximos, self.espera)
+                )
+        return circuito
+
+    def metricas(self):
+        """
+        Genera las métricas de los circuitos en formato de texto de Prometheus
+        (estado: 0 cerrado, 1 abierto, 2 semiabierto).
+        """
+        circuitos = sorted(self._circuitos.values(), key=lambda c: c.nombre)
+        lineas = ["# TYPE api_circuito_estado gauge"]
+        lineas += [f'api_circuito_estado{{recurso="{c.nombre}"}} {self._CODIGOS_ESTADO[c.estado]}'
+                   for c in circuitos]
+        lineas.append("# TYPE api_circuito_aperturas_total counter")
+        lineas += [f'api_circuito_aperturas_total{{recurso="{c.nombre}"}} {c.aperturas}' for c in circuitos]
+        lineas.append("# TYPE api_circuito_rechazadas_total counter")
+        lineas += [f'api_circuito_rechazadas_total{{recurso="{c.nombre}"}} {c.rechazadas}' for c in circuitos]
+        return "\n".join(lineas) + "\n"
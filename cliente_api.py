@@ -0,0 +1,338 @@
+# Cliente HTTP compartido por todos los Blueprints para conectarse a la API en C#
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from api_json import decodificar
+from circuito import CircuitoAbierto, RegistroCircuitos
+from coalescencia import Coalescedor
+from json_incremental import iterar_lista
+from metricas import Contador, Histograma, endpoint_api
+
+# Errores que indican que la API no responde (y no que rechazó la petición):
+# las vistas los tratan mostrando los últimos datos conocidos
+ERRORES_CONEXION = (CircuitoAbierto, requests.ConnectionError, requests.Timeout)
+
+
+class ClienteAPI:
+    """
+    Cliente único de la aplicación para hablar con la API.
+    Reutiliza un pool de conexiones keep-alive, aplica tiempos de espera
+    de conexión/lectura y reintenta con espera exponencial solo las
+    peticiones GET, que son idempotentes.
+    """
+
+    # Bytes que se leen del socket en cada paso al recorrer una lista por partes
+    TAMANO_FRAGMENTO = 64 * 1024
+
+    def __init__(self, url_base, timeout_conexion=3.05, timeout_lectura=10.0,
+                 reintentos=2, backoff=0.3, tamano_pool=10, coalescer=True,
+                 circuito_fallos=5, circuito_espera=10.0, tamano_pool_importacion=4):
+        self.url_base = url_base.rstrip("/")
+        self.timeout = (timeout_conexion, timeout_lectura)
+        self.tamano_pool = tamano_pool
+
+        # Lecturas idénticas y simultáneas comparten una sola petición (single-flight)
+        self.coalescedor = Coalescedor() if coalescer else None
+
+        # Un circuit breaker por recurso; con circuito_fallos = 0 se desactiva
+        self.circuitos = RegistroCircuitos(circuito_fallos, circuito_espera) if circuito_fallos > 0 else None
+
+        reintento = Retry(
+            total=reintentos,
+            backoff_factor=backoff,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False
+        )
+        self.adaptador = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=tamano_pool,
+            max_retries=reintento
+        )
+        self.sesion = requests.Session()
+        self.sesion.mount("http://", self.adaptador)
+        self.sesion.mount("https://", self.adaptador)
+
+        # Hilos para lanzar varias peticiones a la vez; se crean bajo demanda
+        self._ejecutor = ThreadPoolExecutor(max_workers=tamano_pool, thread_name_prefix="cliente_api")
+        # Hilos aparte para las importaciones masivas (ver en_paralelo_importacion)
+        self._ejecutor_importacion = ThreadPoolExecutor(
+            max_workers=max(tamano_pool_importacion, 1), thread_name_prefix="cliente_api_importacion"
+        )
+
+        # Contadores para /metrics, protegidos por un candado
+        self._candado = threading.Lock()
+        self._peticiones = {}
+        self._errores = {}
+        self._reintentos = 0
+        self._en_curso = 0
+        self._duraciones = Histograma("api_llamada_duracion_segundos", ("endpoint", "metodo", "estado"))
+        self._bytes = Contador("api_llamada_bytes_total", ("endpoint", "metodo"))
+
+    @classmethod
+    def desde_configuracion(cls, config):
+        """
+        Crea el cliente a partir de la configuración de Flask (ver configuracion.py).
+        """
+        return cls(
+            config["API_URL_BASE"],
+            timeout_conexion=config["API_TIMEOUT_CONEXION"],
+            timeout_lectura=config["API_TIMEOUT_LECTURA"],
+            reintentos=config["API_REINTENTOS"],
+            backoff=config["API_BACKOFF"],
+            tamano_pool=config["API_TAMANO_POOL"],
+            coalescer=config["API_COALESCER"],
+            circuito_fallos=config["CIRCUITO_FALLOS"],
+            circuito_espera=config["CIRCUITO_ESPERA"],
+            tamano_pool_importacion=config["API_TAMANO_POOL_IMPORTACION"]
+        )
+
+    # ------------------- Peticiones -------------------
+    def peticion(self, metodo, ruta, **kwargs):
+        """
+        Envía una petición a {url_base}/{ruta} usando el pool compartido.
+        Las excepciones de requests se propagan para que cada vista decida qué mostrar.
+        Si el circuito del recurso está abierto lanza CircuitoAbierto sin conectarse;
+        los errores de conexión y las respuestas 5xx cuentan como fallos del circuito.
+        Con stream=True la duración y los bytes los registra quien lee el cuerpo
+        (ver iterar()); si no, se registran aquí con el cuerpo ya descargado.
+        """
+        circuito = self.circuitos.obtener(ruta.split("/", 1)[0]) if self.circuitos else None
+        if circuito is not None:
+            circuito.antes()
+
+        kwargs.setdefault("timeout", self.timeout)
+        with self._candado:
+            self._en_curso += 1
+        inicio = time.perf_counter()
+        try:
+            respuesta = self.sesion.request(metodo, f"{self.url_base}/{ruta}", **kwargs)
+        except Exception as e:
+            self._contar(self._errores, (metodo, type(e).__name__))
+            self.registrar_llamada(metodo, ruta, "error", inicio)
+            if circuito is not None:
+                circuito.fallo()
+            raise
+        finally:
+            with self._candado:
+                self._en_curso -= 1
+
+        if circuito is not None:
+            if respuesta.status_code >= 500:
+                circuito.fallo()
+            else:
+                circuito.exito()
+        self._contar(self._peticiones, (metodo, respuesta.status_code))
+        reintentos = getattr(respuesta.raw, "retries", None)
+        if reintentos is not None and reintentos.history:
+            with self._candado:
+                self._reintentos += len(reintentos.history)
+        if not kwargs.get("stream"):
+            self.registrar_llamada(metodo, ruta, respuesta.status_code, inicio, len(respuesta.content))
+        return respuesta
+
+    def registrar_llamada(self, metodo, ruta, estado, inicio, tamano=0):
+        """
+        Registra la duración (desde "inicio", un time.perf_counter()) y los bytes
+        recibidos de una llamada a la API, agrupada por endpoint sin el código.
+        """
+        endpoint = endpoint_api(ruta)
+        self._duraciones.observar((endpoint, metodo, estado), time.perf_counter() - inicio)
+        if tamano:
+            self._bytes.sumar((endpoint, metodo), tamano)
+
+    def get(self, ruta, **kwargs):
+        return self.peticion("GET", ruta, **kwargs)
+
+    def post(self, ruta, **kwargs):
+        return self.peticion("POST", ruta, **kwargs)
+
+    def put(self, ruta, **kwargs):
+        return self.peticion("PUT", ruta, **kwargs)
+
+    def delete(self, ruta, **kwargs):
+        return self.peticion("DELETE", ruta, **kwargs)
+
+    def _coalescer(self, clave, funcion):
+        """
+        Ejecuta "funcion" compartiendo la llamada con los hilos que piden la misma clave.
+        """
+        if self.coalescedor is None:
+            return funcion()
+        return self.coalescedor.ejecutar(clave, funcion)
+
+    def iterar(self, recurso):
+        """
+        Produce uno a uno los registros de la clave "datos" de un recurso
+        mientras la respuesta llega, sin guardar el cuerpo completo ni
+        construir el objeto JSON entero. Una respuesta con error HTTP lanza una excepción.
+        Cada iterador hace su propia petición: no pasa por la coalescencia.
+        """
+        inicio = time.perf_counter()
+        respuesta = self.get(recurso, stream=True)
+        leidos = 0
+
+        def contar(fragmentos):
+            nonlocal leidos
+            for fragmento in fragmentos:
+                leidos += len(fragmento)
+                yield fragmento
+
+        try:
+            respuesta.raise_for_status()
+            fragmentos = contar(respuesta.iter_content(self.TAMANO_FRAGMENTO))
+            yield from iterar_lista(fragmentos)
+            # Leer el resto del cuerpo para devolver la conexión al pool
+            for _ in fragmentos:
+                pass
+        finally:
+            respuesta.close()
+            self.registrar_llamada("GET", recurso, respuesta.status_code, inicio, leidos)
+
+    def listar(self, recurso):
+        """
+        Retorna la lista completa de un recurso desde la clave "datos".
+        Una respuesta con error HTTP lanza una excepción para que no se guarde en caché.
+        La lista se guarda entera en la caché de todos modos, así que el cuerpo se
+        decodifica de una vez (orjson o json, en C), de dos a cuatro veces más rápido
+        que recorrerlo por partes con iterar().
+        """
+        def pedir():
+            respuesta = self.get(recurso)
+            respuesta.raise_for_status()
+            return decodificar(respuesta.content).get("datos", [])
+
+        return self._coalescer(("listar", recurso), pedir)
+
+    def listar_pagina(self, recurso, pagina, tamano, orden="", q=""):
+        """
+        Pide a la API una sola página del recurso con page, size, sort y q.
+        Retorna (datos, total); total es None si la API no informa el total.
+        """
+        parametros = {"page": pagina, "size": tamano}
+        if orden:
+            parametros["sort"] = orden
+        if q:
+            parametros["q"] = q
+
+        def pedir():
+            respuesta = self.get(recurso, params=parametros)
+            respuesta.raise_for_status()
+            contenido = respuesta.json()
+            return contenido.get("datos", []), contenido.get("total")
+
+        return self._coalescer(("pagina", recurso, pagina, tamano, orden, q), pedir)
+
+    def buscar(self, recurso, codigo):
+        """
+        Retorna el registro con el código indicado o None si la API no lo encuentra.
+        """
+        def pedir():
+            respuesta = self.get(f"{recurso}/codigo/{codigo}")
+            if respuesta.status_code != 200:
+                return None
+            datos = respuesta.json().get("datos", [])
+            # Si la API retorna datos, se asume que es una lista con un solo registro
+            return datos[0] if datos else None
+
+        return self._coalescer(("buscar", recurso, codigo), pedir)
+
+    def en_paralelo(self, *funciones):
+        """
+        Ejecuta varias funciones al mismo tiempo y retorna sus resultados en orden.
+        La primera corre en el hilo actual y las demás en el pool de hilos, cada una
+        con una copia del contexto de Flask. Si alguna falla, se propaga su excepción.
+        """
+        return self._en_paralelo(self._ejecutor, funciones)
+
+    def en_paralelo_importacion(self, *funciones):
+        """
+        Igual que en_paralelo(), pero en los hilos de las importaciones
+        (API_TAMANO_POOL_IMPORTACION): los lotes de una importación grande esperan
+        entre ellos y no dejan sin hilos a las vistas que usan en_paralelo().
+        """
+        return self._en_paralelo(self._ejecutor_importacion, funciones)
+
+    def _en_paralelo(self, ejecutor, funciones):
+        futuros = [
+            ejecutor.submit(contextvars.copy_context().run, funcion)
+            for funcion in funciones[1:]
+        ]
+        primero = funciones[0]()
+        return [primero] + [futuro.result() for futuro in futuros]
+
+    # ------------------- Métricas -------------------
+    def _contar(self, contadores, clave):
+        with self._candado:
+            contadores[clave] = contadores.get(clave, 0) + 1
+
+    def estado_pool(self):
+        """
+        Retorna el estado de cada pool de urllib3: conexiones creadas,
+        peticiones servidas y conexiones inactivas listas para reutilizar.
+        """
+        estado = []
+        pools = self.adaptador.poolmanager.pools
+        for clave in list(pools.keys()):
+            pool = pools.get(clave)
+            if pool is None:
+                continue
+            inactivas = sum(1 for conexion in list(pool.pool.queue) if conexion is not None)
+            estado.append({
+                "host": f"{pool.host}:{pool.port}",
+                "conexiones_creadas": pool.num_connections,
+                "peticiones": pool.num_requests,
+                "conexiones_inactivas": inactivas
+            })
+        return estado
+
+    def metricas(self):
+        """
+        Genera las métricas del cliente en formato de texto de Prometheus.
+        """
+        with self._candado:
+            peticiones = dict(self._peticiones)
+            errores = dict(self._errores)
+            reintentos = self._reintentos
+            en_curso = self._en_curso
+        compartidas = self.coalescedor.compartidas if self.coalescedor else 0
+
+        lineas = [
+            "# TYPE api_peticiones_total counter",
+            *(f'api_peticiones_total{{metodo="{m}",estado="{s}"}} {n}'
+              for (m, s), n in sorted(peticiones.items())),
+            "# TYPE api_errores_total counter",
+            *(f'api_errores_total{{metodo="{m}",tipo="{t}"}} {n}'
+              for (m, t), n in sorted(errores.items())),
+            "# TYPE api_reintentos_total counter",
+            f"api_reintentos_total {reintentos}",
+            "# TYPE api_peticiones_en_curso gauge",
+            f"api_peticiones_en_curso {en_curso}",
+            "# TYPE api_lecturas_compartidas_total counter",
+            f"api_lecturas_compartidas_total {compartidas}",
+            "# TYPE api_pool_tamano gauge",
+            f"api_pool_tamano {self.tamano_pool}"
+        ]
+        pools = self.estado_pool()
+        for campo, tipo in (("conexiones_creadas", "counter"), ("peticiones", "counter"),
+                            ("conexiones_inactivas", "gauge")):
+            lineas.append(f"# TYPE api_pool_{campo} {tipo}")
+            lineas.extend(f'api_pool_{campo}{{host="{p["host"]}"}} {p[campo]}' for p in pools)
+        texto = "\n".join(lineas) + "\n" + self._duraciones.metricas() + self._bytes.metricas()
+        if self.circuitos is not None:
+            texto += self.circuitos.metricas()
+        return texto
+
+
+def obtener_cliente_api():
+    """
+    Retorna el cliente compartido que app.py registra en la aplicación actual.
+    """
+    return current_app.extensions["cliente_api"]
@@ -0,0 +1,285 @@
+# Cliente HTTP asíncrono para el modo ASGI (app_async.py)
+# Requiere httpx (dependencia opcional: pip install httpx)
+import asyncio
+import time
+
+import httpx
+
+from api_json import decodificar
+from circuito import CircuitoAbierto, RegistroCircuitos
+from coalescencia import CoalescedorAsync
+from json_incremental import iterar_lista_async
+from metricas import Contador, Histograma, endpoint_api
+
+# Mismo criterio que cliente_api.ERRORES_CONEXION, con las excepciones de httpx
+ERRORES_CONEXION = (CircuitoAbierto, httpx.TransportError)
+
+
+class ClienteAPIAsync:
+    """
+    Versión asíncrona de ClienteAPI sobre httpx.AsyncClient.
+    Un solo proceso puede mantener cientos de peticiones en curso hacia la API
+    sin ocupar un hilo por cada una. Conserva el mismo comportamiento:
+    pool keep-alive, tiempos de espera de conexión/lectura y reintentos con
+    espera exponencial solo para GET.
+    """
+
+    ESTADOS_REINTENTO = (502, 503, 504)
+
+    # Bytes que se leen del socket en cada paso al recorrer una lista por partes
+    TAMANO_FRAGMENTO = 64 * 1024
+
+    def __init__(self, url_base, timeout_conexion=3.05, timeout_lectura=10.0,
+                 reintentos=2, backoff=0.3, tamano_pool=200, coalescer=True,
+                 circuito_fallos=5, circuito_espera=10.0):
+        self.url_base = url_base.rstrip("/")
+        self.coalescedor = CoalescedorAsync() if coalescer else None
+        self.circuitos = RegistroCircuitos(circuito_fallos, circuito_espera) if circuito_fallos > 0 else None
+        self.reintentos = reintentos
+        self.backoff = backoff
+        self.tamano_pool = tamano_pool
+        self.cliente = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout_lectura, connect=timeout_conexion),
+            limits=httpx.Limits(max_connections=tamano_pool, max_keepalive_connections=tamano_pool)
+        )
+
+        # Contadores para /metrics; el bucle de eventos es de un solo hilo
+        self._peticiones = {}
+        self._errores = {}
+        self._reintentos = 0
+        self._en_curso = 0
+        self._duraciones = Histograma("api_llamada_duracion_segundos", ("endpoint", "metodo", "estado"))
+        self._bytes = Contador("api_llamada_bytes_total", ("endpoint", "metodo"))
+
+    @classmethod
+    def desde_configuracion(cls, config):
+        """
+        Crea el cliente a partir de la configuración (ver configuracion.py).
+        """
+        return cls(
+            config["API_URL_BASE"],
+            timeout_conexion=config["API_TIMEOUT_CONEXION"],
+            timeout_lectura=config["API_TIMEOUT_LECTURA"],
+            reintentos=config["API_REINTENTOS"],
+            backoff=config["API_BACKOFF"],
+            tamano_pool=config["API_TAMANO_POOL_ASYNC"],
+            coalescer=config["API_COALESCER"],
+            circuito_fallos=config["CIRCUITO_FALLOS"],
+            circuito_espera=config["CIRCUITO_ESPERA"]
+        )
+
+    async def cerrar(self):
+        await self.cliente.aclose()
+
+    # ------------------- Peticiones -------------------
+    async def peticion(self, metodo, ruta, **kwargs):
+        """
+        Envía una petición a {url_base}/{ruta}. Los GET se reintentan ante
+        errores de conexión o respuestas 502/503/504. Usa el mismo circuit
+        breaker por recurso que ClienteAPI.
+        """
+        circuito = self.circuitos.obtener(ruta.split("/", 1)[0]) if self.circuitos else None
+        if circuito is not None:
+            circuito.antes()
+
+        intentos = self.reintentos + 1 if metodo == "GET" else 1
+        self._en_curso += 1
+        inicio = time.perf_counter()
+        endpoint = endpoint_api(ruta)
+        try:
+            for intento in range(intentos):
+                if intento:
+                    self._reintentos += 1
+                    await asyncio.sleep(self.backoff * (2 ** (intento - 1)))
+                try:
+                    respuesta = await self.cliente.request(metodo, f"{self.url_base}/{ruta}", **kwargs)
+                except httpx.TransportError as e:
+                    if intento + 1 < intentos:
+                        continue
+                    self._contar(self._errores, (metodo, type(e).__name__))
+                    self._duraciones.observar((endpoint, metodo, "error"), time.perf_counter() - inicio)
+                    raise
+                if respuesta.status_code in self.ESTADOS_REINTENTO and intento + 1 < intentos:
+                    continue
+                self._contar(self._peticiones, (metodo, respuesta.status_code))
+                self._duraciones.observar((endpoint, metodo, respuesta.status_code), time.perf_counter() - inicio)
+                self._bytes.sumar((endpoint, metodo), len(respuesta.content))
+                if circuito is not None:
+                    if respuesta.status_code >= 500:
+                        circuito.fallo()
+                    else:
+                        circuito.exito()
+                return respuesta
+        except Exception:
+            if circuito is not None:
+                circuito.fallo()
+            raise
+        finally:
+            self._en_curso -= 1
+
+    async def get(self, ruta, **kwargs):
+        return await self.peticion("GET", ruta, **kwargs)
+
+    async def post(self, ruta, **kwargs):
+        return await self.peticion("POST", ruta, **kwargs)
+
+    async def put(self, ruta, **kwargs):
+        return await self.peticion("PUT", ruta, **kwargs)
+
+    async def delete(self, ruta, **kwargs):
+        return await self.peticion("DELETE", ruta, **kwargs)
+
+    async def _coalescer(self, clave, crear_corrutina):
+        """
+        Espera la corrutina compartiéndola con las que piden la misma clave.
+        """
+        if self.coalescedor is None:
+            return await crear_corrutina()
+        return await self.coalescedor.ejecutar(clave, crear_corrutina)
+
+    async def iterar(self, recurso):
+        """
+        Versión asíncrona de ClienteAPI.iterar(): produce uno a uno los registros
+        de la clave "datos" mientras la respuesta llega (aiter_bytes y
+        json_incremental), sin guardar el cuerpo completo. Una respuesta con error
+        HTTP lanza una excepción. Cada iterador hace su propia petición, sin
+        reintentos ni coalescencia, y cuenta para el circuit breaker del recurso.
+        """
+        circuito = self.circuitos.obtener(recurso.split("/", 1)[0]) if self.circuitos else None
+        if circuito is not None:
+            circuito.antes()
+
+        endpoint = endpoint_api(recurso)
+        estado = "error"
+        leidos = 0
+        self._en_curso += 1
+        inicio = time.perf_counter()
+        try:
+            async with self.cliente.stream("GET", f"{self.url_base}/{recurso}") as respuesta:
+                estado = respuesta.status_code
+                self._contar(self._peticiones, ("GET", estado))
+                if circuito is not None:
+                    if estado >= 500:
+                        circuito.fallo()
+                    else:
+                        circuito.exito()
+                respuesta.raise_for_status()
+
+                async def contar(fragmentos):
+                    nonlocal leidos
+                    async for fragmento in fragmentos:
+                        leidos += len(fragmento)
+                        yield fragmento
+
+                fragmentos = contar(respuesta.aiter_bytes(self.TAMANO_FRAGMENTO))
+                async for registro in iterar_lista_async(fragmentos):
+                    yield registro
+                # Leer el resto del cuerpo para devolver la conexión al pool
+                async for _ in fragmentos:
+                    pass
+        except httpx.TransportError as e:
+            if estado == "error":
+                # La API no llegó a responder
+                self._contar(self._errores, ("GET", type(e).__name__))
+                if circuito is not None:
+                    circuito.fallo()
+            raise
+        finally:
+            self._en_curso -= 1
+            self._duraciones.observar((endpoint, "GET", estado), time.perf_counter() - inicio)
+            if leidos:
+                self._bytes.sumar((endpoint, "GET"), leidos)
+
+    async def listar(self, recurso):
+        """
+        Retorna la lista completa de un recurso desde la clave "datos".
+        """
+        async def pedir():
+            respuesta = await self.get(recurso)
+            respuesta.raise_for_status()
+            return decodificar(respuesta.content).get("datos", [])
+
+        return await self._coalescer(("listar", recurso), pedir)
+
+    async def listar_pagina(self, recurso, pagina, tamano, orden="", q=""):
+        """
+        Pide a la API una sola página del recurso; retorna (datos, total).
+        """
+        parametros = {"page": pagina, "size": tamano}
+        if orden:
+            parametros["sort"] = orden
+        if q:
+            parametros["q"] = q
+
+        async def pedir():
+            respuesta = await self.get(recurso, params=parametros)
+            respuesta.raise_for_status()
+            contenido = respuesta.json()
+            return contenido.get("datos", []), contenido.get("total")
+
+        return await self._coalescer(("pagina", recurso, pagina, tamano, orden, q), pedir)
+
+    async def buscar(self, recurso, codigo):
+        """
+        Retorna el registro con el código indicado o None si la API no lo encuentra.
+        """
+        async def pedir():
+            respuesta = await self.get(f"{recurso}/codigo/{codigo}")
+            if respuesta.status_code != 200:
+                return None
+            datos = respuesta.json().get("datos", [])
+            return datos[0] if datos else None
+
+        return await self._coalescer(("buscar", recurso, codigo), pedir)
+
+    @staticmethod
+    async def en_paralelo(*corrutinas):
+        """
+        Espera varias corrutinas al mismo tiempo y retorna sus resultados en orden.
+        """
+        return await asyncio.gather(*corrutinas)
+
+    # ------------------- Métricas -------------------
+    def _contar(self, contadores, clave):
+        contadores[clave] = contadores.get(clave, 0) + 1
+
+    def estado_pool(self):
+        """
+        Retorna las conexiones abiertas e inactivas del pool de httpx.
+        """
+        pool = getattr(self.cliente._transport, "_pool", None)
+        conexiones = list(getattr(pool, "connections", []))
+        return {
+            "conexiones_abiertas": len(conexiones),
+            "conexiones_inactivas": sum(1 for conexion in conexiones if conexion.is_idle())
+        }
+
+    def metricas(self):
+        """
+        Genera las métricas del cliente en formato de texto de Prometheus.
+        """
+        pool = self.estado_pool()
+        lineas = [
+            "# TYPE api_peticiones_total counter",
+            *(f'api_peticiones_total{{metodo="{m}",estado="{s}"}} {n}'
+              for (m, s), n in sorted(self._peticiones.items())),
+            "# TYPE api_errores_total counter",
+            *(f'api_errores_total{{metodo="{m}",tipo="{t}"}} {n}'
+              for (m, t), n in sorted(self._errores.items())),
+            "# TYPE api_reintentos_total counter",
+            f"api_reintentos_total {self._reintentos}",
+            "# TYPE api_peticiones_en_curso gauge",
+            f"api_peticiones_en_curso {self._en_curso}",
+            "# TYPE api_lecturas_compartidas_total counter",
+            f"api_lecturas_compartidas_total {self.coalescedor.compartidas if self.coalescedor else 0}",
+            "# TYPE api_pool_tamano gauge",
+            f"api_pool_tamano {self.tamano_pool}",
+            "# TYPE api_pool_conexiones_abiertas gauge",
+            f"api_pool_conexiones_abiertas {pool['conexiones_abiertas']}",
+            "# TYPE api_pool_conexiones_inactivas gauge",
+            f"api_pool_conexiones_inactivas {pool['conexiones_inactivas']}"
+        ]
+        texto = "\n".join(lineas) + "\n" + self._duraciones.metricas() + self._bytes.metricas()
+        if self.circuitos is not None:
+            texto += self.circuitos.metricas()
+        return texto
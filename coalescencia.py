@@ -0,0 +1,80 @@
+# Coalescencia de lecturas (single-flight): peticiones idénticas y simultáneas
+# comparten una sola llamada a la API y su resultado ya decodificado
+import asyncio
+import threading
+
+
+class _Llamada:
+    """
+    Llamada en curso: los demás hilos esperan a que termine y reciben su resultado o su error.
+    """
+    __slots__ = ("lista", "resultado", "error")
+
+    def __init__(self):
+        self.lista = threading.Event()
+        self.resultado = None
+        self.error = None
+
+
+class Coalescedor:
+    """
+    Agrupa las llamadas con la misma clave que ocurren al mismo tiempo en un proceso.
+    El primer hilo ejecuta la función; los que llegan mientras tanto esperan y
+    reciben el mismo resultado. Al terminar la clave se olvida: no se guarda nada
+    (para eso está la caché de listas). El resultado es compartido, así que no
+    debe modificarse.
+    """
+
+    def __init__(self):
+        self._llamadas = {}
+        self._candado = threading.Lock()
+        self.compartidas = 0
+
+    def ejecutar(self, clave, funcion):
+        with self._candado:
+            llamada = self._llamadas.get(clave)
+            if llamada is None:
+                llamada = self._llamadas[clave] = _Llamada()
+                propia = True
+            else:
+                self.compartidas += 1
+                propia = False
+
+        if not propia:
+            llamada.lista.wait()
+            if llamada.error is not None:
+                raise llamada.error
+            return llamada.resultado
+
+        try:
+            llamada.resultado = funcion()
+            return llamada.resultado
+        except Exception as e:
+            llamada.error = e
+            raise
+        finally:
+            with self._candado:
+                del self._llamadas[clave]
+            llamada.lista.set()
+
+
+class CoalescedorAsync:
+    """
+    Versión para el modo ASGI: las corrutinas con la misma clave esperan la
+    misma tarea. La tarea se protege con asyncio.shield para que, si un cliente
+    cancela su petición, no se cancele la llamada de los demás.
+    """
+
+    def __init__(self):
+        self._llamadas = {}
+        self.compartidas = 0
+
+    async def ejecutar(self, clave, crear_corrutina):
+        tarea = self._llamadas.get(clave)
+        if tarea is None:
+            tarea = asyncio.ensure_future(crear_corrutina())
+            self._llamadas[clave] = tarea
+            tarea.add_done_callback(lambda _: self._llamadas.pop(clave, None))
+        else:
+            self.compartidas += 1
+        return await asyncio.shield(tarea)
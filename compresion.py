@@ -0,0 +1,120 @@
+# Compresión gzip/brotli de las respuestas HTML (y CSV/JSON) de la aplicación
+# Las tablas de entidades son HTML muy repetitivo y se reducen diez veces o más.
+# Se activa con COMPRESION_HTML; brotli es opcional (pip install brotli) y solo se
+# usa si el navegador lo acepta, si no se usa gzip.
+import zlib
+
+from flask import request
+
+# Tipos de contenido que se comprimen; el resto (imágenes, estáticos ya comprimidos) no
+TIPOS_COMPRIMIBLES = ("text/html", "text/csv", "text/plain", "application/json")
+
+
+class _Gzip:
+    """
+    Compresor gzip por partes: cada parte se envía completa (Z_SYNC_FLUSH)
+    para que el navegador pueda mostrarla sin esperar el final.
+    """
+
+    def __init__(self, nivel):
+        self._compresor = zlib.compressobj(nivel, zlib.DEFLATED, 31)
+
+    def parte(self, datos):
+        return self._compresor.compress(datos) + self._compresor.flush(zlib.Z_SYNC_FLUSH)
+
+    def terminar(self):
+        return self._compresor.flush()
+
+
+class _Brotli:
+    """
+    Compresor brotli por partes, con la misma interfaz que _Gzip.
+    """
+
+    def __init__(self, nivel):
+        import brotli
+        self._compresor = brotli.Compressor(quality=nivel)
+
+    def parte(self, datos):
+        return self._compresor.process(datos) + self._compresor.flush()
+
+    def terminar(self):
+        return self._compresor.finish()
+
+
+def _brotli_disponible():
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _comprimir_flujo(partes, compresor, original):
+    """
+    Comprime una respuesta por partes a medida que se genera (STREAMING_LISTADOS),
+    sin reunirla antes en memoria.
+    """
+    try:
+        for datos in partes:
+            if datos:
+                yield compresor.parte(datos)
+        yield compresor.terminar()
+    finally:
+        if hasattr(original, "close"):
+            original.close()
+
+
+def instalar_compresion(aplicacion):
+    """
+    Registra la compresión de respuestas si COMPRESION_HTML está activo.
+    - COMPRESION_MINIMO: bytes a partir de los cuales se comprime una respuesta
+      completa (las respuestas por partes se comprimen siempre: no se sabe su tamaño)
+    - COMPRESION_NIVEL_GZIP (1-9) y COMPRESION_NIVEL_BROTLI (0-11)
+    """
+    config = aplicacion.config
+    if not config["COMPRESION_HTML"]:
+        return
+    minimo = config["COMPRESION_MINIMO"]
+    nivel_gzip = config["COMPRESION_NIVEL_GZIP"]
+    nivel_brotli = config["COMPRESION_NIVEL_BROTLI"]
+    con_brotli = _brotli_disponible()
+
+    @aplicacion.after_request
+    def comprimir(respuesta):
+        if (respuesta.status_code < 200 or respuesta.status_code == 204
+                or respuesta.mimetype not in TIPOS_COMPRIMIBLES
+                or "Content-Encoding" in respuesta.headers or respuesta.direct_passthrough):
+            return respuesta
+
+        # La respuesta depende de Accept-Encoding aunque esta vez no se comprima
+        respuesta.vary.add("Accept-Encoding")
+        codificaciones = request.accept_encodings
+        if con_brotli and codificaciones["br"]:
+            codificacion, compresor = "br", _Brotli(nivel_brotli)
+        elif codificaciones["gzip"]:
+            codificacion, compresor = "gzip", _Gzip(nivel_gzip)
+        else:
+            return respuesta
+
+        # Otra representación del mismo contenido: el ETag pasa a ser débil. Se
+        # debilita también en los 304 y en las respuestas muy cortas para que el
+        # 200 y el 304 de una misma página lleven siempre el mismo validador
+        etiqueta, debil = respuesta.get_etag()
+        if etiqueta and not debil:
+            respuesta.set_etag(etiqueta, weak=True)
+        if respuesta.status_code == 304:
+            return respuesta
+
+        if respuesta.is_streamed:
+            original = respuesta.response
+            respuesta.response = _comprimir_flujo(respuesta.iter_encoded(), compresor, original)
+            respuesta.headers.pop("Content-Length", None)
+        else:
+            datos = respuesta.get_data()
+            if len(datos) < minimo:
+                return respuesta
+            respuesta.set_data(compresor.parte(datos) + compresor.terminar())
+
+        respuesta.headers["Content-Encoding"] = codificacion
+        return respuesta
@@ -0,0 +1,155 @@
+# Configuración central de la aplicación Flask
+# Cada valor puede sobrescribirse con una variable de entorno del mismo nombre
+import os
+
+
+def _entorno(nombre, por_defecto, tipo=str):
+    """
+    Lee una variable de entorno y la convierte al tipo indicado.
+    Si la variable no existe, retorna el valor por defecto.
+    """
+    valor = os.environ.get(nombre)
+    if valor is None:
+        return por_defecto
+    return tipo(valor)
+
+
+def _booleano(valor):
+    """
+    Convierte textos como "1", "true" o "si" en True.
+    """
+    return valor.strip().lower() in ("1", "true", "si", "sí", "yes", "on")
+
+
+class Configuracion:
+    """
+    Valores de configuración que se cargan con aplicacion.config.from_object().
+    """
+
+    # ------------------- API en C# -------------------
+    # URL base de la API; cada Blueprint agrega su recurso (producto, cliente, ...)
+    API_URL_BASE = _entorno("API_URL_BASE", "http://localhost:5031/api")
+
+    # Tiempos de espera en segundos para abrir la conexión y para leer la respuesta
+    API_TIMEOUT_CONEXION = _entorno("API_TIMEOUT_CONEXION", 3.05, float)
+    API_TIMEOUT_LECTURA = _entorno("API_TIMEOUT_LECTURA", 10.0, float)
+
+    # Reintentos de las peticiones GET y factor de espera exponencial entre ellos
+    API_REINTENTOS = _entorno("API_REINTENTOS", 2, int)
+    API_BACKOFF = _entorno("API_BACKOFF", 0.3, float)
+
+    # Conexiones keep-alive por proceso; debe coincidir con los hilos de cada worker
+    API_TAMANO_POOL = _entorno("API_TAMANO_POOL", 10, int)
+
+    # Hilos propios de las importaciones masivas, aparte del pool de las vistas:
+    # una importación grande no puede ocupar los hilos de las búsquedas y listados
+    API_TAMANO_POOL_IMPORTACION = _entorno("API_TAMANO_POOL_IMPORTACION", 4, int)
+
+    # Compartir una sola petición entre lecturas idénticas y simultáneas (single-flight).
+    # Con la caché y la coalescencia desactivadas, las listas se leen por partes (json_incremental.py)
+    API_COALESCER = _entorno("API_COALESCER", True, _booleano)
+
+    # Circuit breaker por recurso: fallos seguidos para abrirlo (0 lo desactiva)
+    # y segundos que permanece abierto antes de probar de nuevo la API
+    CIRCUITO_FALLOS = _entorno("CIRCUITO_FALLOS", 5, int)
+    CIRCUITO_ESPERA = _entorno("CIRCUITO_ESPERA", 10.0, float)
+
+    # Conexiones del cliente asíncrono en el modo ASGI (app_async.py)
+    API_TAMANO_POOL_ASYNC = _entorno("API_TAMANO_POOL_ASYNC", 200, int)
+
+    # ------------------- Caché de listas -------------------
+    # Segundos que una lista se considera fresca (0 desactiva la caché)
+    CACHE_TTL = _entorno("CACHE_TTL", 10.0, float)
+
+    # Máximo de filas guardadas entre todas las entidades
+    CACHE_MAX_FILAS = _entorno("CACHE_MAX_FILAS", 200_000, int)
+
+    # Segundos extra en que una lista vencida se sirve mientras se recarga en segundo plano
+    CACHE_STALE = _entorno("CACHE_STALE", 0.0, float)
+
+    # Dónde se comparten las versiones y las listas entre workers (ver almacenes_cache.py):
+    # "local" (nada se comparte), "mmap" (workers de una máquina) o "redis" (varias máquinas)
+    CACHE_BACKEND = _entorno("CACHE_BACKEND", "local")
+
+    # Directorio del almacén "mmap" (vacío = /dev/shm/cache_listas)
+    CACHE_DIRECTORIO = _entorno("CACHE_DIRECTORIO", "")
+
+    # Servidor, prefijo de las claves y timeout (segundos) del almacén "redis"
+    CACHE_REDIS_URL = _entorno("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_PREFIJO = _entorno("CACHE_PREFIJO", "cache_listas")
+    CACHE_REDIS_TIMEOUT = _entorno("CACHE_REDIS_TIMEOUT", 0.5, float)
+
+    # ------------------- Réplica local -------------------
+    # Copia local de cada colección para leer sin ir a la API: "memoria", "sqlite" o vacío (desactivada)
+    REPLICA = _entorno("REPLICA", "")
+
+    # Archivo de la réplica "sqlite" (relativo a la carpeta del proyecto)
+    REPLICA_RUTA = _entorno("REPLICA_RUTA", "replica.sqlite3")
+
+    # Segundos entre copias completas de cada colección
+    REPLICA_INTERVALO = _entorno("REPLICA_INTERVALO", 30.0, float)
+
+    # ------------------- Búsqueda -------------------
+    # Segundos tras los cuales el índice de /buscar se reconstruye en segundo plano
+    BUSQUEDA_TTL = _entorno("BUSQUEDA_TTL", 30.0, float)
+
+    # Resultados por defecto de /buscar (?limite= admite hasta 100)
+    BUSQUEDA_LIMITE = _entorno("BUSQUEDA_LIMITE", 20, int)
+
+    # Construir los índices de /buscar en un hilo con la primera petición del worker y no en la primera búsqueda
+    BUSQUEDA_PRECARGAR = _entorno("BUSQUEDA_PRECARGAR", True, _booleano)
+
+    # ------------------- Caché HTTP -------------------
+    # Segundos que el navegador o el proxy pueden guardar / y /acerca sin revalidar
+    # (los listados siempre se revalidan con su ETag)
+    CACHE_PAGINAS_ESTATICAS = _entorno("CACHE_PAGINAS_ESTATICAS", 3600, int)
+
+    # ------------------- Paginación -------------------
+    # Filas por página por defecto y máximo permitido en ?size=
+    PAGINA_TAMANO = _entorno("PAGINA_TAMANO", 50, int)
+    PAGINA_TAMANO_MAXIMO = _entorno("PAGINA_TAMANO_MAXIMO", 500, int)
+
+    # Enviar page, size, sort y q a la API en lugar de paginar la lista en caché
+    API_PAGINACION_REMOTA = _entorno("API_PAGINACION_REMOTA", False, _booleano)
+
+    # ------------------- Tablero -------------------
+    # Segundos que se reutiliza el resumen de /tablero si ninguna lista cambió (0 lo calcula siempre)
+    TABLERO_TTL = _entorno("TABLERO_TTL", 10.0, float)
+
+    # Productos con stock menor o igual a este valor y cuántos de ellos se listan
+    TABLERO_STOCK_MINIMO = _entorno("TABLERO_STOCK_MINIMO", 5, int)
+    TABLERO_STOCK_LISTA = _entorno("TABLERO_STOCK_LISTA", 10, int)
+
+    # ------------------- Importación -------------------
+    # Registros que se envían a la API al mismo tiempo al importar un archivo
+    # (el pool de hilos del cliente limita además las peticiones a API_TAMANO_POOL)
+    IMPORTACION_LOTE = _entorno("IMPORTACION_LOTE", 20, int)
+
+    # ------------------- Renderizado -------------------
+    # Enviar las páginas de listado por partes mientras Jinja las genera
+    STREAMING_LISTADOS = _entorno("STREAMING_LISTADOS", False, _booleano)
+
+    # Caracteres que se acumulan antes de enviar cada parte de la respuesta
+    STREAMING_BUFFER = _entorno("STREAMING_BUFFER", 2048, int)
+
+    # Filas de tabla ya renderizadas y cuerpos de tabla completos que guarda cada
+    # worker (ver fragmentos.py); 0 desactiva cada una de las dos cachés
+    FRAGMENTOS_FILAS = _entorno("FRAGMENTOS_FILAS", 20_000, int)
+    FRAGMENTOS_CUERPOS = _entorno("FRAGMENTOS_CUERPOS", 64, int)
+
+    # Comprimir con gzip (o brotli, si está instalado) las páginas HTML, CSV y JSON
+    COMPRESION_HTML = _entorno("COMPRESION_HTML", False, _booleano)
+
+    # Bytes mínimos para comprimir una respuesta completa (las de streaming se comprimen siempre)
+    COMPRESION_MINIMO = _entorno("COMPRESION_MINIMO", 1024, int)
+
+    # Niveles de compresión: gzip de 1 a 9 y brotli de 0 a 11 (más alto: más pequeño y más lento)
+    COMPRESION_NIVEL_GZIP = _entorno("COMPRESION_NIVEL_GZIP", 6, int)
+    COMPRESION_NIVEL_BROTLI = _entorno("COMPRESION_NIVEL_BROTLI", 5, int)
+
+    # Carpeta con el bytecode de las plantillas generado por "python plantillas.py"
+    # (vacío: Jinja compila cada plantilla en memoria en cada worker)
+    PLANTILLAS_BYTECODE = _entorno("PLANTILLAS_BYTECODE", "")
+
+    # Cargar todas las plantillas al arrancar el worker y no en su primera petición
+    PLANTILLAS_PRECARGAR = _entorno("PLANTILLAS_PRECARGAR", True, _booleano)
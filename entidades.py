@@ -0,0 +1,83 @@
+# Registro declarativo de las entidades que gestiona el frontend
+# Cada entidad genera su Blueprint en rutas_entidades.py; para agregar una nueva
+# basta con añadirla a ENTIDADES, definir su modelo en modelos.py y crear su
+# plantilla en templates/.
+from dataclasses import fields
+
+from modelos import Cliente, Empresa, Factura, Persona, Producto, Vendedor
+
+
+class Entidad:
+    """
+    Descripción de una entidad de la API.
+    - nombre: recurso de la API en singular ("producto" -> /api/producto)
+    - plural: prefijo de las rutas, nombre de la plantilla y del Blueprint
+    - modelo: clase de sus registros (ver modelos.py)
+    - campos: campos del formulario (sin "codigo") y su tipo, tomados del modelo
+    - femenino: para redactar los mensajes ("Factura no encontrada")
+    """
+    __slots__ = ("nombre", "plural", "modelo", "campos", "femenino")
+
+    def __init__(self, nombre, plural, modelo, femenino=False):
+        self.nombre = nombre
+        self.plural = plural
+        self.modelo = modelo
+        self.campos = {campo.name: campo.type for campo in fields(modelo)[1:]}
+        self.femenino = femenino
+
+    @property
+    def recurso(self):
+        return self.nombre
+
+    @property
+    def blueprint(self):
+        return f"rutas_{self.plural}"
+
+    @property
+    def plantilla(self):
+        return f"{self.plural}.html"
+
+    @property
+    def mensaje_no_encontrado(self):
+        terminacion = "a" if self.femenino else "o"
+        return f"{self.nombre.capitalize()} no encontrad{terminacion}"
+
+    def leer_formulario(self, formulario, con_codigo=True):
+        """
+        Arma el diccionario que se envía a la API a partir del formulario,
+        validando y convirtiendo cada campo con el modelo de la entidad.
+        Lanza ValueError si falta un campo o un valor no tiene el tipo correcto.
+        """
+        return self.modelo.validar(formulario).datos(con_codigo)
+
+    def modelos(self, filas):
+        """
+        Convierte la lista de la API en una lista de modelos, que es la que se guarda en la caché.
+        """
+        return list(map(self.modelo.desde_api, filas))
+
+    @property
+    def columnas(self):
+        """
+        Columnas de los archivos de importación y exportación: el código y luego los campos.
+        """
+        return ["codigo", *self.campos]
+
+    def leer_registro(self, fila):
+        """
+        Valida una fila importada (CSV o JSON) y la convierte a los tipos de los campos.
+        Lanza ValueError con un mensaje legible si falta el código, falta un campo
+        o un valor no se puede convertir (p. ej. stock = "diez").
+        """
+        return self.modelo.validar(fila).datos()
+
+
+# ------------------- Entidades de la API -------------------
+ENTIDADES = [
+    Entidad("producto", "productos", Producto),
+    Entidad("cliente", "clientes", Cliente),
+    Entidad("factura", "facturas", Factura, femenino=True),
+    Entidad("vendedor", "vendedores", Vendedor),
+    Entidad("persona", "personas", Persona, femenino=True),
+    Entidad("empresa", "empresas", Empresa, femenino=True),
+]
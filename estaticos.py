@@ -0,0 +1,135 @@
+# Archivos estáticos con huella en el nombre y comprimidos de antemano
+# Paso de build (una vez por versión del código):
+#   python estaticos.py
+# Copia cada archivo de static/ a static/dist/ con el hash de su contenido en el
+# nombre (estilos.css -> dist/estilos.3f2a9c1d0b7e.css), genera sus versiones .gz
+# y .br (esta última si está instalado el paquete opcional brotli) y escribe
+# static/dist/manifiesto.json. Al arrancar, url_for('static', ...) usa esos nombres
+# y los archivos se sirven ya comprimidos con caché de un año (immutable).
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+
+from flask import request, send_from_directory
+
+# Carpeta de salida dentro de static/ y nombre del manifiesto
+DIRECTORIO_DIST = "dist"
+MANIFIESTO = "manifiesto.json"
+
+# Solo se comprimen los archivos de texto; las imágenes ya vienen comprimidas
+EXTENSIONES_COMPRIMIBLES = (".css", ".js", ".svg", ".html", ".txt", ".json", ".map")
+
+# Los nombres con huella nunca cambian de contenido: se pueden guardar un año
+CACHE_INMUTABLE = "public, max-age=31536000, immutable"
+
+
+def _comprimir_brotli(contenido):
+    """
+    Retorna el contenido comprimido con brotli o None si el paquete no está instalado.
+    """
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli.compress(contenido, quality=11)
+
+
+# ------------------- Build -------------------
+def construir(directorio_static):
+    """
+    Genera static/dist/ con los archivos renombrados según su contenido y sus
+    versiones comprimidas. Retorna el manifiesto {nombre original: nombre con huella}.
+    """
+    salida = os.path.join(directorio_static, DIRECTORIO_DIST)
+    shutil.rmtree(salida, ignore_errors=True)
+    os.makedirs(salida)
+
+    manifiesto = {}
+    for carpeta, subcarpetas, archivos in os.walk(directorio_static):
+        if os.path.abspath(carpeta) == os.path.abspath(directorio_static):
+            subcarpetas[:] = [s for s in subcarpetas if s != DIRECTORIO_DIST]
+        for archivo in sorted(archivos):
+            ruta = os.path.join(carpeta, archivo)
+            nombre = os.path.relpath(ruta, directorio_static).replace(os.sep, "/")
+            with open(ruta, "rb") as origen:
+                contenido = origen.read()
+
+            base, extension = os.path.splitext(nombre)
+            huella = hashlib.blake2b(contenido, digest_size=6).hexdigest()
+            destino = f"{DIRECTORIO_DIST}/{base}.{huella}{extension}"
+            ruta_destino = os.path.join(directorio_static, destino)
+            os.makedirs(os.path.dirname(ruta_destino), exist_ok=True)
+            with open(ruta_destino, "wb") as copia:
+                copia.write(contenido)
+
+            if extension.lower() in EXTENSIONES_COMPRIMIBLES:
+                # mtime=0 para que el .gz sea idéntico en cada build
+                with open(ruta_destino + ".gz", "wb") as comprimido:
+                    comprimido.write(gzip.compress(contenido, 9, mtime=0))
+                contenido_br = _comprimir_brotli(contenido)
+                if contenido_br is not None:
+                    with open(ruta_destino + ".br", "wb") as comprimido:
+                        comprimido.write(contenido_br)
+            manifiesto[nombre] = destino
+
+    with open(os.path.join(salida, MANIFIESTO), "w", encoding="utf-8") as archivo:
+        json.dump(manifiesto, archivo, indent=2, sort_keys=True)
+    return manifiesto
+
+
+# ------------------- Aplicación -------------------
+def configurar_estaticos(aplicacion):
+    """
+    Si existe static/dist/manifiesto.json, hace que url_for('static', filename=...)
+    apunte al nombre con huella y reemplaza la vista "static" para servir la
+    variante .br o .gz que acepte el navegador. Sin manifiesto no cambia nada.
+    """
+    ruta_manifiesto = os.path.join(aplicacion.static_folder, DIRECTORIO_DIST, MANIFIESTO)
+    if not os.path.exists(ruta_manifiesto):
+        return {}
+    with open(ruta_manifiesto, encoding="utf-8") as archivo:
+        manifiesto = json.load(archivo)
+    con_huella = set(manifiesto.values())
+
+    @aplicacion.url_defaults
+    def nombre_con_huella(endpoint, valores):
+        if endpoint == "static" and valores.get("filename") in manifiesto:
+            valores["filename"] = manifiesto[valores["filename"]]
+
+    servir_original = aplicacion.view_functions["static"]
+
+    def servir_estatico(filename):
+        """
+        Sirve los archivos con huella ya comprimidos y con caché inmutable;
+        los demás se sirven como siempre.
+        """
+        if filename not in con_huella:
+            return servir_original(filename=filename)
+
+        tipo, _ = mimetypes.guess_type(filename)
+        codificaciones = request.accept_encodings
+        for codificacion, extension in (("br", ".br"), ("gzip", ".gz")):
+            if codificaciones[codificacion] and os.path.exists(
+                    os.path.join(aplicacion.static_folder, filename + extension)):
+                respuesta = send_from_directory(aplicacion.static_folder, filename + extension,
+                                                mimetype=tipo, max_age=31536000)
+                respuesta.headers["Content-Encoding"] = codificacion
+                break
+        else:
+            respuesta = send_from_directory(aplicacion.static_folder, filename, mimetype=tipo, max_age=31536000)
+        respuesta.headers["Cache-Control"] = CACHE_INMUTABLE
+        respuesta.vary.add("Accept-Encoding")
+        return respuesta
+
+    aplicacion.view_functions["static"] = servir_estatico
+    aplicacion.extensions["manifiesto_estaticos"] = manifiesto
+    return manifiesto
+
+
+if __name__ == "__main__":
+    directorio = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+    generados = construir(directorio)
+    print(f"{len(generados)} archivos estáticos generados en {os.path.join(directorio, DIRECTORIO_DIST)}")
@@ -0,0 +1,208 @@
+# Caché de fragmentos HTML de las tablas de entidades
+# Aunque la lista venga de la caché, cada listado volvía a recorrer las filas en
+# Jinja y a llamar url_for() para el botón de eliminar de cada una. Aquí se guarda:
+# - el cuerpo completo de la tabla (<tbody>) de cada página, con la ETag de la
+#   página como clave (ver cache_http.etiqueta_listado): cambia cuando cambian
+#   las filas, los parámetros o las plantillas, así que nunca se sirve un cuerpo viejo
+# - el HTML de cada fila, con sus valores como clave: al cambiar un registro
+#   solo se renderiza de nuevo esa fila y las demás se concatenan ya hechas.
+# Con STREAMING_LISTADOS las filas se producen una a una (partes()) para que el
+# navegador las reciba a medida que se renderizan en lugar de al final.
+import threading
+import weakref
+from collections import OrderedDict
+
+from flask import current_app
+from markupsafe import Markup
+
+from modelos import Registro
+
+# Plantilla con la macro "fila" que comparten todas las entidades
+PLANTILLA_FILA = "_tabla.html"
+
+# Macro "fila" de cada entorno de Jinja (uno por aplicación)
+_macros = weakref.WeakKeyDictionary()
+
+
+def _valores(fila, columnas):
+    # Clave de una fila: la tupla de sus valores (los modelos ya la tienen, ver modelos.py)
+    if isinstance(fila, Registro):
+        return fila.values()
+    return tuple(map(fila.get, columnas))
+
+
+class _LRU:
+    """
+    Diccionario con un máximo de entradas; al superarlo se descartan primero
+    las usadas hace más tiempo. Con maximo = 0 no guarda nada.
+    """
+
+    def __init__(self, maximo):
+        self.maximo = maximo
+        self._entradas = OrderedDict()
+
+    def get(self, clave):
+        valor = self._entradas.get(clave)
+        if valor is not None:
+            self._entradas.move_to_end(clave)
+        return valor
+
+    def guardar(self, clave, valor):
+        if self.maximo <= 0:
+            return
+        self._entradas[clave] = valor
+        self._entradas.move_to_end(clave)
+        while len(self._entradas) > self.maximo:
+            self._entradas.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entradas)
+
+
+class CacheFragmentos:
+    """
+    Fragmentos HTML de las tablas, por proceso.
+    - max_filas: filas renderizadas que se guardan (0 desactiva la caché de filas)
+    - max_cuerpos: cuerpos de tabla completos que se guardan (0 la desactiva)
+    El HTML de una fila solo depende de sus valores, así que no hace falta
+    invalidar nada al crear, actualizar o eliminar: la fila nueva tiene otra clave
+    y la vieja sale del LRU cuando deja de usarse.
+    """
+
+    def __init__(self, max_filas=20_000, max_cuerpos=64):
+        self._filas = _LRU(max_filas)
+        self._cuerpos = _LRU(max_cuerpos)
+        self._candado = threading.Lock()
+        self._contadores = dict.fromkeys(
+            ("cuerpos_aciertos", "cuerpos_fallos", "filas_aciertos", "filas_fallos"), 0
+        )
+
+    @classmethod
+    def desde_configuracion(cls, config):
+        """
+        Crea la caché a partir de la configuración de Flask (ver configuracion.py).
+        """
+        return cls(max_filas=config["FRAGMENTOS_FILAS"], max_cuerpos=config["FRAGMENTOS_CUERPOS"])
+
+    def cuerpo(self, recurso, filas, columnas, renderizar_fila, clave=None):
+        """
+        Retorna el HTML (Markup) de las filas de una tabla.
+        - recurso / columnas: entidad y campos que muestra cada fila
+        - renderizar_fila(fila): HTML de una fila, solo se llama para las que no están guardadas
+        - clave: ETag de la página; si se indica se guarda también el cuerpo completo
+        """
+        if clave is not None:
+            with self._candado:
+                html = self._cuerpos.get((recurso, clave))
+                if html is not None:
+                    self._contadores["cuerpos_aciertos"] += 1
+                    return html
+
+        partes = []
+        faltantes = []
+        with self._candado:
+            for fila in filas:
+                valores = _valores(fila, columnas)
+                html = self._filas.get((recurso, valores))
+                partes.append(html)
+                if html is None:
+                    faltantes.append((len(partes) - 1, fila, valores))
+            self._contadores["filas_aciertos"] += len(partes) - len(faltantes)
+            self._contadores["filas_fallos"] += len(faltantes)
+
+        # Se renderiza fuera del candado: puede tardar y usa url_for()
+        nuevas = [(posicion, valores, renderizar_fila(fila)) for posicion, fila, valores in faltantes]
+        for posicion, _, html in nuevas:
+            partes[posicion] = html
+        html = Markup("".join(partes))
+
+        with self._candado:
+            for _, valores, fila_html in nuevas:
+                self._filas.guardar((recurso, valores), fila_html)
+            if clave is not None:
+                self._contadores["cuerpos_fallos"] += 1
+                self._cuerpos.guardar((recurso, clave), html)
+        return html
+
+    def partes(self, recurso, filas, columnas, renderizar_fila, clave=None):
+        """
+        Igual que cuerpo(), pero produce el HTML fila por fila a medida que se
+        pide (modo streaming): cada fila sale de la caché o se renderiza en ese
+        momento, sin esperar a las demás. Si se recorre completo y se indicó
+        "clave", el cuerpo armado se guarda como en cuerpo().
+        """
+        if clave is not None:
+            with self._candado:
+                html = self._cuerpos.get((recurso, clave))
+                if html is not None:
+                    self._contadores["cuerpos_aciertos"] += 1
+            if html is not None:
+                yield html
+                return
+
+        enviadas = [] if clave is not None else None
+        for fila in filas:
+            valores = _valores(fila, columnas)
+            with self._candado:
+                html = self._filas.get((recurso, valores))
+                self._contadores["filas_aciertos" if html is not None else "filas_fallos"] += 1
+            if html is None:
+                # Se renderiza fuera del candado: puede tardar y usa url_for()
+                html = renderizar_fila(fila)
+                with self._candado:
+                    self._filas.guardar((recurso, valores), html)
+            if enviadas is not None:
+                enviadas.append(html)
+            yield html
+
+        if enviadas is not None:
+            with self._candado:
+                self._contadores["cuerpos_fallos"] += 1
+                self._cuerpos.guardar((recurso, clave), Markup("".join(enviadas)))
+
+    # ------------------- Métricas -------------------
+    def metricas(self):
+        """
+        Genera las métricas de la caché de fragmentos en formato de texto de Prometheus.
+        """
+        with self._candado:
+            contadores = dict(self._contadores)
+            tamanos = {"filas": len(self._filas), "cuerpos": len(self._cuerpos)}
+
+        lineas = []
+        for nombre, valor in contadores.items():
+            lineas.append(f"# TYPE fragmentos_{nombre}_total counter")
+            lineas.append(f"fragmentos_{nombre}_total {valor}")
+        for nombre, valor in tamanos.items():
+            lineas.append(f"# TYPE fragmentos_{nombre} gauge")
+            lineas.append(f"fragmentos_{nombre} {valor}")
+        return "\n".join(lineas) + "\n"
+
+
+def _macro_fila(entorno):
+    macro = _macros.get(entorno)
+    if macro is None:
+        # En modo asíncrono (Quart) Jinja no expone las macros de una plantilla:
+        # se usa una copia síncrona del entorno con el mismo cargador
+        sincrono = entorno.overlay(enable_async=False) if entorno.is_async else entorno
+        macro = _macros[entorno] = sincrono.get_template(PLANTILLA_FILA).module.fila
+    return macro
+
+
+def renderizador_filas(entorno, columnas, accion):
+    """
+    Retorna la función que renderiza una fila con la macro "fila" de _tabla.html.
+    - entorno: jinja_env de la aplicación (Flask o Quart)
+    - accion(codigo): URL del formulario de eliminar de la fila (url_for)
+    """
+    def renderizar(fila):
+        return _macro_fila(entorno)(fila, columnas, accion(fila.get("codigo")))
+
+    return renderizar
+
+
+def obtener_fragmentos():
+    """
+    Retorna la caché de fragmentos que app.py registra en la aplicación actual.
+    """
+    return current_app.extensions["fragmentos"]
@@ -0,0 +1,215 @@
+# API falsa que reemplaza a la API en C# para pruebas de carga y benchmarks
+# Implementa /api/<recurso> y /api/<recurso>/codigo/<codigo> para todas las
+# entidades de entidades.py, con latencia, tamaño de respuesta y tasa de errores
+# configurables. Solo usa la biblioteca estándar.
+# Ejecutar con: python herramientas/api_falsa.py --registros 1000 --latencia 20
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Permite importar los módulos de la aplicación desde herramientas/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entidades import ENTIDADES
+
+
+def codigo_falso(entidad, indice):
+    """
+    Código del registro número "indice" de la entidad (p. ej. "pro17").
+    El benchmark usa la misma regla para buscar registros que existen.
+    """
+    return f"{entidad.nombre[:3]}{indice}"
+
+
+def registro_falso(entidad, indice, relleno=""):
+    """
+    Genera un registro con un valor de cada tipo para los campos de la entidad.
+    "relleno" se agrega a los campos de texto para aumentar el tamaño de la respuesta.
+    """
+    registro = {"codigo": codigo_falso(entidad, indice)}
+    for campo, tipo in entidad.campos.items():
+        if tipo is int:
+            registro[campo] = indice
+        elif tipo is float:
+            registro[campo] = round(indice * 1.5, 2)
+        else:
+            registro[campo] = f"{campo} {indice}{relleno}"
+    return registro
+
+
+class DatosFalsos:
+    """
+    Registros en memoria de cada recurso, protegidos por un candado
+    porque el servidor atiende cada conexión en un hilo.
+    """
+
+    def __init__(self, registros, bytes_relleno=0):
+        relleno = "x" * bytes_relleno
+        self.tablas = {
+            entidad.recurso: {
+                codigo_falso(entidad, i): registro_falso(entidad, i, relleno) for i in range(registros)
+            }
+            for entidad in ENTIDADES
+        }
+        self.candado = threading.Lock()
+
+    def listar(self, recurso, parametros):
+        """
+        Retorna el cuerpo de GET /api/<recurso>. Con ?page=&size= responde una
+        sola página con su "total", como espera API_PAGINACION_REMOTA.
+        """
+        with self.candado:
+            filas = list(self.tablas[recurso].values())
+        if "page" not in parametros:
+            return {"datos": filas}
+
+        q = parametros.get("q", [""])[0].lower()
+        if q:
+            filas = [f for f in filas if any(q in str(v).lower() for v in f.values())]
+        orden = parametros.get("sort", [""])[0]
+        if orden:
+            campo = orden.lstrip("-")
+            filas.sort(key=lambda f: (f.get(campo) is None, f.get(campo)), reverse=orden.startswith("-"))
+        pagina = max(int(parametros["page"][0]), 1)
+        tamano = max(int(parametros.get("size", ["50"])[0]), 1)
+        inicio = (pagina - 1) * tamano
+        return {"datos": filas[inicio:inicio + tamano], "total": len(filas)}
+
+
+def crear_manejador(datos, latencia, tasa_errores, semilla=None):
+    """
+    Crea la clase que atiende las peticiones con la configuración indicada.
+    latencia: segundos de espera antes de cada respuesta.
+    tasa_errores: proporción (0 a 1) de peticiones que responden 503.
+    """
+    aleatorio = random.Random(semilla)
+    candado_aleatorio = threading.Lock()
+
+    class Manejador(BaseHTTPRequestHandler):
+        # HTTP/1.1 para que el cliente pueda reutilizar la conexión (keep-alive)
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, formato, *args):
+            pass
+
+        def responder(self, estado, cuerpo):
+            contenido = json.dumps(cuerpo).encode("utf-8")
+            self.send_response(estado)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(contenido)))
+            self.end_headers()
+            self.wfile.write(contenido)
+
+        def leer_cuerpo(self):
+            largo = int(self.headers.get("Content-Length", 0))
+            return json.loads(self.rfile.read(largo) or b"{}")
+
+        def preparar(self):
+            """
+            Aplica la latencia y los errores simulados y separa la ruta.
+            Retorna (recurso, codigo, parametros) o None si ya se respondió.
+            """
+            url = urlsplit(self.path)
+            partes = url.path.strip("/").split("/")
+            if len(partes) not in (2, 4) or partes[0] != "api" or partes[1] not in datos.tablas:
+                self.responder(404, {"mensaje": "Recurso no encontrado"})
+                return None
+            if len(partes) == 4 and partes[2] != "codigo":
+                self.responder(404, {"mensaje": "Recurso no encontrado"})
+                return None
+
+            if latencia:
+                time.sleep(latencia)
+            with candado_aleatorio:
+                falla = tasa_errores and aleatorio.random() < tasa_errores
+            if falla:
+                self.leer_cuerpo()
+                self.responder(503, {"mensaje": "Error simulado"})
+                return None
+            return partes[1], (partes[3] if len(partes) == 4 else None), parse_qs(url.query)
+
+        def do_GET(self):
+            ruta = self.preparar()
+            if ruta is None:
+                return
+            recurso, codigo, parametros = ruta
+            if codigo is None:
+                return self.responder(200, datos.listar(recurso, parametros))
+            with datos.candado:
+                registro = datos.tablas[recurso].get(codigo)
+            if registro is None:
+                return self.responder(404, {"datos": []})
+            self.responder(200, {"datos": [registro]})
+
+        def do_POST(self):
+            ruta = self.preparar()
+            if ruta is None:
+                return
+            recurso, _, _ = ruta
+            registro = self.leer_cuerpo()
+            with datos.candado:
+                datos.tablas[recurso][registro.get("codigo")] = registro
+            self.responder(200, {"mensaje": "Registro creado"})
+
+        def do_PUT(self):
+            ruta = self.preparar()
+            if ruta is None:
+                return
+            recurso, codigo, _ = ruta
+            registro = self.leer_cuerpo()
+            registro["codigo"] = codigo
+            with datos.candado:
+                datos.tablas[recurso][codigo] = registro
+            self.responder(200, {"mensaje": "Registro actualizado"})
+
+        def do_DELETE(self):
+            ruta = self.preparar()
+            if ruta is None:
+                return
+            recurso, codigo, _ = ruta
+            with datos.candado:
+                datos.tablas[recurso].pop(codigo, None)
+            self.responder(200, {"mensaje": "Registro eliminado"})
+
+    return Manejador
+
+
+def crear_servidor(host="127.0.0.1", puerto=5031, registros=100, latencia=0.0,
+                   bytes_relleno=0, tasa_errores=0.0, semilla=None):
+    """
+    Crea el servidor sin iniciarlo (ver serve_forever()); el benchmark lo usa así.
+    """
+    datos = DatosFalsos(registros, bytes_relleno)
+    manejador = crear_manejador(datos, latencia, tasa_errores, semilla)
+    servidor = ThreadingHTTPServer((host, puerto), manejador)
+    servidor.daemon_threads = True
+    return servidor
+
+
+def leer_argumentos(argumentos=None):
+    parser = argparse.ArgumentParser(description="API falsa para pruebas de carga del frontend")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=5031)
+    parser.add_argument("--registros", type=int, default=100, help="registros por recurso")
+    parser.add_argument("--latencia", type=float, default=0.0, help="milisegundos de espera por petición")
+    parser.add_argument("--relleno", type=int, default=0, help="bytes extra en cada campo de texto")
+    parser.add_argument("--errores", type=float, default=0.0, help="proporción de respuestas 503 (0 a 1)")
+    parser.add_argument("--semilla", type=int, default=None, help="semilla de los errores simulados")
+    return parser.parse_args(argumentos)
+
+
+if __name__ == "__main__":
+    args = leer_argumentos()
+    servidor = crear_servidor(args.host, args.puerto, args.registros, args.latencia / 1000,
+                              args.relleno, args.errores, args.semilla)
+    print(f"API falsa en http://{args.host}:{args.puerto}/api ({args.registros} registros por recurso)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,95 @@
+# Benchmark de arranque en frío: mide cuánto tarda un worker nuevo en arrancar y
+# en atender la primera petición de cada página, con y sin las plantillas compiladas
+# de antemano (ver plantillas.py). Cada medición se hace en un proceso Python nuevo.
+# Ejecutar con: python herramientas/arranque.py --repeticiones 5 --salida arranque.json
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from entidades import ENTIDADES
+from benchmark import commit_actual, esperar_servidor
+
+RUTAS = ["/", "/acerca"] + [f"/{entidad.plural}" for entidad in ENTIDADES]
+
+# Script del proceso medido: importa la aplicación y pide cada ruta una vez
+MEDIDOR = """
+import json, sys, time
+inicio = time.perf_counter()
+from app import aplicacion
+arranque = time.perf_counter() - inicio
+cliente = aplicacion.test_client()
+primeras = {}
+for ruta in sys.argv[1:]:
+    t = time.perf_counter()
+    cliente.get(ruta).close()
+    primeras[ruta] = time.perf_counter() - t
+print(json.dumps({"arranque": arranque, "primeras": primeras}))
+"""
+
+# Modos comparados: (nombre, PLANTILLAS_PRECARGAR, usar bytecode)
+MODOS = [
+    ("perezoso", "0", False),
+    ("precarga", "1", False),
+    ("bytecode", "1", True),
+]
+
+
+def medir(entorno):
+    salida = subprocess.run([sys.executable, "-c", MEDIDOR, *RUTAS], cwd=RAIZ, env=entorno,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(salida.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de arranque en frío del frontend")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--puerto-api", type=int, default=5031)
+    parser.add_argument("--salida", default="arranque.json")
+    args = parser.parse_args()
+
+    api = subprocess.Popen([sys.executable, os.path.join(RAIZ, "herramientas", "api_falsa.py"),
+                            "--puerto", str(args.puerto_api)])
+    try:
+        esperar_servidor("127.0.0.1", args.puerto_api, "/api/producto/codigo/x")
+        with tempfile.TemporaryDirectory() as carpeta:
+            base = dict(os.environ, API_URL_BASE=f"http://127.0.0.1:{args.puerto_api}/api")
+
+            # Paso de build: generar el bytecode una vez, como en el despliegue
+            subprocess.run([sys.executable, "plantillas.py"], cwd=RAIZ, check=True, capture_output=True,
+                           env=dict(base, PLANTILLAS_BYTECODE=carpeta))
+
+            resultados = {}
+            for nombre, precargar, con_bytecode in MODOS:
+                entorno = dict(base, PLANTILLAS_PRECARGAR=precargar,
+                               PLANTILLAS_BYTECODE=carpeta if con_bytecode else "")
+                mediciones = [medir(entorno) for _ in range(args.repeticiones)]
+                arranque = statistics.median(m["arranque"] for m in mediciones)
+                primeras = {ruta: statistics.median(m["primeras"][ruta] for m in mediciones) for ruta in RUTAS}
+                resultados[nombre] = {
+                    "arranque_ms": round(arranque * 1000, 2),
+                    "primeras_peticiones_ms": round(sum(primeras.values()) * 1000, 2),
+                    "total_ms": round((arranque + sum(primeras.values())) * 1000, 2),
+                    "por_ruta_ms": {ruta: round(valor * 1000, 2) for ruta, valor in primeras.items()},
+                }
+                print(f"{nombre:<10} arranque {resultados[nombre]['arranque_ms']:>8.1f} ms  "
+                      f"primeras peticiones {resultados[nombre]['primeras_peticiones_ms']:>8.1f} ms  "
+                      f"total {resultados[nombre]['total_ms']:>8.1f} ms")
+    finally:
+        api.terminate()
+        api.wait()
+
+    informe = {"commit": commit_actual(), "repeticiones": args.repeticiones, "rutas": RUTAS, "modos": resultados}
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2, sort_keys=True)
+    print(f"Resultados guardados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+# Benchmark del frontend: recorre las rutas de listar, buscar y CRUD de cada entidad
+# con una concurrencia fija y reporta latencia p50/p99, peticiones por segundo y
+# memoria (RSS) del proceso. Los resultados se guardan en JSON para comparar commits.
+# Solo usa la biblioteca estándar.
+# Ejecutar con: python herramientas/benchmark.py --concurrencia 16 --duracion 5 --salida base.json
+# y después:    python herramientas/benchmark.py --salida nuevo.json --comparar base.json
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlencode, urlsplit
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from entidades import ENTIDADES
+from api_falsa import codigo_falso
+
+# Script que levanta la aplicación WSGI con el servidor de Werkzeug en un proceso aparte
+LANZADOR_APP = (
+    "import sys; from werkzeug.serving import run_simple; from app import aplicacion; "
+    "run_simple('127.0.0.1', int(sys.argv[1]), aplicacion, threaded=True)"
+)
+
+
+# ------------------- Escenarios -------------------
+def valor_formulario(tipo, indice):
+    if tipo is int:
+        return str(indice)
+    if tipo is float:
+        return f"{indice * 1.5:.2f}"
+    return f"bench {indice}"
+
+
+def crear_escenarios(entidades, registros, aleatorio):
+    """
+    Retorna {nombre: generador de iteraciones}. Cada iteración es una lista de
+    peticiones (operacion, metodo, ruta, formulario) que un trabajador envía en orden.
+    Las operaciones de escritura de una iteración usan un código propio para
+    que los trabajadores no se pisen entre sí.
+    """
+    escenarios = {}
+    contador = iter(range(10 ** 9))
+    candado = threading.Lock()
+
+    for entidad in entidades:
+        prefijo = f"/{entidad.plural}"
+        primer_campo = next(iter(entidad.campos))
+
+        def listar(prefijo=prefijo):
+            return [("listar", "GET", prefijo, None)]
+
+        def listar_pagina(prefijo=prefijo, campo=primer_campo):
+            ruta = f"{prefijo}?{urlencode({'page': 2, 'size': 20, 'sort': '-' + campo, 'q': '1'})}"
+            return [("listar_pagina", "GET", ruta, None)]
+
+        def buscar(prefijo=prefijo, entidad=entidad):
+            with candado:
+                indice = aleatorio.randrange(max(registros, 1))
+            return [("buscar", "POST", f"{prefijo}/buscar", {"codigo_buscar": codigo_falso(entidad, indice)})]
+
+        def crud(prefijo=prefijo, entidad=entidad):
+            with candado:
+                indice = next(contador)
+            codigo = f"bench{indice}"
+            formulario = {campo: valor_formulario(tipo, indice) for campo, tipo in entidad.campos.items()}
+            return [
+                ("crear", "POST", f"{prefijo}/crear", {"codigo": codigo, **formulario}),
+                ("actualizar", "POST", f"{prefijo}/actualizar", {"codigo": codigo, **formulario}),
+                ("eliminar", "POST", f"{prefijo}/eliminar/{codigo}", {}),
+            ]
+
+        for nombre, funcion in (("listar", listar), ("listar_pagina", listar_pagina),
+                                ("buscar", buscar), ("crud", crud)):
+            escenarios[f"{nombre}:{entidad.plural}"] = funcion
+    return escenarios
+
+
+# ------------------- Carga -------------------
+class Trabajador(threading.Thread):
+    """
+    Envía iteraciones de un escenario por una conexión keep-alive propia hasta
+    que se cumple el tiempo. Guarda la latencia de cada petición por operación.
+    """
+
+    def __init__(self, host, puerto, escenario, fin):
+        super().__init__(daemon=True)
+        self.host = host
+        self.puerto = puerto
+        self.escenario = escenario
+        self.fin = fin
+        self.latencias = {}
+        self.errores = {}
+        self.conexion = None
+
+    def enviar(self, metodo, ruta, formulario):
+        cuerpo = urlencode(formulario) if formulario is not None else None
+        cabeceras = {"Content-Type": "application/x-www-form-urlencoded"} if cuerpo is not None else {}
+        for intento in range(2):
+            if self.conexion is None:
+                self.conexion = http.client.HTTPConnection(self.host, self.puerto, timeout=30)
+            try:
+                self.conexion.request(metodo, ruta, body=cuerpo, headers=cabeceras)
+                respuesta = self.conexion.getresponse()
+                respuesta.read()
+                if respuesta.will_close:
+                    self.conexion.close()
+                    self.conexion = None
+                return respuesta.status
+            except (http.client.HTTPException, ConnectionError):
+                # El servidor cerró la conexión keep-alive: abrir otra y reintentar una vez
+                self.conexion.close()
+                self.conexion = None
+                if intento:
+                    raise
+
+    def run(self):
+        while time.perf_counter() < self.fin:
+            for operacion, metodo, ruta, formulario in self.escenario():
+                inicio = time.perf_counter()
+                try:
+                    estado = self.enviar(metodo, ruta, formulario)
+                except (OSError, http.client.HTTPException):
+                    estado = None
+                    if self.conexion is not None:
+                        self.conexion.close()
+                        self.conexion = None
+                duracion = time.perf_counter() - inicio
+                self.latencias.setdefault(operacion, []).append(duracion)
+                if estado is None or estado >= 400:
+                    self.errores[operacion] = self.errores.get(operacion, 0) + 1
+        if self.conexion is not None:
+            self.conexion.close()
+
+
+def percentil(ordenadas, p):
+    """
+    Percentil por rango más cercano sobre una lista ya ordenada.
+    """
+    if not ordenadas:
+        return 0.0
+    indice = max(int(round(p / 100 * len(ordenadas))) - 1, 0)
+    return ordenadas[min(indice, len(ordenadas) - 1)]
+
+
+def ejecutar_escenario(host, puerto, escenario, concurrencia, duracion):
+    """
+    Ejecuta el escenario con "concurrencia" trabajadores durante "duracion" segundos.
+    Retorna {operacion: estadísticas}.
+    """
+    inicio = time.perf_counter()
+    trabajadores = [Trabajador(host, puerto, escenario, inicio + duracion) for _ in range(concurrencia)]
+    for trabajador in trabajadores:
+        trabajador.start()
+    for trabajador in trabajadores:
+        trabajador.join()
+    transcurrido = time.perf_counter() - inicio
+
+    resultados = {}
+    for operacion in sorted({op for t in trabajadores for op in t.latencias}):
+        latencias = sorted(x for t in trabajadores for x in t.latencias.get(operacion, ()))
+        errores = sum(t.errores.get(operacion, 0) for t in trabajadores)
+        resultados[operacion] = {
+            "peticiones": len(latencias),
+            "errores": errores,
+            "rps": round(len(latencias) / transcurrido, 2),
+            "p50_ms": round(percentil(latencias, 50) * 1000, 3),
+            "p90_ms": round(percentil(latencias, 90) * 1000, 3),
+            "p99_ms": round(percentil(latencias, 99) * 1000, 3),
+            "media_ms": round(sum(latencias) / len(latencias) * 1000, 3) if latencias else 0.0,
+            "max_ms": round(latencias[-1] * 1000, 3) if latencias else 0.0,
+        }
+    return resultados
+
+
+# ------------------- Procesos -------------------
+def memoria_proceso(pid):
+    """
+    Retorna (rss_kb, rss_max_kb) del proceso leyendo /proc (solo Linux), o (None, None).
+    """
+    valores = {}
+    try:
+        with open(f"/proc/{pid}/status") as archivo:
+            for linea in archivo:
+                if linea.startswith(("VmRSS:", "VmHWM:")):
+                    nombre, valor = linea.split(":", 1)
+                    valores[nombre] = int(valor.split()[0])
+    except OSError:
+        return None, None
+    return valores.get("VmRSS"), valores.get("VmHWM")
+
+
+def esperar_servidor(host, puerto, ruta, limite=15.0):
+    fin = time.monotonic() + limite
+    while time.monotonic() < fin:
+        try:
+            conexion = http.client.HTTPConnection(host, puerto, timeout=2)
+            conexion.request("GET", ruta)
+            conexion.getresponse().read()
+            conexion.close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"El servidor {host}:{puerto} no respondió en {limite} segundos")
+
+
+def iniciar_procesos(args):
+    """
+    Inicia la API falsa y la aplicación en procesos aparte, salvo que se usen
+    --api-externa o --url. Retorna (procesos, host, puerto, pid_app).
+    """
+    procesos = []
+    entorno = dict(os.environ)
+    if not args.api_externa:
+        procesos.append(subprocess.Popen([
+            sys.executable, os.path.join(RAIZ, "herramientas", "api_falsa.py"),
+            "--puerto", str(args.puerto_api), "--registros", str(args.registros),
+            "--latencia", str(args.latencia), "--relleno", str(args.relleno),
+            "--errores", str(args.errores), "--semilla", str(args.semilla)
+        ]))
+        entorno["API_URL_BASE"] = f"http://127.0.0.1:{args.puerto_api}/api"
+        esperar_servidor("127.0.0.1", args.puerto_api, "/api/producto/codigo/x")
+
+    if args.url:
+        url = urlsplit(args.url)
+        return procesos, url.hostname, url.port or 80, args.pid
+
+    app = subprocess.Popen([sys.executable, "-c", LANZADOR_APP, str(args.puerto_app)], cwd=RAIZ, env=entorno,
+                           stderr=subprocess.DEVNULL)
+    procesos.append(app)
+    esperar_servidor("127.0.0.1", args.puerto_app, "/acerca")
+    return procesos, "127.0.0.1", args.puerto_app, app.pid
+
+
+def commit_actual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ------------------- Comparación -------------------
+def comparar(anterior, actual):
+    """
+    Imprime la variación de p50, p99 y rps de cada operación respecto a un resultado anterior.
+    """
+    print(f"\nComparación con {anterior.get('commit')} ({anterior.get('fecha')}):")
+    for escenario, operaciones in actual["escenarios"].items():
+        for operacion, datos in operaciones.items():
+            previo = anterior.get("escenarios", {}).get(escenario, {}).get(operacion)
+            if not previo:
+                continue
+            cambios = []
+            for campo in ("p50_ms", "p99_ms", "rps"):
+                if previo[campo]:
+                    cambios.append(f"{campo} {(datos[campo] - previo[campo]) / previo[campo] * 100:+.1f}%")
+            print(f"  {escenario:<28} {operacion:<14} " + "  ".join(cambios))
+
+
+# ------------------- Principal -------------------
+def leer_argumentos(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark de las rutas del frontend")
+    parser.add_argument("--url", help="frontend ya iniciado (p. ej. http://127.0.0.1:8000); si se omite se inicia app.py")
+    parser.add_argument("--pid", type=int, help="pid del frontend indicado en --url, para medir su RSS")
+    parser.add_argument("--api-externa", action="store_true", help="no iniciar la API falsa (usar API_URL_BASE)")
+    parser.add_argument("--puerto-app", type=int, default=5055)
+    parser.add_argument("--puerto-api", type=int, default=5031)
+    parser.add_argument("--registros", type=int, default=500, help="registros por recurso en la API falsa")
+    parser.add_argument("--latencia", type=float, default=5.0, help="milisegundos de latencia de la API falsa")
+    parser.add_argument("--relleno", type=int, default=0, help="bytes extra por campo de texto en la API falsa")
+    parser.add_argument("--errores", type=float, default=0.0, help="proporción de respuestas 503 de la API falsa")
+    parser.add_argument("--concurrencia", type=int, default=8)
+    parser.add_argument("--duracion", type=float, default=3.0, help="segundos por escenario")
+    parser.add_argument("--entidades", nargs="*", help="plurales a medir (por defecto todas)")
+    parser.add_argument("--escenarios", nargs="*", default=["listar", "listar_pagina", "buscar", "crud"])
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", default="benchmark.json", help="archivo JSON de resultados")
+    parser.add_argument("--comparar", help="archivo JSON de un resultado anterior")
+    return parser.parse_args(argumentos)
+
+
+def main(argumentos=None):
+    args = leer_argumentos(argumentos)
+    entidades = [e for e in ENTIDADES if not args.entidades or e.plural in args.entidades]
+    escenarios = crear_escenarios(entidades, args.registros, random.Random(args.semilla))
+
+    procesos, host, puerto, pid = iniciar_procesos(args)
+    try:
+        rss_inicio, _ = memoria_proceso(pid) if pid else (None, None)
+        resultados = {}
+        for nombre, escenario in escenarios.items():
+            if nombre.split(":")[0] not in args.escenarios:
+                continue
+            resultados[nombre] = ejecutar_escenario(host, puerto, escenario, args.concurrencia, args.duracion)
+            for operacion, datos in resultados[nombre].items():
+                print(f"{nombre:<28} {operacion:<14} {datos['rps']:>9.1f} rps  p50 {datos['p50_ms']:>8.2f} ms  "
+                      f"p99 {datos['p99_ms']:>8.2f} ms  errores {datos['errores']}")
+        rss_fin, rss_max = memoria_proceso(pid) if pid else (None, None)
+    finally:
+        for proceso in reversed(procesos):
+            proceso.terminate()
+            proceso.wait()
+
+    informe = {
+        "commit": commit_actual(),
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": {campo: valor for campo, valor in vars(args).items() if campo not in ("salida", "comparar")},
+        "memoria_kb": {"rss_inicio": rss_inicio, "rss_fin": rss_fin, "rss_max": rss_max},
+        "escenarios": resultados,
+    }
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2, sort_keys=True)
+    print(f"\nRSS del frontend: inicio {rss_inicio} kB, fin {rss_fin} kB, máximo {rss_max} kB")
+    print(f"Resultados guardados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            comparar(json.load(archivo), informe)
+
+
+if __name__ == "__main__":
+    main()
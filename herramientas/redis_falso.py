@@ -0,0 +1,121 @@
+# Servidor compatible con Redis, mínimo, para probar CACHE_BACKEND=redis sin instalar Redis
+# Implementa sobre el protocolo RESP los comandos que usa almacenes_cache.AlmacenRedis
+# (GET, SET con EX/PX, INCR, DEL, PING, AUTH, SELECT, FLUSHALL) con los datos en
+# memoria. Solo usa la biblioteca estándar; no persiste nada.
+# Ejecutar con: python herramientas/redis_falso.py --puerto 6379
+import argparse
+import socketserver
+import threading
+import time
+
+
+class DatosRedis:
+    """
+    Claves y valores en memoria con vencimiento opcional (momento time.monotonic()).
+    """
+
+    def __init__(self):
+        self._valores = {}
+        self._vencimientos = {}
+        self._candado = threading.Lock()
+
+    def _vigente(self, clave):
+        vencimiento = self._vencimientos.get(clave)
+        if vencimiento is not None and vencimiento <= time.monotonic():
+            self._valores.pop(clave, None)
+            self._vencimientos.pop(clave, None)
+        return self._valores.get(clave)
+
+    def ejecutar(self, comando, argumentos):
+        """
+        Ejecuta un comando y retorna la respuesta (bytes, int, None o una excepción
+        con el mensaje de error que se envía al cliente).
+        """
+        with self._candado:
+            if comando == b"PING":
+                return b"PONG"
+            if comando in (b"AUTH", b"SELECT"):
+                return b"OK"
+            if comando == b"FLUSHALL":
+                self._valores.clear()
+                self._vencimientos.clear()
+                return b"OK"
+            if comando == b"GET" and len(argumentos) == 1:
+                return self._vigente(argumentos[0])
+            if comando == b"SET" and len(argumentos) >= 2:
+                clave, valor, opciones = argumentos[0], argumentos[1], argumentos[2:]
+                self._valores[clave] = valor
+                self._vencimientos.pop(clave, None)
+                if len(opciones) == 2 and opciones[0].upper() in (b"EX", b"PX"):
+                    segundos = int(opciones[1]) / (1 if opciones[0].upper() == b"EX" else 1000)
+                    self._vencimientos[clave] = time.monotonic() + segundos
+                return b"OK"
+            if comando == b"INCR" and len(argumentos) == 1:
+                valor = int(self._vigente(argumentos[0]) or 0) + 1
+                self._valores[argumentos[0]] = str(valor).encode()
+                return valor
+            if comando == b"DEL":
+                borradas = 0
+                for clave in argumentos:
+                    borradas += self._vigente(clave) is not None
+                    self._valores.pop(clave, None)
+                    self._vencimientos.pop(clave, None)
+                return borradas
+        return ValueError(f"ERR comando no soportado '{comando.decode(errors='replace')}'")
+
+
+def _codificar(respuesta):
+    if respuesta is None:
+        return b"$-1\r\n"
+    if isinstance(respuesta, Exception):
+        return b"-%s\r\n" % str(respuesta).encode()
+    if isinstance(respuesta, int):
+        return b":%d\r\n" % respuesta
+    if respuesta in (b"OK", b"PONG"):
+        return b"+%s\r\n" % respuesta
+    return b"$%d\r\n%s\r\n" % (len(respuesta), respuesta)
+
+
+def crear_manejador(datos):
+    class Manejador(socketserver.StreamRequestHandler):
+        def handle(self):
+            while True:
+                linea = self.rfile.readline()
+                if not linea.startswith(b"*"):
+                    return
+                partes = []
+                for _ in range(int(linea[1:])):
+                    largo = int(self.rfile.readline()[1:])
+                    partes.append(self.rfile.read(largo + 2)[:-2])
+                if not partes:
+                    continue
+                self.wfile.write(_codificar(datos.ejecutar(partes[0].upper(), partes[1:])))
+                self.wfile.flush()
+
+    return Manejador
+
+
+def crear_servidor(host="127.0.0.1", puerto=6379):
+    """
+    Crea el servidor sin iniciarlo (ver serve_forever()).
+    """
+    servidor = socketserver.ThreadingTCPServer((host, puerto), crear_manejador(DatosRedis()))
+    servidor.daemon_threads = True
+    return servidor
+
+
+def leer_argumentos(argumentos=None):
+    parser = argparse.ArgumentParser(description="Servidor compatible con Redis para pruebas de la caché")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=6379)
+    return parser.parse_args(argumentos)
+
+
+if __name__ == "__main__":
+    args = leer_argumentos()
+    servidor = crear_servidor(args.host, args.puerto)
+    print(f"Redis falso en {args.host}:{args.puerto}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,239 @@
+# Importación y exportación masiva de registros en CSV o JSON
+# La importación lee el archivo por partes, valida cada fila con los tipos de la
+# entidad y envía los registros a la API en lotes concurrentes; la exportación
+# recorre la lista de la API a medida que llega y la escribe como CSV.
+import csv
+import io
+
+from json_incremental import iterar_lista
+
+# Bytes que se leen del archivo subido en cada paso al importar un JSON
+TAMANO_FRAGMENTO = 64 * 1024
+
+# Filas que se acumulan antes de enviar cada parte del CSV exportado
+FILAS_POR_PARTE = 500
+
+# Errores de filas que se muestran en el resumen de la importación
+MAXIMO_ERRORES = 20
+
+
+class ResultadoImportacion:
+    """
+    Resumen de una importación: filas leídas, registros creados en la API y errores
+    (número de fila y motivo). "interrumpida" indica que la API dejó de responder y
+    "error_archivo" que el archivo no se pudo seguir leyendo (columnas, CSV o JSON inválido).
+    """
+    __slots__ = ("leidas", "creados", "errores", "total_errores", "interrumpida", "error_archivo")
+
+    def __init__(self):
+        self.leidas = 0
+        self.creados = 0
+        self.errores = []
+        self.total_errores = 0
+        self.interrumpida = False
+        self.error_archivo = None
+
+    def agregar_error(self, fila, motivo):
+        self.total_errores += 1
+        if len(self.errores) < MAXIMO_ERRORES:
+            self.errores.append((fila, motivo))
+
+    @property
+    def mensaje(self):
+        partes = [f"Importados {self.creados} de {self.leidas} registros"]
+        if self.error_archivo:
+            partes.append(f"Archivo inválido: {self.error_archivo}")
+        if self.interrumpida:
+            partes.append("la importación se detuvo porque la API no responde")
+        if self.total_errores:
+            detalle = "; ".join(f"fila {fila}: {motivo}" for fila, motivo in self.errores)
+            if self.total_errores > len(self.errores):
+                detalle += f"; y {self.total_errores - len(self.errores)} más"
+            partes.append(f"{self.total_errores} con errores ({detalle})")
+        return ". ".join(partes)
+
+
+# ------------------- Lectura del archivo -------------------
+def leer_filas(archivo):
+    """
+    Produce (número de fila, diccionario) del archivo subido sin cargarlo entero.
+    Los archivos .json pueden ser una lista de objetos o {"datos": [...]};
+    cualquier otro se lee como CSV con encabezado.
+    """
+    nombre = (archivo.filename or "").lower()
+    if nombre.endswith(".json") or archivo.mimetype == "application/json":
+        fragmentos = iter(lambda: archivo.stream.read(TAMANO_FRAGMENTO), b"")
+        for numero, fila in enumerate(iterar_lista(fragmentos), start=1):
+            yield numero, fila if isinstance(fila, dict) else {}
+        return
+
+    # utf-8-sig descarta el BOM que agregan algunas hojas de cálculo
+    texto = io.TextIOWrapper(archivo.stream, encoding="utf-8-sig", newline="")
+    try:
+        # La fila 1 es el encabezado; los números coinciden con las filas de la hoja de cálculo
+        for numero, fila in enumerate(csv.DictReader(texto), start=2):
+            yield numero, fila
+    except csv.Error as e:
+        raise ValueError(f"CSV inválido: {e}") from None
+    finally:
+        texto.detach()
+
+
+def validar_columnas(entidad, filas):
+    """
+    Comprueba con la primera fila que el archivo traiga todas las columnas de la
+    entidad, para rechazar un archivo equivocado antes de enviar nada a la API.
+    """
+    filas = iter(filas)
+    primera = next(filas, None)
+    if primera is None:
+        return
+    faltantes = [columna for columna in entidad.columnas if columna not in primera[1]]
+    if faltantes:
+        raise ValueError(f"Al archivo le faltan las columnas: {', '.join(faltantes)}")
+    yield primera
+    yield from filas
+
+
+# ------------------- Envío a la API -------------------
+def _lotes(entidad, filas, lote, resultado):
+    """
+    Valida las filas y produce listas de hasta "lote" pares (número de fila, datos).
+    Las filas inválidas se anotan en "resultado"; el siguiente lote se lee del
+    archivo solo cuando se pide, es decir, cuando el anterior ya se envió.
+    """
+    pendientes = []
+    filas = validar_columnas(entidad, filas)
+    while True:
+        try:
+            numero, fila = next(filas)
+        except StopIteration:
+            break
+        except ValueError as e:
+            # Lo ya leído se envía igual; el resto del archivo se descarta
+            resultado.error_archivo = str(e)
+            break
+
+        resultado.leidas += 1
+        try:
+            pendientes.append((numero, entidad.leer_registro(fila)))
+        except ValueError as e:
+            resultado.agregar_error(numero, str(e))
+        if len(pendientes) >= lote:
+            yield pendientes
+            pendientes = []
+
+    if pendientes:
+        yield pendientes
+
+
+def _resultado_creacion(numero, respuesta=None, error=None):
+    """
+    Resultado del envío de una fila: (número, error o None, sin conexión).
+    """
+    if error is not None:
+        return numero, f"error de conexión: {error}", True
+    if respuesta.status_code >= 400:
+        return numero, f"la API respondió {respuesta.status_code}", False
+    return numero, None, False
+
+
+def _registrar_lote(resultado, respuestas):
+    """
+    Suma al resultado las respuestas de un lote. Retorna True si todas fallaron
+    por conexión, en cuyo caso la importación se detiene.
+    """
+    for numero, error, _ in respuestas:
+        if error is None:
+            resultado.creados += 1
+        else:
+            resultado.agregar_error(numero, error)
+    if all(sin_conexion for _, _, sin_conexion in respuestas):
+        resultado.interrumpida = True
+    return resultado.interrumpida
+
+
+def importar(api, entidad, filas, lote=20):
+    """
+    Valida las filas y crea los registros en la API de "lote" en "lote".
+    Los registros de un lote se envían al mismo tiempo con api.en_paralelo_importacion(),
+    cuyo pool de hilos propio limita las peticiones simultáneas a API_TAMANO_POOL_IMPORTACION;
+    el siguiente lote se lee del archivo solo cuando el anterior terminó.
+    Si todos los registros de un lote fallan por conexión, la importación se detiene.
+    """
+    resultado = ResultadoImportacion()
+
+    def crear(numero, datos):
+        try:
+            return _resultado_creacion(numero, api.post(entidad.recurso, json=datos))
+        except Exception as e:
+            return _resultado_creacion(numero, error=e)
+
+    for pendientes in _lotes(entidad, filas, lote, resultado):
+        respuestas = api.en_paralelo_importacion(*(lambda n=n, d=d: crear(n, d) for n, d in pendientes))
+        if _registrar_lote(resultado, respuestas):
+            break
+    return resultado
+
+
+async def importar_async(api, entidad, filas, lote=20):
+    """
+    Versión asíncrona de importar() para el modo ASGI: cada lote se espera
+    con api.en_paralelo() (asyncio.gather) sobre el cliente asíncrono.
+    """
+    resultado = ResultadoImportacion()
+
+    async def crear(numero, datos):
+        try:
+            return _resultado_creacion(numero, await api.post(entidad.recurso, json=datos))
+        except Exception as e:
+            return _resultado_creacion(numero, error=e)
+
+    for pendientes in _lotes(entidad, filas, lote, resultado):
+        respuestas = await api.en_paralelo(*(crear(n, d) for n, d in pendientes))
+        if _registrar_lote(resultado, respuestas):
+            break
+    return resultado
+
+
+# ------------------- Exportación -------------------
+def _escritor_csv(entidad):
+    buffer = io.StringIO()
+    escritor = csv.DictWriter(buffer, fieldnames=entidad.columnas, extrasaction="ignore")
+    escritor.writeheader()
+    return buffer, escritor
+
+
+def _vaciar(buffer):
+    parte = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return parte
+
+
+def exportar_csv(entidad, registros):
+    """
+    Produce el CSV (con encabezado) de los registros en partes de FILAS_POR_PARTE filas.
+    "registros" puede ser un iterador (ClienteAPI.iterar): nunca se guarda la lista completa.
+    """
+    buffer, escritor = _escritor_csv(entidad)
+    for numero, registro in enumerate(registros, start=1):
+        escritor.writerow(registro)
+        if numero % FILAS_POR_PARTE == 0:
+            yield _vaciar(buffer)
+    yield _vaciar(buffer)
+
+
+async def exportar_csv_async(entidad, registros):
+    """
+    Versión asíncrona de exportar_csv() para el modo ASGI: "registros" es un
+    iterador asíncrono (ClienteAPIAsync.iterar).
+    """
+    buffer, escritor = _escritor_csv(entidad)
+    numero = 0
+    async for registro in registros:
+        escritor.writerow(registro)
+        numero += 1
+        if numero % FILAS_POR_PARTE == 0:
+            yield _vaciar(buffer)
+    yield _vaciar(buffer)
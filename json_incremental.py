@@ -0,0 +1,196 @@
+# Lectura incremental de respuestas JSON de la forma {"datos": [ {...}, {...} ], ...}
+# DecodificadorLista recibe los fragmentos (bytes) a medida que llegan y retorna los
+# elementos ya completos, así que sirve igual para requests (iterar_lista) que para
+# httpx en el modo ASGI (iterar_lista_async).
+import codecs
+import json
+
+_decodificador = json.JSONDecoder()
+_ESPACIOS = " \t\n\r"
+_SEPARADORES = ",:]}" + _ESPACIOS
+
+# Estados del decodificador: qué se espera a continuación en el documento
+(_INICIO, _PRIMERA_CLAVE, _CLAVE, _DOS_PUNTOS, _VALOR, _FIN_VALOR,
+ _PRIMER_ELEMENTO, _ELEMENTO, _FIN_ELEMENTO, _FIN) = range(10)
+
+# Valor que retorna _valor() cuando el fragmento actual no alcanza para decodificarlo
+_PENDIENTE = object()
+
+
+class DecodificadorLista:
+    """
+    Decodifica por partes la lista guardada en "clave" de un objeto JSON (o el
+    documento entero si es una lista). Solo conserva lo que falta por leer.
+    - alimentar(fragmento): agrega bytes y retorna los elementos que se completaron
+    - terminar(): indica que la respuesta terminó; lanza ValueError si quedó incompleta
+    - terminado: True cuando la lista ya se cerró (lo que sigue no se lee)
+    Las demás claves del objeto se decodifican y se descartan.
+    """
+
+    def __init__(self, clave="datos"):
+        self.clave = clave
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._texto = ""
+        self._pos = 0
+        self._final = False
+        self._estado = _INICIO
+        self._nombre = None
+
+    @property
+    def terminado(self):
+        return self._estado == _FIN
+
+    def alimentar(self, fragmento):
+        """
+        Agrega un fragmento de la respuesta y retorna la lista de elementos que se completaron.
+        """
+        if fragmento and not self.terminado:
+            # Se descarta lo ya leído antes de agregar el fragmento
+            self._texto = self._texto[self._pos:] + self._utf8.decode(fragmento)
+            self._pos = 0
+        return self._avanzar()
+
+    def terminar(self):
+        """
+        Decodifica lo que quedaba en el buffer al terminar la respuesta y retorna
+        esos elementos. Lanza ValueError si el documento quedó incompleto.
+        """
+        if self.terminado:
+            return []
+        self._texto = self._texto[self._pos:] + self._utf8.decode(b"", final=True)
+        self._pos = 0
+        self._final = True
+        elementos = self._avanzar()
+        if not self.terminado:
+            raise ValueError("JSON inválido: la respuesta terminó antes de cerrar la lista")
+        return elementos
+
+    def _avanzar(self):
+        elementos = []
+        while not self.terminado:
+            caracter = self._siguiente()
+            if caracter is None:
+                break
+            estado = self._estado
+
+            if estado == _INICIO:
+                if caracter == "[":
+                    self._pos += 1
+                    self._estado = _PRIMER_ELEMENTO
+                else:
+                    self._consumir(caracter, "{")
+                    self._estado = _PRIMERA_CLAVE
+            elif estado == _PRIMERA_CLAVE:
+                if caracter == "}":
+                    self._pos += 1
+                    self._estado = _FIN
+                else:
+                    self._estado = _CLAVE
+            elif estado == _CLAVE:
+                nombre = self._valor()
+                if nombre is _PENDIENTE:
+                    break
+                self._nombre = nombre
+                self._estado = _DOS_PUNTOS
+            elif estado == _DOS_PUNTOS:
+                self._consumir(caracter, ":")
+                self._estado = _VALOR
+            elif estado == _VALOR:
+                if self._nombre == self.clave and caracter == "[":
+                    self._pos += 1
+                    self._estado = _PRIMER_ELEMENTO
+                elif self._valor() is _PENDIENTE:
+                    break
+                else:
+                    self._estado = _FIN_VALOR
+            elif estado == _FIN_VALOR:
+                self._estado = _CLAVE if self._consumir(caracter, ",}") == "," else _FIN
+            elif estado == _PRIMER_ELEMENTO:
+                if caracter == "]":
+                    self._pos += 1
+                    self._estado = _FIN
+                else:
+                    self._estado = _ELEMENTO
+            elif estado == _ELEMENTO:
+                # Camino frecuente: elementos seguidos de "," sin volver a pasar por los estados
+                elemento = self._valor()
+                while elemento is not _PENDIENTE:
+                    elementos.append(elemento)
+                    self._estado = _FIN_ELEMENTO
+                    if self._siguiente() != ",":
+                        break
+                    self._pos += 1
+                    self._estado = _ELEMENTO
+                    elemento = self._valor() if self._siguiente() is not None else _PENDIENTE
+                else:
+                    break
+            else:
+                self._estado = _ELEMENTO if self._consumir(caracter, ",]") == "," else _FIN
+        return elementos
+
+    def _siguiente(self):
+        """
+        Salta los espacios y retorna el próximo carácter sin consumirlo (None si falta leer más).
+        """
+        while self._pos < len(self._texto) and self._texto[self._pos] in _ESPACIOS:
+            self._pos += 1
+        if self._pos < len(self._texto):
+            return self._texto[self._pos]
+        return None
+
+    def _consumir(self, caracter, esperados):
+        """
+        Consume el carácter actual, que debe ser uno de "esperados", y lo retorna.
+        """
+        if caracter not in esperados:
+            raise ValueError(f"JSON inválido: se esperaba {esperados!r} en la posición {self._pos}")
+        self._pos += 1
+        return caracter
+
+    def _valor(self):
+        """
+        Decodifica un valor JSON completo (objeto, lista, texto, número...) o
+        retorna _PENDIENTE si falta el resto en el siguiente fragmento.
+        El valor solo se acepta si después viene un separador: un número como
+        12 o 4.5 podría continuar (123, 4.5e10) en el siguiente fragmento.
+        """
+        try:
+            valor, fin = _decodificador.raw_decode(self._texto, self._pos)
+        except json.JSONDecodeError:
+            if self._final:
+                raise
+            return _PENDIENTE
+        if not self._final and (fin == len(self._texto) or self._texto[fin] not in _SEPARADORES):
+            return _PENDIENTE
+        self._pos = fin
+        return valor
+
+
+def iterar_lista(fragmentos, clave="datos"):
+    """
+    Recorre una respuesta JSON por fragmentos y produce uno a uno los
+    elementos de la lista guardada en "clave", sin construir la respuesta completa.
+    Lo que venga después de la lista no se lee. Si el documento es
+    directamente una lista ([ {...}, {...} ]), se recorren sus elementos.
+    """
+    decodificador = DecodificadorLista(clave)
+    for fragmento in fragmentos:
+        yield from decodificador.alimentar(fragmento)
+        if decodificador.terminado:
+            return
+    yield from decodificador.terminar()
+
+
+async def iterar_lista_async(fragmentos, clave="datos"):
+    """
+    Igual que iterar_lista(), con un iterador asíncrono de fragmentos
+    (p. ej. httpx.Response.aiter_bytes() en el modo ASGI).
+    """
+    decodificador = DecodificadorLista(clave)
+    async for fragmento in fragmentos:
+        for elemento in decodificador.alimentar(fragmento):
+            yield elemento
+        if decodificador.terminado:
+            return
+    for elemento in decodificador.terminar():
+        yield elemento
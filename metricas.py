@@ -0,0 +1,147 @@
+# Instrumentación de la aplicación: histogramas de latencia por ruta y por plantilla
+# en formato de texto de Prometheus, sin dependencias externas
+import threading
+import time
+from bisect import bisect_left
+
+from flask import before_render_template, g, request, template_rendered
+
+
+# Límites (en segundos) de los buckets de los histogramas de duración
+BUCKETS_DURACION = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def endpoint_api(ruta):
+    """
+    Nombre del endpoint de la API para las etiquetas: "producto/codigo/pr3"
+    se agrupa como "producto/codigo/{codigo}" para no crear una serie por código.
+    """
+    partes = ruta.split("/", 2)
+    if len(partes) == 3:
+        return f"{partes[0]}/{partes[1]}/{{codigo}}"
+    return ruta
+
+
+def _orden_serie(serie):
+    # Las etiquetas pueden mezclar números y textos (estado 200 o "error")
+    return tuple(map(str, serie[0]))
+
+
+class Histograma:
+    """
+    Histograma de Prometheus con una serie por combinación de etiquetas.
+    Cada observación cuesta una búsqueda binaria y un candado; las series
+    se crean la primera vez que aparece una combinación de etiquetas.
+    """
+
+    def __init__(self, nombre, etiquetas, buckets=BUCKETS_DURACION):
+        self.nombre = nombre
+        self.etiquetas = etiquetas
+        self.buckets = buckets
+        # valores de etiquetas -> [conteo por bucket..., +Inf, suma]
+        self._series = {}
+        self._candado = threading.Lock()
+
+    def observar(self, valores, valor):
+        indice = bisect_left(self.buckets, valor)
+        with self._candado:
+            serie = self._series.get(valores)
+            if serie is None:
+                serie = self._series[valores] = [0] * (len(self.buckets) + 2)
+            serie[indice] += 1
+            serie[-1] += valor
+
+    def metricas(self):
+        """
+        Genera el histograma en formato de texto de Prometheus (buckets acumulados).
+        """
+        with self._candado:
+            series = {valores: list(serie) for valores, serie in self._series.items()}
+
+        lineas = [f"# TYPE {self.nombre} histogram"]
+        for valores, serie in sorted(series.items(), key=_orden_serie):
+            etiquetas = ",".join(f'{e}="{v}"' for e, v in zip(self.etiquetas, valores))
+            acumulado = 0
+            for limite, conteo in zip((*self.buckets, "+Inf"), serie):
+                acumulado += conteo
+                lineas.append(f'{self.nombre}_bucket{{{etiquetas},le="{limite}"}} {acumulado}')
+            lineas.append(f"{self.nombre}_sum{{{etiquetas}}} {serie[-1]:.6f}")
+            lineas.append(f"{self.nombre}_count{{{etiquetas}}} {acumulado}")
+        return "\n".join(lineas) + "\n"
+
+
+class Contador:
+    """
+    Contador de Prometheus con una serie por combinación de etiquetas.
+    """
+
+    def __init__(self, nombre, etiquetas):
+        self.nombre = nombre
+        self.etiquetas = etiquetas
+        self._series = {}
+        self._candado = threading.Lock()
+
+    def sumar(self, valores, cantidad=1):
+        with self._candado:
+            self._series[valores] = self._series.get(valores, 0) + cantidad
+
+    def metricas(self):
+        with self._candado:
+            series = dict(self._series)
+
+        lineas = [f"# TYPE {self.nombre} counter"]
+        for valores, total in sorted(series.items(), key=_orden_serie):
+            etiquetas = ",".join(f'{e}="{v}"' for e, v in zip(self.etiquetas, valores))
+            lineas.append(f"{self.nombre}{{{etiquetas}}} {total}")
+        return "\n".join(lineas) + "\n"
+
+
+class MetricasAplicacion:
+    """
+    Mide cada petición que atiende la aplicación y cada plantilla que renderiza.
+    - http_peticion_duracion_segundos{ruta,metodo,estado}: la ruta es la regla
+      registrada (p. ej. /productos/eliminar/<string:codigo>), no la URL, para
+      que el número de series no crezca con cada código.
+    - plantilla_render_duracion_segundos{plantilla}: con STREAMING_LISTADOS incluye
+      el tiempo en que se envían las partes al navegador.
+    """
+
+    def __init__(self):
+        self.peticiones = Histograma("http_peticion_duracion_segundos", ("ruta", "metodo", "estado"))
+        self.plantillas = Histograma("plantilla_render_duracion_segundos", ("plantilla",))
+
+    def instalar(self, aplicacion):
+        """
+        Conecta los hooks de petición y las señales de plantillas de Flask a la aplicación.
+        """
+        aplicacion.before_request(self._inicio_peticion)
+        aplicacion.after_request(self._fin_peticion)
+        before_render_template.connect(self._inicio_plantilla, aplicacion)
+        template_rendered.connect(self._fin_plantilla, aplicacion)
+        aplicacion.extensions["metricas"] = self
+        return self
+
+    # ------------------- Peticiones -------------------
+    def _inicio_peticion(self):
+        g.inicio_peticion = time.perf_counter()
+
+    def _fin_peticion(self, respuesta):
+        inicio = g.pop("inicio_peticion", None)
+        if inicio is not None:
+            ruta = request.url_rule.rule if request.url_rule is not None else "sin_ruta"
+            self.peticiones.observar(
+                (ruta, request.method, respuesta.status_code), time.perf_counter() - inicio
+            )
+        return respuesta
+
+    # ------------------- Plantillas -------------------
+    def _inicio_plantilla(self, aplicacion, template, context, **extra):
+        g.setdefault("inicio_plantillas", []).append(time.perf_counter())
+
+    def _fin_plantilla(self, aplicacion, template, context, **extra):
+        inicios = g.get("inicio_plantillas")
+        if inicios:
+            self.plantillas.observar((template.name,), time.perf_counter() - inicios.pop())
+
+    def metricas(self):
+        return self.peticiones.metricas() + self.plantillas.metricas()
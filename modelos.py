@@ -0,0 +1,140 @@
+# Modelos compactos de los registros de cada entidad
+# Cada fila que se guarda en la caché o en la réplica en memoria es un objeto con
+# __slots__ en lugar de un diccionario: los campos se guardan en posiciones fijas
+# y no en una tabla hash por fila, así que una colección grande ocupa varias veces
+# menos memoria en cada worker. Los modelos se pueden leer como diccionarios
+# (fila.get("codigo"), fila["stock"], dict(fila)), así que la paginación, la
+# búsqueda y la exportación funcionan igual con filas de la API o de la caché.
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from operator import attrgetter
+
+
+def _convertir(campo, tipo, valor):
+    """
+    Convierte "valor" al tipo del campo o lanza ValueError con un mensaje legible
+    (p. ej. stock = "diez"). Un float con decimales no se acepta como int.
+    """
+    if valor is None:
+        raise ValueError(f"falta el campo '{campo}'")
+    if tipo is str:
+        return str(valor)
+    if isinstance(valor, bool) or (tipo is int and isinstance(valor, float) and not valor.is_integer()):
+        raise ValueError(f"'{campo}' debe ser {tipo.__name__}: {valor!r}")
+    try:
+        return tipo(valor.strip() if isinstance(valor, str) else valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{campo}' debe ser {tipo.__name__}: {valor!r}") from None
+
+
+class Registro(Mapping):
+    """
+    Base de los modelos: cada subclase declara sus campos en __slots__ (con
+    "codigo" primero) y con anotaciones de tipo, y se decora con @dataclass.
+    - desde_api(): construcción rápida, sin conversiones, para los datos de la API
+    - validar(): construcción con conversión de tipos para formularios e importaciones
+    """
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._valores = attrgetter(*cls.__slots__)
+
+    @classmethod
+    def desde_api(cls, datos):
+        """
+        Crea el registro a partir de un diccionario de la API (campos faltantes = None).
+        """
+        return cls(*map(datos.get, cls.__slots__))
+
+    @classmethod
+    def validar(cls, fila):
+        """
+        Crea el registro a partir de un formulario o una fila importada (CSV o JSON),
+        convirtiendo cada campo a su tipo. Lanza ValueError si falta el código,
+        falta un campo o un valor no se puede convertir.
+        """
+        codigo = fila.get("codigo")
+        if codigo is None or str(codigo).strip() == "":
+            raise ValueError("falta el código")
+        valores = [str(codigo).strip()]
+        for campo in fields(cls)[1:]:
+            valores.append(_convertir(campo.name, campo.type, fila.get(campo.name)))
+        return cls(*valores)
+
+    def datos(self, con_codigo=True):
+        """
+        Diccionario que se envía a la API (sin "codigo" en las actualizaciones).
+        """
+        campos = self.__slots__ if con_codigo else self.__slots__[1:]
+        return {campo: getattr(self, campo) for campo in campos}
+
+    # ------------------- Lectura como diccionario -------------------
+    def __getitem__(self, campo):
+        if campo not in self.__slots__:
+            raise KeyError(campo)
+        return getattr(self, campo)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def get(self, campo, por_defecto=None):
+        return getattr(self, campo) if campo in self.__slots__ else por_defecto
+
+    def values(self):
+        return self._valores(self)
+
+
+# ------------------- Modelos de las entidades -------------------
+@dataclass
+class Producto(Registro):
+    __slots__ = ("codigo", "nombre", "valorunitario", "stock")
+    codigo: str
+    nombre: str
+    valorunitario: int
+    stock: int
+
+
+@dataclass
+class Cliente(Registro):
+    __slots__ = ("codigo", "nombre", "correo", "telefono")
+    codigo: str
+    nombre: str
+    correo: str
+    telefono: str
+
+
+@dataclass
+class Factura(Registro):
+    __slots__ = ("codigo", "fecha", "cliente", "total")
+    codigo: str
+    fecha: str
+    cliente: str
+    total: float
+
+
+@dataclass
+class Vendedor(Registro):
+    __slots__ = ("codigo", "nombre", "telefono")
+    codigo: str
+    nombre: str
+    telefono: str
+
+
+@dataclass
+class Persona(Registro):
+    __slots__ = ("codigo", "nombre", "telefono")
+    codigo: str
+    nombre: str
+    telefono: str
+
+
+@dataclass
+class Empresa(Registro):
+    __slots__ = ("codigo", "nombre", "telefono")
+    codigo: str
+    nombre: str
+    telefono: str
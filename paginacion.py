@@ -0,0 +1,178 @@
+# Paginación, orden y filtro de las tablas de entidades (?page=&size=&sort=&q=)
+import heapq
+
+from flask import current_app
+
+from cliente_api import obtener_cliente_api
+
+
+class Pagina:
+    """
+    Una página de resultados lista para la plantilla.
+    - filas: registros de la página actual
+    - pagina / tamano: número de página (desde 1) y filas por página
+    - total: cantidad de registros que cumplen el filtro
+    - orden / q: parámetros con que se generó, para armar los enlaces
+    """
+    __slots__ = ("filas", "pagina", "tamano", "total", "orden", "q")
+
+    def __init__(self, filas, pagina, tamano, total, orden="", q=""):
+        self.filas = filas
+        self.pagina = pagina
+        self.tamano = tamano
+        self.total = total
+        self.orden = orden
+        self.q = q
+
+    @property
+    def paginas(self):
+        return _ultima_pagina(self.total, self.tamano)
+
+    @property
+    def tiene_anterior(self):
+        return self.pagina > 1
+
+    @property
+    def tiene_siguiente(self):
+        return self.pagina < self.paginas
+
+    def parametros(self, **cambios):
+        """
+        Retorna los parámetros de la URL de esta página con los cambios indicados.
+        """
+        parametros = {"page": self.pagina, "size": self.tamano, "sort": self.orden, "q": self.q}
+        parametros.update(cambios)
+        return {clave: valor for clave, valor in parametros.items() if valor not in ("", None)}
+
+
+def _entero(valor, por_defecto):
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return por_defecto
+
+
+def leer_parametros(args, config=None):
+    """
+    Lee page, size, sort y q de la URL y los limita a valores válidos.
+    Por defecto usa la configuración de la aplicación Flask actual.
+    """
+    if config is None:
+        config = current_app.config
+    tamano = _entero(args.get("size"), config["PAGINA_TAMANO"])
+    return {
+        "pagina": max(1, _entero(args.get("page"), 1)),
+        "tamano": min(max(1, tamano), config["PAGINA_TAMANO_MAXIMO"]),
+        "orden": (args.get("sort") or "").strip(),
+        "q": (args.get("q") or "").strip()
+    }
+
+
+def _clave_orden(campo):
+    """
+    Clave de ordenamiento tolerante a valores vacíos y a tipos mezclados.
+    """
+    def clave(fila):
+        valor = fila.get(campo)
+        if valor is None:
+            return (2, "")
+        if isinstance(valor, (int, float)):
+            return (0, valor)
+        return (1, str(valor).lower())
+    return clave
+
+
+def _coincide(fila, texto):
+    """
+    Indica si "texto" (en minúsculas) aparece en algún campo de la fila.
+    """
+    return any(texto in str(valor).lower() for valor in fila.values() if valor is not None)
+
+
+def _ultima_pagina(total, tamano):
+    return max(1, -(-total // tamano))
+
+
+def paginar(filas, pagina=1, tamano=50, orden="", q=""):
+    """
+    Filtra, ordena y recorta localmente una lista de registros (diccionarios).
+    - q: texto que debe aparecer (sin distinguir mayúsculas) en algún campo
+    - orden: nombre del campo; con "-" delante el orden es descendente
+    Si "filas" no es una lista (por ejemplo ClienteAPI.iterar), se recorre una
+    sola vez guardando solo las filas necesarias para la página pedida.
+    """
+    if not isinstance(filas, list):
+        return _paginar_iterable(filas, pagina, tamano, orden, q)
+
+    if q:
+        texto = q.lower()
+        filas = [fila for fila in filas if _coincide(fila, texto)]
+
+    campo = orden.lstrip("-")
+    if campo:
+        filas = sorted(filas, key=_clave_orden(campo), reverse=orden.startswith("-"))
+
+    total = len(filas)
+    pagina = min(pagina, _ultima_pagina(total, tamano))
+    inicio = (pagina - 1) * tamano
+    return Pagina(filas[inicio:inicio + tamano], pagina, tamano, total, orden, q)
+
+
+def _paginar_iterable(filas, pagina, tamano, orden, q):
+    """
+    Variante de paginar() para iteradores: la memoria depende del tamaño de
+    la página y no de la cantidad de registros.
+    - Sin orden: se guarda la página pedida y el último bloque visto (por si
+      la página pedida no existe y hay que mostrar la última).
+    - Con orden: heapq conserva solo los pagina * tamano primeros registros.
+    """
+    if q:
+        texto = q.lower()
+        filas = (fila for fila in filas if _coincide(fila, texto))
+
+    inicio = (pagina - 1) * tamano
+    total = 0
+    campo = orden.lstrip("-")
+
+    if campo:
+        def contar(filas):
+            nonlocal total
+            for fila in filas:
+                total += 1
+                yield fila
+
+        seleccionar = heapq.nlargest if orden.startswith("-") else heapq.nsmallest
+        primeras = seleccionar(inicio + tamano, contar(filas), key=_clave_orden(campo))
+        pagina = min(pagina, _ultima_pagina(total, tamano))
+        inicio = (pagina - 1) * tamano
+        return Pagina(primeras[inicio:inicio + tamano], pagina, tamano, total, orden, q)
+
+    seleccion = []
+    bloque = []
+    for fila in filas:
+        if total % tamano == 0:
+            bloque = []
+        bloque.append(fila)
+        if inicio <= total < inicio + tamano:
+            seleccion.append(fila)
+        total += 1
+
+    if total <= inicio:
+        pagina = _ultima_pagina(total, tamano)
+        seleccion = bloque
+    return Pagina(seleccion, pagina, tamano, total, orden, q)
+
+
+def obtener_pagina(recurso, listar, pagina=1, tamano=50, orden="", q=""):
+    """
+    Retorna una página de un recurso.
+    Si API_PAGINACION_REMOTA está activo, pide la página a la API; cuando la API
+    no responde con "total" se asume que ignoró los parámetros y se pagina localmente.
+    En otro caso se pagina la lista completa que retorna "listar" (normalmente la caché).
+    """
+    if current_app.config["API_PAGINACION_REMOTA"]:
+        datos, total = obtener_cliente_api().listar_pagina(recurso, pagina, tamano, orden, q)
+        if total is not None:
+            return Pagina(datos, pagina, tamano, total, orden, q)
+        return paginar(datos, pagina, tamano, orden, q)
+    return paginar(listar(), pagina, tamano, orden, q)
@@ -0,0 +1,68 @@
+# Respuestas parciales de crear, actualizar y eliminar
+# Sin JavaScript, cada escritura termina en una redirección y el navegador vuelve a
+# pedir la página completa (lista de la API, tabla y base.html). static/parcial.js
+# envía los formularios con fetch y la cabecera X-Parcial; entonces la ruta
+# responde solo la fila creada o actualizada (<tr>) o 204 al eliminar, y el
+# script la reemplaza en la tabla: una sola petición y una respuesta pequeña.
+# Con "Accept: application/json" las mismas rutas responden JSON (ver api_json.py).
+# Las funciones retornan tuplas (cuerpo, estado, cabeceras), que aceptan Flask y Quart.
+from api_json import quiere_json, serializar
+
+# Cabecera con que static/parcial.js pide una respuesta parcial
+CABECERA_PARCIAL = "X-Parcial"
+
+_JSON = {"Content-Type": "application/json"}
+_HTML = {"Content-Type": "text/html; charset=utf-8"}
+_TEXTO = {"Content-Type": "text/plain; charset=utf-8"}
+
+
+def modo_parcial(peticion):
+    """
+    Retorna "json", "fragmento" o None (respuesta completa con redirección).
+    """
+    if quiere_json(peticion):
+        return "json"
+    if peticion.headers.get(CABECERA_PARCIAL):
+        return "fragmento"
+    return None
+
+
+def error_parcial(modo, mensaje, estado):
+    """
+    Error de una escritura. Sin modo parcial se responde el mensaje como hasta
+    ahora (estado 200); en modo parcial, con el estado indicado para que el
+    script lo muestre junto al formulario.
+    """
+    if modo is None:
+        return mensaje
+    if modo == "json":
+        return serializar({"error": mensaje}), estado, _JSON
+    return mensaje, estado, _TEXTO
+
+
+def error_api(modo, mensaje, respuesta):
+    """
+    Error cuando la API rechazó la escritura: sus errores 4xx (p. ej. código
+    repetido) se conservan y el resto se informa como 502.
+    """
+    estado = respuesta.status_code if 400 <= respuesta.status_code < 500 else 502
+    return error_parcial(modo, f"{mensaje}: la API respondió {respuesta.status_code}", estado)
+
+
+def guardado_parcial(modo, registro, renderizar_fila, estado=200):
+    """
+    Respuesta de crear o actualizar: el registro en JSON o su fila de la tabla.
+    renderizar_fila(registro) solo se llama en modo "fragmento".
+    """
+    if modo == "json":
+        return serializar({"datos": registro}), estado, _JSON
+    return renderizar_fila(registro), estado, _HTML
+
+
+def eliminado_parcial(modo, codigo):
+    """
+    Respuesta de eliminar: el código eliminado en JSON o 204 sin contenido.
+    """
+    if modo == "json":
+        return serializar({"codigo": codigo}), 200, _JSON
+    return "", 204
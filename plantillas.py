@@ -0,0 +1,54 @@
+# Compilación anticipada de las plantillas de Jinja
+# Jinja compila cada plantilla a código Python la primera vez que se usa; sin esto,
+# un worker nuevo paga esa compilación en sus primeras peticiones, una vez por plantilla.
+# Paso de build (una vez por versión del código):
+#   python plantillas.py            (usa PLANTILLAS_BYTECODE o ".cache_plantillas")
+import os
+
+from jinja2 import FileSystemBytecodeCache
+
+
+def configurar_plantillas(aplicacion):
+    """
+    Aplica PLANTILLAS_BYTECODE y PLANTILLAS_PRECARGAR a la aplicación (Flask o Quart).
+    Debe llamarse antes de la primera petición, porque el entorno de Jinja se
+    crea una sola vez con las opciones de aplicacion.jinja_options.
+    - PLANTILLAS_BYTECODE: carpeta con el código ya compilado; las plantillas que
+      están ahí (y cuyo archivo no cambió) se cargan sin volver a compilarse.
+    - PLANTILLAS_PRECARGAR: cargar todas las plantillas al arrancar el worker en
+      lugar de hacerlo en la primera petición que las usa.
+    """
+    directorio = aplicacion.config["PLANTILLAS_BYTECODE"]
+    if directorio:
+        # Las rutas relativas se toman desde la carpeta del proyecto, no desde el directorio actual
+        directorio = os.path.join(aplicacion.root_path, directorio)
+        os.makedirs(directorio, exist_ok=True)
+        aplicacion.jinja_options = {
+            **aplicacion.jinja_options, "bytecode_cache": FileSystemBytecodeCache(directorio)
+        }
+    if aplicacion.config["PLANTILLAS_PRECARGAR"]:
+        return precargar(aplicacion)
+    return 0
+
+
+def precargar(aplicacion):
+    """
+    Carga todas las plantillas de templates/ en la caché del entorno de Jinja.
+    Con caché de bytecode, las que faltan se compilan y se guardan en la carpeta.
+    Retorna cuántas plantillas se cargaron.
+    """
+    entorno = aplicacion.jinja_env
+    nombres = entorno.list_templates(extensions=("html",))
+    for nombre in nombres:
+        entorno.get_template(nombre)
+    return len(nombres)
+
+
+if __name__ == "__main__":
+    # Generar la caché de bytecode para desplegarla junto con el código
+    os.environ.setdefault("PLANTILLAS_BYTECODE", ".cache_plantillas")
+    os.environ["PLANTILLAS_PRECARGAR"] = "1"
+    from app import aplicacion
+
+    print(f"{len(aplicacion.jinja_env.list_templates(extensions=('html',)))} plantillas compiladas "
+          f"en {aplicacion.config['PLANTILLAS_BYTECODE']}")
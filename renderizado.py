@@ -0,0 +1,36 @@
+# Renderizado de las páginas de listado, completo o por partes (streaming)
+from flask import Response, current_app, render_template, stream_template
+
+
+def _agrupar(fragmentos, tamano):
+    """
+    Junta los fragmentos que produce Jinja hasta reunir al menos "tamano"
+    caracteres, para no enviar una escritura al socket por cada etiqueta.
+    """
+    partes = []
+    acumulado = 0
+    for fragmento in fragmentos:
+        partes.append(fragmento)
+        acumulado += len(fragmento)
+        if acumulado >= tamano:
+            yield "".join(partes)
+            partes = []
+            acumulado = 0
+    if partes:
+        yield "".join(partes)
+
+
+def renderizar_listado(plantilla, **contexto):
+    """
+    Renderiza una plantilla de listado.
+    Con STREAMING_LISTADOS activo se usa stream_template (Template.generate +
+    stream_with_context): el encabezado, el menú de base.html y los formularios
+    se envían de inmediato y las filas de la tabla a medida que se generan,
+    en bloques de STREAMING_BUFFER caracteres.
+    """
+    config = current_app.config
+    if not config["STREAMING_LISTADOS"]:
+        return render_template(plantilla, **contexto)
+
+    fragmentos = stream_template(plantilla, **contexto)
+    return Response(_agrupar(fragmentos, config["STREAMING_BUFFER"]), mimetype="text/html")
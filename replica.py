@@ -0,0 +1,440 @@
+# Réplica local de lectura de las colecciones de la API
+# Un hilo en segundo plano copia cada colección completa cada REPLICA_INTERVALO
+# segundos; los listados y las búsquedas por código se leen de la copia local y
+# crear/actualizar/eliminar la actualizan al momento (write-through).
+# REPLICA = "memoria" guarda la copia en el proceso; "sqlite" la guarda en
+# REPLICA_RUTA, compartida entre los workers y conservada entre reinicios.
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from flask import current_app
+
+
+class _Replica:
+    """
+    Parte común de las réplicas: versiones por recurso para que una sincronización
+    que empezó antes de una escritura local no la pise, el hilo sincronizador
+    y las métricas. Las subclases implementan el almacenamiento y pueden guardar
+    las versiones y el calendario de sincronización fuera del proceso.
+    """
+
+    def __init__(self):
+        self._candado = threading.Lock()
+        self._versiones = {}
+        self._pendientes = set()
+        # recurso -> momento (time.monotonic()) de la próxima copia
+        self._proxima = {}
+        self._evento = threading.Event()
+        self._hilo = None
+        self._pid = None
+        # Si este proceso es el que sincroniza (ver _tomar_turno)
+        self._con_turno = False
+        self._contadores = {"sincronizaciones": 0, "errores_sincronizacion": 0, "descartadas": 0}
+
+    # ------------------- Sincronización -------------------
+    def iniciar(self, api, recursos, intervalo):
+        """
+        Inicia el hilo sincronizador en este proceso si no está corriendo.
+        Se llama en cada petición: después de un fork el hilo del proceso padre
+        no existe en el hijo y hay que crearlo de nuevo.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._candado:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._pendientes.update(recursos)
+            self._hilo = threading.Thread(
+                target=self._sincronizar, args=(api, list(recursos), intervalo),
+                name="replica", daemon=True
+            )
+            self._hilo.start()
+
+    def solicitar(self, recurso):
+        """
+        Pide volver a copiar "recurso" lo antes posible (p. ej. después de una importación).
+        """
+        with self._candado:
+            self._pendientes.add(recurso)
+        self._evento.set()
+
+    def _sincronizar(self, api, recursos, intervalo):
+        while True:
+            self._con_turno = self._tomar_turno()
+            if self._con_turno:
+                for recurso in self._vencidos(recursos, intervalo):
+                    # Una copia larga no debe dejar vencer el turno a mitad de camino
+                    if not self._tomar_turno():
+                        break
+                    version = self.version(recurso)
+                    try:
+                        filas = api.listar(recurso)
+                    except Exception:
+                        self._contar("errores_sincronizacion")
+                        self._esperar_error(recurso, min(intervalo, 5.0))
+                        continue
+                    if self.reemplazar(recurso, filas, version):
+                        self._contar("sincronizaciones")
+                        self._programar(recurso, intervalo)
+                    else:
+                        # Hubo una escritura mientras se copiaba: reintentar pronto
+                        self._contar("descartadas")
+                        self._programar(recurso, 0)
+            self._evento.wait(max(self._espera(intervalo), 0.05))
+            self._evento.clear()
+
+    def _tomar_turno(self):
+        """
+        Indica si este proceso debe sincronizar. Cada proceso tiene su propia copia en memoria.
+        """
+        return True
+
+    def _vencidos(self, recursos, intervalo):
+        """
+        Recursos que toca copiar ahora: los solicitados y aquellos cuya próxima copia ya llegó.
+        """
+        ahora = time.monotonic()
+        with self._candado:
+            vencidos = [r for r in recursos if r in self._pendientes or self._proxima.get(r, 0) <= ahora]
+            self._pendientes.difference_update(vencidos)
+        return vencidos
+
+    def _programar(self, recurso, espera):
+        with self._candado:
+            self._proxima[recurso] = time.monotonic() + espera
+
+    def _esperar_error(self, recurso, espera):
+        # Tras un error el recurso no se vuelve a pedir hasta dentro de "espera" segundos
+        _Replica._programar(self, recurso, espera)
+
+    def _espera(self, intervalo):
+        """
+        Segundos hasta la próxima vuelta del sincronizador.
+        """
+        ahora = time.monotonic()
+        with self._candado:
+            return min(self._proxima.values(), default=ahora + intervalo) - ahora
+
+    def version(self, recurso):
+        with self._candado:
+            return self._versiones.get(recurso, 0)
+
+    def _cambiar_version(self, recurso):
+        with self._candado:
+            self._versiones[recurso] = self._versiones.get(recurso, 0) + 1
+
+    def _contar(self, nombre):
+        with self._candado:
+            self._contadores[nombre] += 1
+
+    # ------------------- Métricas -------------------
+    def metricas(self):
+        """
+        Genera las métricas de la réplica en formato de texto de Prometheus.
+        """
+        with self._candado:
+            contadores = dict(self._contadores)
+        lineas = []
+        for nombre, valor in contadores.items():
+            lineas.append(f"# TYPE replica_{nombre}_total counter")
+            lineas.append(f"replica_{nombre}_total {valor}")
+        estado = self.estado()
+        lineas.append("# TYPE replica_registros gauge")
+        lineas += [f'replica_registros{{recurso="{r}"}} {n}' for r, (n, _) in sorted(estado.items())]
+        lineas.append("# TYPE replica_edad_segundos gauge")
+        lineas += [f'replica_edad_segundos{{recurso="{r}"}} {time.time() - momento:.1f}'
+                   for r, (_, momento) in sorted(estado.items())]
+        lineas.append("# TYPE replica_sincronizador gauge")
+        lineas.append(f"replica_sincronizador {int(self._con_turno)}")
+        return "\n".join(lineas) + "\n"
+
+
+class ReplicaMemoria(_Replica):
+    """
+    Copia en memoria del proceso: una lista por recurso y un índice por código.
+    La lista publicada nunca se modifica (las escrituras crean una nueva), así
+    que los lectores pueden recorrerla sin candado. Con "modelos" ({recurso: clase},
+    ver modelos.py) las filas se guardan como modelos en lugar de diccionarios.
+    """
+
+    def __init__(self, modelos=None):
+        super().__init__()
+        self._modelos = modelos or {}
+        # recurso -> (filas, {codigo: fila}, momento de la última sincronización)
+        self._tablas = {}
+
+    def _convertir(self, recurso, fila):
+        modelo = self._modelos.get(recurso)
+        return fila if modelo is None else modelo.desde_api(fila)
+
+    def cargada(self, recurso):
+        return recurso in self._tablas
+
+    def listar(self, recurso):
+        return self._tablas[recurso][0]
+
+    def buscar(self, recurso, codigo):
+        return self._tablas[recurso][1].get(codigo)
+
+    def reemplazar(self, recurso, filas, version):
+        filas = [self._convertir(recurso, fila) for fila in filas]
+        indice = {str(fila.get("codigo")): fila for fila in filas}
+        with self._candado:
+            if self._versiones.get(recurso, 0) != version:
+                return False
+            self._tablas[recurso] = (filas, indice, time.time())
+        return True
+
+    def guardar(self, recurso, registro):
+        self._cambiar_version(recurso)
+        registro = self._convertir(recurso, registro)
+        with self._candado:
+            if recurso not in self._tablas:
+                return
+            filas, indice, momento = self._tablas[recurso]
+            codigo = str(registro.get("codigo"))
+            if codigo in indice:
+                filas = [registro if str(fila.get("codigo")) == codigo else fila for fila in filas]
+            else:
+                filas = [*filas, registro]
+            self._tablas[recurso] = (filas, {**indice, codigo: registro}, momento)
+
+    def eliminar(self, recurso, codigo):
+        self._cambiar_version(recurso)
+        with self._candado:
+            if recurso not in self._tablas:
+                return
+            filas, indice, momento = self._tablas[recurso]
+            if codigo in indice:
+                filas = [fila for fila in filas if str(fila.get("codigo")) != codigo]
+                indice = {clave: fila for clave, fila in indice.items() if clave != codigo}
+                self._tablas[recurso] = (filas, indice, momento)
+
+    def estado(self):
+        return {recurso: (len(filas), momento) for recurso, (filas, _, momento) in list(self._tablas.items())}
+
+
+class ReplicaSQLite(_Replica):
+    """
+    Copia en un archivo SQLite (modo WAL): todos los workers de la máquina leen
+    la misma copia y sigue disponible al reiniciar. Los listados se recorren con
+    un cursor, así que paginar() no necesita la colección completa en memoria.
+    Cada hilo usa su propia conexión.
+    Como el archivo es compartido, también lo son la versión de cada recurso, el
+    momento de su última copia y las copias pedidas (tabla "recursos"): una
+    escritura de cualquier worker descarta la sincronización en curso de otro.
+    Solo sincroniza el worker que tiene el turno (tabla "sincronizador"), así que
+    la API recibe una copia por intervalo sin importar cuántos workers haya; lo
+    renueva mientras sincroniza y, si el proceso termina, otro lo toma al vencer.
+    """
+
+    # Segundos que dura el turno de sincronizar sin renovarlo
+    DURACION_TURNO = 15.0
+
+    # Segundos entre vueltas del sincronizador para ver las copias pedidas por otros workers
+    REVISION = 1.0
+
+    def __init__(self, ruta):
+        super().__init__()
+        self.ruta = ruta
+        self._local = threading.local()
+        self._cargados = set()
+        with self._conexion() as conexion:
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS registros ("
+                " recurso TEXT NOT NULL, codigo TEXT NOT NULL, posicion INTEGER NOT NULL, datos TEXT NOT NULL,"
+                " PRIMARY KEY (recurso, codigo))"
+            )
+            conexion.execute("CREATE INDEX IF NOT EXISTS registros_posicion ON registros (recurso, posicion)")
+            # momento: time.time() de la última copia completa (NULL si nunca se copió)
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS recursos ("
+                " recurso TEXT PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0, momento REAL,"
+                " pendiente INTEGER NOT NULL DEFAULT 0)"
+            )
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS sincronizador ("
+                " id INTEGER PRIMARY KEY CHECK (id = 1), pid INTEGER NOT NULL, vence REAL NOT NULL)"
+            )
+            conexion.execute("INSERT OR IGNORE INTO sincronizador (id, pid, vence) VALUES (1, 0, 0)")
+
+    def _conexion(self):
+        # Una conexión por hilo y por proceso: no se puede usar una conexión heredada de un fork
+        pid, conexion = getattr(self._local, "conexion", (None, None))
+        if pid != os.getpid():
+            conexion = sqlite3.connect(self.ruta, timeout=10)
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexion = (os.getpid(), conexion)
+        return conexion
+
+    # ------------------- Versiones y calendario compartidos -------------------
+    def version(self, recurso):
+        fila = self._conexion().execute("SELECT version FROM recursos WHERE recurso = ?", (recurso,)).fetchone()
+        return fila[0] if fila else 0
+
+    def _cambiar_version(self, recurso, conexion):
+        # Se llama dentro de la transacción de la escritura
+        conexion.execute(
+            "INSERT INTO recursos (recurso, version) VALUES (?, 1)"
+            " ON CONFLICT (recurso) DO UPDATE SET version = version + 1",
+            (recurso,)
+        )
+
+    def solicitar(self, recurso):
+        with self._conexion() as conexion:
+            conexion.execute(
+                "INSERT INTO recursos (recurso, pendiente) VALUES (?, 1)"
+                " ON CONFLICT (recurso) DO UPDATE SET pendiente = 1",
+                (recurso,)
+            )
+        self._evento.set()
+
+    def _tomar_turno(self):
+        """
+        Toma o renueva el turno de sincronizar si está libre, vencido o ya es de este proceso.
+        """
+        ahora = time.time()
+        pid, vence = self._conexion().execute("SELECT pid, vence FROM sincronizador WHERE id = 1").fetchone()
+        if pid == os.getpid() and vence - ahora > self.DURACION_TURNO / 2:
+            # Se renueva solo a mitad del turno para no escribir en cada vuelta
+            return True
+        with self._conexion() as conexion:
+            cursor = conexion.execute(
+                "UPDATE sincronizador SET pid = ?, vence = ? WHERE id = 1 AND (pid = ? OR vence < ?)",
+                (os.getpid(), ahora + self.DURACION_TURNO, os.getpid(), ahora)
+            )
+        return cursor.rowcount == 1
+
+    def _vencidos(self, recursos, intervalo):
+        limite = time.time() - intervalo
+        estado = {
+            recurso: (momento, pendiente) for recurso, momento, pendiente in
+            self._conexion().execute("SELECT recurso, momento, pendiente FROM recursos").fetchall()
+        }
+        ahora = time.monotonic()
+        vencidos = []
+        with self._candado:
+            for recurso in recursos:
+                momento, pendiente = estado.get(recurso, (None, 0))
+                # Después de un error se espera lo programado en _proxima aunque esté pendiente
+                if self._proxima.get(recurso, 0) > ahora:
+                    continue
+                if pendiente or momento is None or momento <= limite:
+                    vencidos.append(recurso)
+        return vencidos
+
+    def _programar(self, recurso, espera):
+        # El calendario está en el archivo (momento y pendiente); en el proceso solo
+        # se guarda la espera después de un error (ver _esperar_error)
+        with self._candado:
+            self._proxima.pop(recurso, None)
+
+    def _espera(self, intervalo):
+        # El que tiene el turno revisa seguido las copias pedidas; los demás esperan a que se libere
+        return min(self.REVISION, intervalo) if self._con_turno else self.DURACION_TURNO / 3
+
+    # ------------------- Lectura -------------------
+    def cargada(self, recurso):
+        if recurso in self._cargados:
+            return True
+        fila = self._conexion().execute(
+            "SELECT 1 FROM recursos WHERE recurso = ? AND momento IS NOT NULL", (recurso,)
+        ).fetchone()
+        if fila is not None:
+            self._cargados.add(recurso)
+        return fila is not None
+
+    def listar(self, recurso):
+        cursor = self._conexion().execute(
+            "SELECT datos FROM registros WHERE recurso = ? ORDER BY posicion", (recurso,)
+        )
+        return (json.loads(datos) for (datos,) in cursor)
+
+    def buscar(self, recurso, codigo):
+        fila = self._conexion().execute(
+            "SELECT datos FROM registros WHERE recurso = ? AND codigo = ?", (recurso, codigo)
+        ).fetchone()
+        return json.loads(fila[0]) if fila else None
+
+    # ------------------- Escritura -------------------
+    def reemplazar(self, recurso, filas, version):
+        filas = [(recurso, str(fila.get("codigo")), posicion, json.dumps(fila))
+                 for posicion, fila in enumerate(filas)]
+        conexion = self._conexion()
+        with conexion:
+            # BEGIN IMMEDIATE toma el bloqueo de escritura antes de comparar la versión:
+            # ningún worker puede escribir entre la comparación y el reemplazo
+            conexion.execute("BEGIN IMMEDIATE")
+            actual = conexion.execute("SELECT version FROM recursos WHERE recurso = ?", (recurso,)).fetchone()
+            if (actual[0] if actual else 0) != version:
+                return False
+            conexion.execute("DELETE FROM registros WHERE recurso = ?", (recurso,))
+            conexion.executemany(
+                "INSERT OR REPLACE INTO registros (recurso, codigo, posicion, datos) VALUES (?, ?, ?, ?)", filas
+            )
+            conexion.execute(
+                "INSERT INTO recursos (recurso, momento) VALUES (?, ?)"
+                " ON CONFLICT (recurso) DO UPDATE SET momento = excluded.momento, pendiente = 0",
+                (recurso, time.time())
+            )
+        return True
+
+    def guardar(self, recurso, registro):
+        with self._conexion() as conexion:
+            self._cambiar_version(recurso, conexion)
+            conexion.execute(
+                "INSERT INTO registros (recurso, codigo, posicion, datos) VALUES (?, ?,"
+                " (SELECT COALESCE(MAX(posicion), -1) + 1 FROM registros WHERE recurso = ?), ?)"
+                " ON CONFLICT (recurso, codigo) DO UPDATE SET datos = excluded.datos",
+                (recurso, str(registro.get("codigo")), recurso, json.dumps(registro))
+            )
+
+    def eliminar(self, recurso, codigo):
+        with self._conexion() as conexion:
+            self._cambiar_version(recurso, conexion)
+            conexion.execute("DELETE FROM registros WHERE recurso = ? AND codigo = ?", (recurso, codigo))
+
+    def estado(self):
+        filas = self._conexion().execute(
+            "SELECT s.recurso, s.momento, COUNT(r.codigo) FROM recursos s"
+            " LEFT JOIN registros r ON r.recurso = s.recurso WHERE s.momento IS NOT NULL GROUP BY s.recurso"
+        ).fetchall()
+        return {recurso: (cantidad, momento) for recurso, momento, cantidad in filas}
+
+
+def instalar_replica(aplicacion, entidades):
+    """
+    Crea la réplica indicada en REPLICA ("memoria" o "sqlite"; vacío la desactiva)
+    para las entidades indicadas y arranca su sincronizador con la primera
+    petición de cada proceso.
+    """
+    tipo = aplicacion.config["REPLICA"]
+    if not tipo:
+        return None
+    recursos = [entidad.recurso for entidad in entidades]
+    if tipo == "memoria":
+        replica = ReplicaMemoria({entidad.recurso: entidad.modelo for entidad in entidades})
+    elif tipo == "sqlite":
+        replica = ReplicaSQLite(os.path.join(aplicacion.root_path, aplicacion.config["REPLICA_RUTA"]))
+    else:
+        raise ValueError(f"REPLICA debe ser 'memoria' o 'sqlite', no {tipo!r}")
+    aplicacion.extensions["replica"] = replica
+    intervalo = aplicacion.config["REPLICA_INTERVALO"]
+
+    @aplicacion.before_request
+    def iniciar_replica():
+        replica.iniciar(aplicacion.extensions["cliente_api"], recursos, intervalo)
+
+    return replica
+
+
+def obtener_replica():
+    """
+    Retorna la réplica de la aplicación actual o None si REPLICA está desactivada.
+    """
+    return current_app.extensions.get("replica")
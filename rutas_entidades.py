@@ -0,0 +1,366 @@
+# Fábrica de Blueprints CRUD para las entidades registradas en entidades.py
+from itertools import chain
+
+from flask import Blueprint, Response, current_app, g, request, redirect, url_for
+from api_json import PREFIJO_API, listado, quiere_json, serializar
+from cliente_api import ERRORES_CONEXION, obtener_cliente_api
+from cache_listas import obtener_cache
+from cache_http import etiqueta_listado, respuesta_condicional
+from busqueda import obtener_busqueda
+from fragmentos import obtener_fragmentos, renderizador_filas
+from importacion import exportar_csv, importar as importar_registros, leer_filas
+from parcial import eliminado_parcial, error_api, error_parcial, guardado_parcial, modo_parcial
+from paginacion import leer_parametros, obtener_pagina, paginar
+from renderizado import renderizar_listado
+from replica import obtener_replica
+
+
+def listar_registros(entidad):
+    """
+    Retorna la lista de la entidad desde la réplica local (REPLICA), si ya se copió,
+    o desde la caché compartida o, si venció, desde la API. Los registros de la
+    API se convierten en modelos (ver modelos.py), que ocupan menos memoria en la caché.
+    Si la API falla (o su circuito está abierto) y la caché tiene una copia anterior,
+    retorna esa copia y marca g.datos_desactualizados para avisarlo en la página.
+    Sin caché, las vistas simultáneas comparten una sola petición (API_COALESCER);
+    si la coalescencia también está desactivada, retorna un iterador que lee la
+    respuesta registro por registro y la paginación no necesita toda la lista en memoria.
+    """
+    replica = obtener_replica()
+    if replica is not None and replica.cargada(entidad.recurso):
+        return replica.listar(entidad.recurso)
+
+    api = obtener_cliente_api()
+    cache = obtener_cache()
+    if cache.activa:
+        try:
+            return cache.obtener(entidad.recurso, lambda: entidad.modelos(api.listar(entidad.recurso)))
+        except Exception:
+            datos = cache.ultima_conocida(entidad.recurso)
+            if datos is None:
+                raise
+            g.datos_desactualizados = True
+            return datos
+    if api.coalescedor is not None:
+        return entidad.modelos(api.listar(entidad.recurso))
+    return map(entidad.modelo.desde_api, api.iterar(entidad.recurso))
+
+
+def buscar_registro(entidad, codigo):
+    """
+    Retorna el registro con "codigo" desde la réplica local (una lectura por
+    índice, sin ir a la API) o, si la réplica no está disponible, desde la API.
+    """
+    replica = obtener_replica()
+    if replica is not None and replica.cargada(entidad.recurso):
+        return replica.buscar(entidad.recurso, codigo)
+    return obtener_cliente_api().buscar(entidad.recurso, codigo)
+
+
+def aplicar_escritura(entidad, respuesta, registro=None, codigo=None):
+    """
+    Aplica en la réplica local y en el índice de búsqueda una escritura que la
+    API aceptó (write-through): guarda "registro" o, si no se indica, elimina "codigo".
+    """
+    if not respuesta.ok:
+        return
+    for copia in (obtener_replica(), obtener_busqueda()):
+        if copia is None:
+            continue
+        if registro is not None:
+            copia.guardar(entidad.recurso, registro)
+        else:
+            copia.eliminar(entidad.recurso, codigo)
+
+
+def respuesta_json(valor, estado=200):
+    """
+    Respuesta JSON serializada con api_json.serializar() (orjson si está instalado).
+    """
+    return Response(serializar(valor), status=estado, mimetype="application/json")
+
+
+def crear_blueprint(entidad):
+    """
+    Crea el Blueprint "rutas_<plural>" con las rutas de listar, buscar, crear,
+    actualizar y eliminar de la entidad. Los endpoints conservan los nombres
+    que usan las plantillas (p. ej. rutas_productos.productos, rutas_productos.buscar_producto).
+    """
+    rutas = Blueprint(entidad.blueprint, __name__)
+    recurso = entidad.recurso
+    endpoint_listado = f"{entidad.blueprint}.{entidad.plural}"
+    endpoint_eliminar = f"{entidad.blueprint}.eliminar_{entidad.nombre}"
+
+    def cargar_pagina(parametros):
+        replica = obtener_replica()
+        if replica is not None and replica.cargada(recurso):
+            # Con réplica se pagina la copia local aunque API_PAGINACION_REMOTA esté activo
+            return paginar(replica.listar(recurso), **parametros)
+        return obtener_pagina(recurso, lambda: listar_registros(entidad), **parametros)
+
+    def cargar_pagina_o_vacia(parametros):
+        # Si la API no responde se muestra la tabla vacía en lugar de un error
+        try:
+            return cargar_pagina(parametros)
+        except Exception as e:
+            print("Error al conectar con la API:", e)
+            return paginar([], **parametros)
+
+    def renderizador():
+        return renderizador_filas(current_app.jinja_env, entidad.columnas,
+                                  lambda codigo: url_for(endpoint_eliminar, codigo=codigo))
+
+    def cuerpo_tabla(filas, etiqueta=None):
+        # Filas ya renderizadas (ver fragmentos.py); con la ETag de la página se
+        # reutiliza el cuerpo completo si ya se armó antes
+        return obtener_fragmentos().cuerpo(recurso, filas, entidad.columnas, renderizador(), etiqueta)
+
+    def partes_tabla(filas, etiqueta=None):
+        # La plantilla recorre "cuerpo_tabla": con streaming, fila por fila a medida
+        # que se envían; si no, el cuerpo completo en una sola parte
+        if current_app.config["STREAMING_LISTADOS"]:
+            return obtener_fragmentos().partes(recurso, filas, entidad.columnas, renderizador(), etiqueta)
+        return (cuerpo_tabla(filas, etiqueta),)
+
+    def renderizar(pagina, registro=None, etiqueta=None, **contexto):
+        # La plantilla recibe la página con el nombre en plural y el registro en singular
+        contexto[entidad.plural] = pagina.filas
+        contexto[entidad.nombre] = registro
+        contexto["cuerpo_tabla"] = partes_tabla(pagina.filas, etiqueta)
+        return renderizar_listado(entidad.plantilla, pagina=pagina, **contexto)
+
+    # ------------------- LISTAR -------------------
+    def listar():
+        """
+        Ruta para listar todos los registros disponibles en la API.
+        Llama al endpoint /api/<recurso> (o usa la caché) y extrae la lista desde la clave "datos".
+        Acepta ?page=&size=&sort=&q= para mostrar solo una página filtrada y ordenada.
+        Si el navegador ya tiene esta misma página (If-None-Match) responde 304 sin renderizar.
+        Con "Accept: application/json" o desde /api/v1/<plural> responde la página en JSON.
+        """
+        parametros = leer_parametros(request.args)
+        if quiere_json(request):
+            respuesta = listar_json(parametros)
+        else:
+            pagina = cargar_pagina_o_vacia(parametros)
+            etiqueta = etiqueta_listado(pagina, bool(g.get("datos_desactualizados")))
+            respuesta = respuesta_condicional(etiqueta, lambda: renderizar(pagina, etiqueta=etiqueta, modo="crear"))
+        # La misma URL responde HTML o JSON según la cabecera Accept
+        respuesta.vary.add("Accept")
+        return respuesta
+
+    def listar_json(parametros):
+        # A diferencia de la página HTML, un error de la API se informa en lugar de mostrar una tabla vacía
+        try:
+            pagina = cargar_pagina(parametros)
+        except Exception as e:
+            return respuesta_json({"error": f"Error al conectar con la API: {e}"}, 503)
+        desactualizados = bool(g.get("datos_desactualizados"))
+        return respuesta_condicional(
+            etiqueta_listado(pagina, desactualizados, "json"),
+            lambda: respuesta_json(listado(pagina, desactualizados))
+        )
+
+    # ------------------- REGISTRO (JSON) -------------------
+    def registro_json(codigo):
+        """
+        Ruta /api/v1/<plural>/<codigo>: retorna el registro en JSON desde la
+        réplica local o la API, o 404 si no existe.
+        """
+        try:
+            registro = buscar_registro(entidad, codigo)
+        except Exception as e:
+            return respuesta_json({"error": f"Error al conectar con la API: {e}"}, 503)
+        if registro is None:
+            return respuesta_json({"error": entidad.mensaje_no_encontrado}, 404)
+        return respuesta_json({"datos": entidad.modelo.desde_api(registro)})
+
+    # ------------------- BUSCAR -------------------
+    def buscar():
+        """
+        Ruta para buscar un registro específico a partir de su código.
+        Si lo encuentra, carga sus datos en el formulario en modo "actualizar".
+        Si no existe, retorna un mensaje y la lista completa.
+        La búsqueda por código y la lista (o la caché) se consultan al mismo tiempo.
+        Si la API no responde (o su circuito está abierto) se muestra la lista
+        como en listar(): la última copia conocida con el aviso de datos desactualizados.
+        """
+        codigo = request.form.get("codigo_buscar")
+        parametros = leer_parametros(request.args)
+        api = obtener_cliente_api()
+        mensaje = entidad.mensaje_no_encontrado
+
+        def buscar_o_desactualizado():
+            nonlocal mensaje
+            try:
+                return buscar_registro(entidad, codigo)
+            except ERRORES_CONEXION as e:
+                print("Error al conectar con la API:", e)
+                g.datos_desactualizados = True
+                mensaje = f"No se pudo buscar {entidad.nombre} {codigo}: la API no responde"
+                return None
+
+        try:
+            if codigo:
+                registro, pagina = api.en_paralelo(
+                    buscar_o_desactualizado,
+                    lambda: cargar_pagina_o_vacia(parametros)
+                )
+            else:
+                registro, pagina = None, cargar_pagina_o_vacia(parametros)
+        except Exception as e:
+            return f"Error en la búsqueda: {e}"
+
+        if registro:
+            return renderizar(pagina, registro, modo="actualizar")
+
+        # Si no se encuentra el registro, mostrar la página que ya se cargó
+        return renderizar(pagina, mensaje=mensaje, modo="crear")
+
+    # ------------------- CREAR -------------------
+    def crear():
+        """
+        Ruta para crear un registro nuevo en la API.
+        Toma los datos del formulario y los envía vía POST al endpoint /api/<recurso>.
+        En modo parcial (ver parcial.py) responde solo la fila nueva en lugar de redirigir.
+        """
+        modo = modo_parcial(request)
+        error = f"Error al crear {entidad.nombre}"
+        try:
+            datos = entidad.leer_formulario(request.form)
+        except ValueError as e:
+            return error_parcial(modo, f"{error}: {e}", 400)
+
+        try:
+            respuesta = obtener_cliente_api().post(recurso, json=datos)
+        except Exception as e:
+            return error_parcial(modo, f"{error}: {e}", 502)
+        finally:
+            # La lista cambió en la API: invalidar solo la entrada de este recurso
+            obtener_cache().invalidar(recurso)
+
+        aplicar_escritura(entidad, respuesta, registro=datos)
+
+        if modo is None:
+            return redirect(url_for(endpoint_listado))
+        if not respuesta.ok:
+            return error_api(modo, error, respuesta)
+        return guardado_parcial(modo, entidad.modelo.desde_api(datos), lambda fila: cuerpo_tabla([fila]), 201)
+
+    # ------------------- ACTUALIZAR -------------------
+    def actualizar():
+        """
+        Ruta para actualizar un registro existente en la API.
+        Busca por código y realiza una petición PUT con los nuevos datos.
+        En modo parcial responde solo la fila actualizada en lugar de redirigir.
+        """
+        modo = modo_parcial(request)
+        error = f"Error al actualizar {entidad.nombre}"
+        codigo = request.form.get("codigo")
+        try:
+            datos = entidad.leer_formulario(request.form, con_codigo=False)
+        except ValueError as e:
+            return error_parcial(modo, f"{error}: {e}", 400)
+
+        try:
+            respuesta = obtener_cliente_api().put(f"{recurso}/codigo/{codigo}", json=datos)
+        except Exception as e:
+            return error_parcial(modo, f"{error}: {e}", 502)
+        finally:
+            obtener_cache().invalidar(recurso)
+
+        registro = {"codigo": codigo, **datos}
+        aplicar_escritura(entidad, respuesta, registro=registro)
+
+        if modo is None:
+            return redirect(url_for(endpoint_listado))
+        if not respuesta.ok:
+            return error_api(modo, error, respuesta)
+        return guardado_parcial(modo, entidad.modelo.desde_api(registro), lambda fila: cuerpo_tabla([fila]))
+
+    # ------------------- ELIMINAR -------------------
+    def eliminar(codigo):
+        """
+        Ruta para eliminar un registro de la API según su código.
+        Envía una petición DELETE al endpoint correspondiente.
+        En modo parcial responde 204 y el script quita la fila de la tabla.
+        """
+        modo = modo_parcial(request)
+        error = f"Error al eliminar {entidad.nombre}"
+        try:
+            respuesta = obtener_cliente_api().delete(f"{recurso}/codigo/{codigo}")
+        except Exception as e:
+            return error_parcial(modo, f"{error}: {e}", 502)
+        finally:
+            obtener_cache().invalidar(recurso)
+
+        aplicar_escritura(entidad, respuesta, codigo=codigo)
+
+        if modo is None:
+            return redirect(url_for(endpoint_listado))
+        if not respuesta.ok:
+            return error_api(modo, error, respuesta)
+        return eliminado_parcial(modo, codigo)
+
+    # ------------------- IMPORTAR -------------------
+    def importar():
+        """
+        Ruta para crear muchos registros a partir de un archivo CSV o JSON.
+        El archivo se lee por partes, cada fila se valida con los tipos de la
+        entidad y los registros se envían a la API en lotes concurrentes
+        (IMPORTACION_LOTE). La lista se invalida una sola vez al terminar.
+        """
+        archivo = request.files.get("archivo")
+        if archivo is None or not archivo.filename:
+            mensaje = "Seleccione un archivo CSV o JSON para importar"
+        else:
+            try:
+                mensaje = importar_registros(
+                    obtener_cliente_api(), entidad, leer_filas(archivo),
+                    lote=current_app.config["IMPORTACION_LOTE"]
+                ).mensaje
+            finally:
+                obtener_cache().invalidar(recurso)
+                # La réplica y el índice se vuelven a copiar completos en lugar de aplicar cada registro
+                for copia in (obtener_replica(), obtener_busqueda()):
+                    if copia is not None:
+                        copia.solicitar(recurso)
+
+        pagina = cargar_pagina_o_vacia(leer_parametros(request.args))
+        return renderizar(pagina, mensaje=mensaje, modo="crear")
+
+    # ------------------- EXPORTAR -------------------
+    def exportar():
+        """
+        Ruta para descargar todos los registros como CSV.
+        Los registros se leen de la API y se escriben en la respuesta a medida
+        que llegan, sin guardar la lista completa en memoria.
+        """
+        registros = obtener_cliente_api().iterar(recurso)
+        try:
+            # Leer el primer registro hace la petición: un error se informa antes de empezar a enviar
+            primero = next(registros, None)
+        except Exception as e:
+            return f"Error al exportar {entidad.plural}: {e}"
+
+        filas = chain(() if primero is None else (primero,), registros)
+        return Response(
+            exportar_csv(entidad, filas),
+            mimetype="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{entidad.plural}.csv"'}
+        )
+
+    # ------------------- Registro de rutas -------------------
+    prefijo = f"/{entidad.plural}"
+    rutas.add_url_rule(prefijo, entidad.plural, listar)
+    rutas.add_url_rule(f"{prefijo}/buscar", f"buscar_{entidad.nombre}", buscar, methods=["POST"])
+    rutas.add_url_rule(f"{prefijo}/crear", f"crear_{entidad.nombre}", crear, methods=["POST"])
+    rutas.add_url_rule(f"{prefijo}/actualizar", f"actualizar_{entidad.nombre}", actualizar, methods=["POST"])
+    rutas.add_url_rule(
+        f"{prefijo}/eliminar/<string:codigo>", f"eliminar_{entidad.nombre}", eliminar, methods=["POST"]
+    )
+    rutas.add_url_rule(f"{prefijo}/importar", f"importar_{entidad.nombre}", importar, methods=["POST"])
+    rutas.add_url_rule(f"{prefijo}/exportar", f"exportar_{entidad.plural}", exportar)
+    rutas.add_url_rule(f"{PREFIJO_API}{prefijo}", f"api_{entidad.plural}", listar)
+    rutas.add_url_rule(f"{PREFIJO_API}{prefijo}/<string:codigo>", f"api_{entidad.nombre}", registro_json)
+    return rutas
@@ -0,0 +1,319 @@
+# Fábrica de Blueprints CRUD asíncronos para el modo ASGI (app_async.py)
+# Requiere Quart (dependencia opcional: pip install quart httpx)
+import asyncio
+
+from quart import Blueprint, Response, current_app, g, redirect, render_template, request, url_for
+
+from api_json import PREFIJO_API, listado, quiere_json, serializar
+from cliente_api_async import ERRORES_CONEXION
+from fragmentos import renderizador_filas
+from importacion import exportar_csv_async, importar_async, leer_filas
+from parcial import eliminado_parcial, error_api, error_parcial, guardado_parcial, modo_parcial
+from paginacion import Pagina, leer_parametros, paginar
+
+
+def _cliente():
+    return current_app.extensions["cliente_api"]
+
+
+def _cache():
+    return current_app.extensions["cache_listas"]
+
+
+async def en_cache(funcion, *args):
+    """
+    Llama a "funcion" (un método de la caché de listas o que la consulta) sin
+    detener el bucle de eventos: con un almacén compartido (Redis, mmap) cada
+    llamada puede esperar la red o un bloqueo de archivo hasta CACHE_REDIS_TIMEOUT,
+    así que se hace en un hilo. Con el almacén local se llama directamente.
+    """
+    if _cache().almacen.compartido:
+        return await asyncio.to_thread(funcion, *args)
+    return funcion(*args)
+
+
+def _fragmentos():
+    return current_app.extensions["fragmentos"]
+
+
+async def listar_registros(entidad):
+    """
+    Retorna la lista de la entidad desde la caché compartida o, si venció, desde la API.
+    Si la API falla y hay una copia anterior en la caché, la retorna marcada como desactualizada.
+    """
+    api = _cliente()
+    cache = _cache()
+    if not cache.activa:
+        return entidad.modelos(await api.listar(entidad.recurso))
+
+    datos, version = await en_cache(cache.leer, entidad.recurso)
+    if datos is None:
+        try:
+            datos = entidad.modelos(await api.listar(entidad.recurso))
+        except Exception:
+            datos = await en_cache(cache.ultima_conocida, entidad.recurso)
+            if datos is None:
+                raise
+            g.datos_desactualizados = True
+            return datos
+        await en_cache(cache.guardar, entidad.recurso, datos, version)
+    return datos
+
+
+async def obtener_pagina(entidad, pagina=1, tamano=50, orden="", q=""):
+    """
+    Versión asíncrona de paginacion.obtener_pagina().
+    """
+    if current_app.config["API_PAGINACION_REMOTA"]:
+        datos, total = await _cliente().listar_pagina(entidad.recurso, pagina, tamano, orden, q)
+        if total is not None:
+            return Pagina(datos, pagina, tamano, total, orden, q)
+        return paginar(datos, pagina, tamano, orden, q)
+    return paginar(await listar_registros(entidad), pagina, tamano, orden, q)
+
+
+def respuesta_json(valor, estado=200):
+    return Response(serializar(valor), status=estado, mimetype="application/json")
+
+
+def crear_blueprint_async(entidad):
+    """
+    Crea el Blueprint "rutas_<plural>" con las mismas rutas y endpoints que
+    rutas_entidades.crear_blueprint(), pero con vistas asíncronas: mientras
+    una vista espera a la API, el mismo proceso atiende otras peticiones.
+    """
+    rutas = Blueprint(entidad.blueprint, __name__)
+    recurso = entidad.recurso
+    endpoint_listado = f"{entidad.blueprint}.{entidad.plural}"
+    endpoint_eliminar = f"{entidad.blueprint}.eliminar_{entidad.nombre}"
+
+    def cuerpo_tabla(filas):
+        # Filas ya renderizadas por fila (ver fragmentos.py); sin ETag no se guarda el cuerpo completo
+        return _fragmentos().cuerpo(
+            recurso, filas, entidad.columnas,
+            renderizador_filas(current_app.jinja_env, entidad.columnas,
+                               lambda codigo: url_for(endpoint_eliminar, codigo=codigo))
+        )
+
+    async def renderizar(pagina, registro=None, **contexto):
+        contexto[entidad.plural] = pagina.filas
+        contexto[entidad.nombre] = registro
+        # La plantilla recorre las partes del cuerpo (ver rutas_entidades.partes_tabla)
+        contexto["cuerpo_tabla"] = (cuerpo_tabla(pagina.filas),)
+        return await render_template(entidad.plantilla, pagina=pagina, **contexto)
+
+    async def obtener_pagina_o_vacia(parametros):
+        # Si la API no responde se muestra la tabla vacía en lugar de un error
+        try:
+            return await obtener_pagina(entidad, **parametros)
+        except Exception as e:
+            print("Error al conectar con la API:", e)
+            return paginar([], **parametros)
+
+    # ------------------- LISTAR -------------------
+    async def listar():
+        """
+        Ruta para listar los registros de la entidad (acepta ?page=&size=&sort=&q=).
+        Con "Accept: application/json" o desde /api/v1/<plural> responde la página en JSON.
+        """
+        parametros = leer_parametros(request.args, current_app.config)
+        if quiere_json(request):
+            try:
+                pagina = await obtener_pagina(entidad, **parametros)
+            except Exception as e:
+                respuesta = respuesta_json({"error": f"Error al conectar con la API: {e}"}, 503)
+            else:
+                respuesta = respuesta_json(listado(pagina, bool(g.get("datos_desactualizados"))))
+        else:
+            pagina = await obtener_pagina_o_vacia(parametros)
+            respuesta = Response(await renderizar(pagina, modo="crear"), mimetype="text/html")
+        respuesta.vary.add("Accept")
+        return respuesta
+
+    # ------------------- REGISTRO (JSON) -------------------
+    async def registro_json(codigo):
+        """
+        Ruta /api/v1/<plural>/<codigo>: retorna el registro en JSON o 404 si no existe.
+        """
+        try:
+            registro = await _cliente().buscar(recurso, codigo)
+        except Exception as e:
+            return respuesta_json({"error": f"Error al conectar con la API: {e}"}, 503)
+        if registro is None:
+            return respuesta_json({"error": entidad.mensaje_no_encontrado}, 404)
+        return respuesta_json({"datos": entidad.modelo.desde_api(registro)})
+
+    # ------------------- BUSCAR -------------------
+    async def buscar():
+        """
+        Ruta para buscar un registro por código; la búsqueda y la lista se
+        esperan al mismo tiempo. Si la API no responde se muestra la última
+        lista conocida con el aviso de datos desactualizados.
+        """
+        formulario = await request.form
+        codigo = formulario.get("codigo_buscar")
+        parametros = leer_parametros(request.args, current_app.config)
+        api = _cliente()
+        mensaje = entidad.mensaje_no_encontrado
+
+        async def buscar_o_desactualizado():
+            nonlocal mensaje
+            try:
+                return await api.buscar(recurso, codigo)
+            except ERRORES_CONEXION as e:
+                print("Error al conectar con la API:", e)
+                g.datos_desactualizados = True
+                mensaje = f"No se pudo buscar {entidad.nombre} {codigo}: la API no responde"
+                return None
+
+        try:
+            if codigo:
+                registro, pagina = await api.en_paralelo(
+                    buscar_o_desactualizado(),
+                    obtener_pagina_o_vacia(parametros)
+                )
+            else:
+                registro, pagina = None, await obtener_pagina_o_vacia(parametros)
+        except Exception as e:
+            return f"Error en la búsqueda: {e}"
+
+        if registro:
+            return await renderizar(pagina, registro, modo="actualizar")
+
+        return await renderizar(pagina, mensaje=mensaje, modo="crear")
+
+    # ------------------- CREAR -------------------
+    async def crear():
+        """
+        Ruta para crear un registro nuevo en la API (en modo parcial responde solo la fila nueva).
+        """
+        modo = modo_parcial(request)
+        error = f"Error al crear {entidad.nombre}"
+        try:
+            datos = entidad.leer_formulario(await request.form)
+        except ValueError as e:
+            return error_parcial(modo, f"{error}: {e}", 400)
+
+        try:
+            respuesta = await _cliente().post(recurso, json=datos)
+        except Exception as e:
+            return error_parcial(modo, f"{error}: {e}", 502)
+        finally:
+            await en_cache(_cache().invalidar, recurso)
+
+        if modo is None:
+            return redirect(url_for(endpoint_listado))
+        if not respuesta.is_success:
+            return error_api(modo, error, respuesta)
+        return guardado_parcial(modo, entidad.modelo.desde_api(datos), lambda fila: cuerpo_tabla([fila]), 201)
+
+    # ------------------- ACTUALIZAR -------------------
+    async def actualizar():
+        """
+        Ruta para actualizar un registro existente en la API (en modo parcial responde solo la fila).
+        """
+        modo = modo_parcial(request)
+        error = f"Error al actualizar {entidad.nombre}"
+        formulario = await request.form
+        codigo = formulario.get("codigo")
+        try:
+            datos = entidad.leer_formulario(formulario, con_codigo=False)
+        except ValueError as e:
+            return error_parcial(modo, f"{error}: {e}", 400)
+
+        try:
+            respuesta = await _cliente().put(f"{recurso}/codigo/{codigo}", json=datos)
+        except Exception as e:
+            return error_parcial(modo, f"{error}: {e}", 502)
+        finally:
+            await en_cache(_cache().invalidar, recurso)
+
+        if modo is None:
+            return redirect(url_for(endpoint_listado))
+        if not respuesta.is_success:
+            return error_api(modo, error, respuesta)
+        registro = entidad.modelo.desde_api({"codigo": codigo, **datos})
+        return guardado_parcial(modo, registro, lambda fila: cuerpo_tabla([fila]))
+
+    # ------------------- ELIMINAR -------------------
+    async def eliminar(codigo):
+        """
+        Ruta para eliminar un registro de la API según su código (en modo parcial responde 204).
+        """
+        modo = modo_parcial(request)
+        error = f"Error al eliminar {entidad.nombre}"
+        try:
+            respuesta = await _cliente().delete(f"{recurso}/codigo/{codigo}")
+        except Exception as e:
+            return error_parcial(modo, f"{error}: {e}", 502)
+        finally:
+            await en_cache(_cache().invalidar, recurso)
+
+        if modo is None:
+            return redirect(url_for(endpoint_listado))
+        if not respuesta.is_success:
+            return error_api(modo, error, respuesta)
+        return eliminado_parcial(modo, codigo)
+
+    # ------------------- IMPORTAR -------------------
+    async def importar():
+        """
+        Ruta para crear muchos registros a partir de un archivo CSV o JSON,
+        enviados a la API en lotes concurrentes (IMPORTACION_LOTE).
+        """
+        archivo = (await request.files).get("archivo")
+        if archivo is None or not archivo.filename:
+            mensaje = "Seleccione un archivo CSV o JSON para importar"
+        else:
+            try:
+                mensaje = (await importar_async(
+                    _cliente(), entidad, leer_filas(archivo),
+                    lote=current_app.config["IMPORTACION_LOTE"]
+                )).mensaje
+            finally:
+                await en_cache(_cache().invalidar, recurso)
+
+        parametros = leer_parametros(request.args, current_app.config)
+        pagina = await obtener_pagina_o_vacia(parametros)
+        return await renderizar(pagina, mensaje=mensaje, modo="crear")
+
+    # ------------------- EXPORTAR -------------------
+    async def exportar():
+        """
+        Ruta para descargar todos los registros como CSV.
+        Los registros se leen de la API y se escriben en la respuesta a medida
+        que llegan, sin guardar la lista completa en memoria.
+        """
+        registros = _cliente().iterar(recurso)
+        try:
+            # Leer el primer registro hace la petición: un error se informa antes de empezar a enviar
+            primero = await anext(registros, None)
+        except Exception as e:
+            return f"Error al exportar {entidad.plural}: {e}"
+
+        async def filas():
+            if primero is not None:
+                yield primero
+                async for registro in registros:
+                    yield registro
+
+        return Response(
+            exportar_csv_async(entidad, filas()),
+            mimetype="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{entidad.plural}.csv"'}
+        )
+
+    # ------------------- Registro de rutas -------------------
+    prefijo = f"/{entidad.plural}"
+    rutas.add_url_rule(prefijo, entidad.plural, listar)
+    rutas.add_url_rule(f"{prefijo}/buscar", f"buscar_{entidad.nombre}", buscar, methods=["POST"])
+    rutas.add_url_rule(f"{prefijo}/crear", f"crear_{entidad.nombre}", crear, methods=["POST"])
+    rutas.add_url_rule(f"{prefijo}/actualizar", f"actualizar_{entidad.nombre}", actualizar, methods=["POST"])
+    rutas.add_url_rule(
+        f"{prefijo}/eliminar/<string:codigo>", f"eliminar_{entidad.nombre}", eliminar, methods=["POST"]
+    )
+    rutas.add_url_rule(f"{prefijo}/importar", f"importar_{entidad.nombre}", importar, methods=["POST"])
+    rutas.add_url_rule(f"{prefijo}/exportar", f"exportar_{entidad.plural}", exportar)
+    rutas.add_url_rule(f"{PREFIJO_API}{prefijo}", f"api_{entidad.plural}", listar)
+    rutas.add_url_rule(f"{PREFIJO_API}{prefijo}/<string:codigo>", f"api_{entidad.nombre}", registro_json)
+    return rutas
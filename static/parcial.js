@@ -0,0 +1,77 @@
+/* ------------------------------
+   Crear, actualizar y eliminar sin recargar la página
+   Los formularios con data-parcial se envían con fetch y la cabecera X-Parcial;
+   el servidor responde solo la fila creada o actualizada (o 204 al eliminar)
+   y aquí se coloca en la tabla (ver parcial.py). Sin JavaScript los mismos
+   formularios siguen funcionando con redirección y recarga completa.
+--------------------------------*/
+(function () {
+    "use strict";
+
+    // Mensaje de error junto al formulario (se crea la primera vez)
+    function mostrarMensaje(formulario, texto) {
+        var mensaje = formulario.nextElementSibling;
+        if (!mensaje || !mensaje.classList.contains("mensaje-parcial")) {
+            if (!texto) {
+                return;
+            }
+            mensaje = document.createElement("p");
+            mensaje.className = "mensaje-parcial";
+            formulario.insertAdjacentElement("afterend", mensaje);
+        }
+        mensaje.textContent = texto;
+    }
+
+    // Reemplaza la fila con el mismo código o, si es nueva, la agrega al principio de la tabla
+    function colocarFila(html) {
+        var plantilla = document.createElement("template");
+        plantilla.innerHTML = html.trim();
+        var fila = plantilla.content.querySelector("tr");
+        var cuerpo = document.querySelector("table tbody");
+        if (!fila || !cuerpo) {
+            return;
+        }
+        var existente = cuerpo.querySelector('tr[data-codigo="' + CSS.escape(fila.dataset.codigo) + '"]');
+        if (existente) {
+            existente.replaceWith(fila);
+        } else {
+            cuerpo.prepend(fila);
+        }
+    }
+
+    document.addEventListener("submit", async function (evento) {
+        var formulario = evento.target;
+        var accion = formulario.dataset.parcial;
+        if (!accion || !window.fetch) {
+            return;
+        }
+        evento.preventDefault();
+
+        var respuesta;
+        try {
+            respuesta = await fetch(formulario.action, {
+                method: "POST",
+                body: new FormData(formulario),
+                headers: {"X-Parcial": "1"}
+            });
+        } catch (error) {
+            mostrarMensaje(formulario, "No se pudo conectar con el servidor");
+            return;
+        }
+        var texto = await respuesta.text();
+        if (!respuesta.ok) {
+            mostrarMensaje(formulario, texto);
+            return;
+        }
+
+        if (accion === "eliminar") {
+            formulario.closest("tr").remove();
+        } else {
+            colocarFila(texto);
+            if (accion === "crear") {
+                formulario.reset();
+            }
+            mostrarMensaje(formulario, "");
+        }
+    });
+})();
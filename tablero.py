@@ -0,0 +1,200 @@
+# Tablero con el resumen de todas las entidades (/tablero)
+# En lugar de abrir una pestaña por entidad, una sola página muestra la cantidad
+# de registros de cada una, el total facturado y los productos con poco stock.
+# Las listas se piden al mismo tiempo (pool de hilos del cliente de la API o
+# asyncio.gather en el modo ASGI), así que la página tarda lo que la llamada más
+# lenta y no la suma de todas. El resumen se guarda TABLERO_TTL segundos mientras
+# no cambie la versión de ninguna lista en la caché: crear, actualizar, eliminar
+# o importar en cualquier entidad lo vuelven a calcular. Un resumen armado con
+# la última copia conocida de alguna lista (la API no respondía) no se guarda.
+import heapq
+import threading
+import time
+from functools import partial
+
+from flask import current_app, g, make_response, render_template, request
+
+from api_json import PREFIJO_API, quiere_json, serializar
+from cache_listas import obtener_cache
+from cliente_api import obtener_cliente_api
+
+
+def _stock(fila):
+    return fila.get("stock")
+
+
+def resumir(entidad, filas, stock_minimo, limite_stock):
+    """
+    Resume una lista en una sola pasada (las filas pueden ser un iterador):
+    - registros: cantidad de registros
+    - suma_total: suma del campo "total", si la entidad lo tiene (facturas)
+    - stock_bajo_total / stock_bajo: cantidad de registros con "stock" menor o
+      igual a stock_minimo y los "limite_stock" de menor stock (productos)
+    """
+    con_total = "total" in entidad.campos
+    con_stock = "stock" in entidad.campos
+    registros = 0
+    suma = 0
+    bajos = []
+    for fila in filas:
+        registros += 1
+        if con_total:
+            suma += fila.get("total") or 0
+        if con_stock:
+            stock = fila.get("stock")
+            if isinstance(stock, (int, float)) and stock <= stock_minimo:
+                bajos.append(fila)
+
+    resumen = {"entidad": entidad.plural, "registros": registros}
+    if con_total:
+        resumen["suma_total"] = suma
+    if con_stock:
+        resumen["stock_bajo_total"] = len(bajos)
+        resumen["stock_bajo"] = heapq.nsmallest(limite_stock, bajos, key=_stock)
+    return resumen
+
+
+class Tablero:
+    """
+    Resumen de todas las entidades guardado en el proceso.
+    - ttl: segundos que se reutiliza el resumen (0 lo calcula en cada petición)
+    - stock_minimo / limite_stock: ver resumir()
+    El resumen guardado lleva las versiones de las listas con que se calculó
+    (ver CacheListas.version) y se descarta en cuanto una cambia.
+    """
+
+    def __init__(self, entidades, ttl=10.0, stock_minimo=5, limite_stock=10):
+        self.entidades = list(entidades)
+        self.ttl = ttl
+        self.stock_minimo = stock_minimo
+        self.limite_stock = limite_stock
+        # (versiones, momento time.monotonic(), datos) del último resumen completo
+        self._guardado = None
+        self._candado = threading.Lock()
+        self._contadores = dict.fromkeys(("aciertos", "fallos", "errores"), 0)
+
+    @classmethod
+    def desde_configuracion(cls, entidades, config):
+        """
+        Crea el tablero a partir de la configuración de Flask (ver configuracion.py).
+        """
+        return cls(
+            entidades,
+            ttl=config["TABLERO_TTL"],
+            stock_minimo=config["TABLERO_STOCK_MINIMO"],
+            limite_stock=config["TABLERO_STOCK_LISTA"]
+        )
+
+    # ------------------- Resumen guardado -------------------
+    def versiones(self, cache):
+        """
+        Versiones de las listas de todas las entidades en la caché, o None si
+        el almacén de la caché no responde (entonces no se reutiliza nada).
+        """
+        versiones = tuple(cache.version(entidad.recurso) for entidad in self.entidades)
+        return None if None in versiones else versiones
+
+    def leer(self, versiones):
+        """
+        Retorna el resumen guardado si sigue vigente para esas versiones, o None.
+        """
+        with self._candado:
+            guardado = self._guardado
+            if (versiones is not None and guardado is not None and guardado[0] == versiones
+                    and time.monotonic() - guardado[1] < self.ttl):
+                self._contadores["aciertos"] += 1
+                return guardado[2]
+            self._contadores["fallos"] += 1
+        return None
+
+    def guardar(self, versiones, resumenes, duracion, desactualizados=False):
+        """
+        Arma el resumen a partir del de cada entidad y lo guarda si todas se
+        pudieron cargar. "duracion" es lo que tardó la carga en paralelo.
+        Con "desactualizados" (alguna lista vino de CacheListas.ultima_conocida)
+        no se guarda: las versiones no cambian cuando la API vuelve, así que se
+        serviría como vigente hasta la próxima escritura.
+        """
+        datos = {"entidades": resumenes, "duracion_ms": round(duracion * 1000, 1), "generado": time.time(),
+                 "desactualizados": desactualizados}
+        if (versiones is not None and self.ttl > 0 and not desactualizados
+                and not any("error" in r for r in resumenes)):
+            with self._candado:
+                self._guardado = (versiones, time.monotonic(), datos)
+        return datos
+
+    # ------------------- Cálculo -------------------
+    def resumen(self, entidad, cargar):
+        """
+        Resumen de una entidad con la lista que retorna cargar(entidad). Si falla
+        se retorna el error para mostrarlo en lugar de perder todo el tablero.
+        """
+        try:
+            return resumir(entidad, cargar(entidad), self.stock_minimo, self.limite_stock)
+        except Exception as e:
+            return self._error(entidad, e)
+
+    async def resumen_async(self, entidad, cargar):
+        """
+        Igual que resumen(), con una función "cargar" asíncrona (modo ASGI).
+        """
+        try:
+            return resumir(entidad, await cargar(entidad), self.stock_minimo, self.limite_stock)
+        except Exception as e:
+            return self._error(entidad, e)
+
+    def _error(self, entidad, error):
+        with self._candado:
+            self._contadores["errores"] += 1
+        return {"entidad": entidad.plural, "error": str(error)}
+
+    # ------------------- Métricas -------------------
+    def metricas(self):
+        """
+        Genera las métricas del tablero en formato de texto de Prometheus.
+        """
+        with self._candado:
+            contadores = dict(self._contadores)
+        lineas = []
+        for nombre, valor in contadores.items():
+            lineas.append(f"# TYPE tablero_{nombre}_total counter")
+            lineas.append(f"tablero_{nombre}_total {valor}")
+        return "\n".join(lineas) + "\n"
+
+
+def instalar_tablero(aplicacion, entidades, cargar):
+    """
+    Crea el tablero de la aplicación y registra /tablero (HTML, o JSON con
+    "Accept: application/json") y /api/v1/tablero (JSON).
+    "cargar(entidad)" retorna la lista de la entidad (rutas_entidades.listar_registros:
+    réplica, caché o API).
+    """
+    tablero = Tablero.desde_configuracion(entidades, aplicacion.config)
+    aplicacion.extensions["tablero"] = tablero
+
+    @aplicacion.route("/tablero", endpoint="tablero")
+    @aplicacion.route(f"{PREFIJO_API}/tablero", endpoint="api_tablero")
+    def ver_tablero():
+        """
+        Función asociada a la ruta /tablero.
+        Retorna el resumen de todas las entidades, pedidas a la vez en el pool de hilos del cliente.
+        """
+        versiones = tablero.versiones(obtener_cache())
+        datos = tablero.leer(versiones)
+        if datos is None:
+            inicio = time.perf_counter()
+            resumenes = obtener_cliente_api().en_paralelo(
+                *(partial(tablero.resumen, entidad, cargar) for entidad in tablero.entidades)
+            )
+            # listar_registros marca g.datos_desactualizados si usó la última copia conocida
+            datos = tablero.guardar(versiones, resumenes, time.perf_counter() - inicio,
+                                    bool(g.get("datos_desactualizados")))
+
+        if quiere_json(request):
+            respuesta = current_app.response_class(serializar(datos), mimetype="application/json")
+        else:
+            respuesta = make_response(render_template("tablero.html", tablero=datos))
+        respuesta.vary.add("Accept")
+        return respuesta
+
+    return tablero
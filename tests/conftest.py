@@ -0,0 +1,32 @@
+# Los módulos de la aplicación están en la raíz del proyecto
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class Reloj:
+    """
+    Reemplazo de time.monotonic() que solo avanza cuando el test cambia "ahora".
+    """
+
+    def __init__(self, ahora):
+        self.ahora = ahora
+
+    def __call__(self):
+        return self.ahora
+
+
+@pytest.fixture
+def reloj(request, monkeypatch):
+    """
+    Reloj controlado por el test en lugar de time.monotonic() (lo usan la caché,
+    el circuito y los demás módulos con "import time"). El momento inicial se
+    puede elegir con @pytest.mark.parametrize("reloj", [...], indirect=True).
+    """
+    reloj = Reloj(getattr(request, "param", 1000.0))
+    monkeypatch.setattr(time, "monotonic", reloj)
+    return reloj
@@ -0,0 +1,125 @@
+import threading
+import time
+
+from flask import Flask
+
+from busqueda import IndiceBusqueda, _IndiceRecurso, instalar_busqueda, normalizar, terminos
+from entidades import ENTIDADES
+
+CLIENTES = next(entidad for entidad in ENTIDADES if entidad.plural == "clientes")
+
+FILAS = [
+    {"codigo": "c1", "nombre": "Ana Gil", "correo": "ana.gil@x.co", "telefono": "300-555-1234"},
+    {"codigo": "c2", "nombre": "Ana Ruiz", "correo": "aruiz@x.co", "telefono": "310"},
+    {"codigo": "c3", "nombre": "José Gil", "correo": "jose@y.co", "telefono": "320"},
+]
+
+
+def _indice(filas=FILAS):
+    return _IndiceRecurso.construir(["codigo", "nombre", "correo", "telefono"], filas)
+
+
+def _buscar(texto, filas=FILAS, limite=20):
+    consulta = sorted(set(terminos(texto)))
+    return sorted(_indice(filas).buscar(consulta, limite)[0])
+
+
+def test_normalizar_y_terminos():
+    assert normalizar("José ÁLVAREZ") == "jose alvarez"
+    assert terminos("300-555-1234") == {"300", "555", "1234", "3005551234"}
+
+
+def test_una_palabra_por_prefijo():
+    assert _buscar("an") == ["c1", "c2"]
+    assert _buscar("jose") == ["c3"]
+    assert _buscar("3005551234") == ["c1"]
+
+
+def test_varias_palabras_deben_coincidir_todas():
+    assert _buscar("ana gil") == ["c1"]
+    assert _buscar("gi an") == ["c1"]
+    assert _buscar("gil") == ["c1", "c3"]
+
+
+def test_palabra_sin_coincidencias_descarta_todo():
+    # Regresión: con dos palabras de un solo término se ignoraban las que no coinciden con nada
+    assert _buscar("ana gil zzzz") == []
+    assert _buscar("zzzz ana") == []
+    assert _buscar("a zzzz") == []
+    assert _buscar("zzzz") == []
+
+
+def test_muchos_terminos_por_palabra():
+    # Palabras que abarcan más de TERMINOS_POR_GRUPO términos se comparan por prefijo
+    filas = [{"codigo": f"p{n}", "nombre": f"nombre{n} comun", "correo": "", "telefono": ""}
+             for n in range(50)]
+    assert _buscar("nombre1 comun", filas) == ["p1"] + [f"p{n}" for n in range(10, 20)]
+    assert _buscar("nombre comun zzzz", filas) == []
+
+
+def test_limite_y_hay_mas():
+    codigos, hay_mas = _indice().buscar(["a"], 1)
+    assert len(codigos) == 1 and hay_mas
+
+
+def test_guardar_y_eliminar_actualizan_el_indice():
+    indice = _indice()
+    indice.guardar({"codigo": "c2", "nombre": "Beatriz Ruiz", "correo": "", "telefono": ""})
+    assert sorted(indice.buscar(["ana"], 20)[0]) == ["c1"]
+    assert indice.buscar(["beatriz"], 20)[0] == ["c2"]
+    indice.eliminar("c1")
+    assert indice.buscar(["ana"], 20)[0] == []
+    assert "ana" not in indice.ordenados
+
+
+def test_construccion_simultanea_una_sola_vez():
+    aplicacion = Flask(__name__)
+    cargas = []
+
+    def cargar(entidad):
+        cargas.append(entidad.plural)
+        time.sleep(0.05)
+        return FILAS
+
+    busqueda = IndiceBusqueda([CLIENTES], cargar)
+    resultados = []
+    with aplicacion.app_context():
+        hilos = [threading.Thread(target=lambda: resultados.append(busqueda.buscar("ana gil")))
+                 for _ in range(5)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+    assert cargas == ["clientes"]
+    assert all([r["codigo"] for r in resultado[0]] == ["c1"] for resultado in resultados)
+
+
+def test_precargar_construye_en_segundo_plano():
+    busqueda = IndiceBusqueda([CLIENTES], lambda entidad: FILAS)
+    busqueda.precargar(Flask(__name__)).join()
+    assert CLIENTES.recurso in busqueda._indices
+    # Una sola vez por proceso
+    assert busqueda.precargar(Flask(__name__)) is None
+
+
+def test_precarga_empieza_con_la_primera_peticion():
+    cargas = []
+    aplicacion = Flask(__name__)
+    aplicacion.config.update(BUSQUEDA_TTL=30.0, BUSQUEDA_LIMITE=20, BUSQUEDA_PRECARGAR=True)
+    busqueda = instalar_busqueda(aplicacion, [CLIENTES], lambda entidad: cargas.append(entidad.plural) or FILAS)
+    time.sleep(0.05)
+    assert cargas == []
+
+    assert aplicacion.test_client().get("/buscar?q=ana").status_code == 200
+    aplicacion.test_client().get("/buscar?q=gil")
+    assert cargas == ["clientes"]
+    assert busqueda.precargar(aplicacion) is None
+
+
+def test_primera_pagina_estable_y_ordenada_por_codigo():
+    filas = [{"codigo": f"c{i:03d}", "nombre": f"Ana {i}", "correo": "", "telefono": ""} for i in range(200)]
+    esperados = [f"c{i:03d}" for i in range(5)]
+    for orden in (filas, filas[::-1], filas[100:] + filas[:100]):
+        assert _indice(orden).buscar(["ana"], 5) == (esperados, True)
+    indice = _indice(filas)
+    assert indice.buscar(["ana"], 200) == ([fila["codigo"] for fila in filas], False)
@@ -0,0 +1,166 @@
+import threading
+
+import pytest
+
+from almacenes_cache import AlmacenMmap
+from cache_listas import CacheListas
+
+
+class Carga:
+    """
+    Función "cargar" que cuenta sus llamadas y retorna una lista distinta cada vez.
+    """
+
+    def __init__(self):
+        self.llamadas = 0
+
+    def __call__(self):
+        self.llamadas += 1
+        return [{"codigo": f"v{self.llamadas}"}]
+
+
+def test_guarda_dentro_del_ttl(reloj):
+    cache = CacheListas(ttl=10)
+    cargar = Carga()
+    primera = cache.obtener("producto", cargar)
+    reloj.ahora += 9.9
+    assert cache.obtener("producto", cargar) is primera
+    assert cargar.llamadas == 1
+
+
+def test_vence_al_cumplir_el_ttl(reloj):
+    cache = CacheListas(ttl=10)
+    cargar = Carga()
+    cache.obtener("producto", cargar)
+    reloj.ahora += 10
+    assert cache.obtener("producto", cargar) == [{"codigo": "v2"}]
+    assert cargar.llamadas == 2
+
+
+def test_desactivada_siempre_carga(reloj):
+    cache = CacheListas(ttl=0)
+    cargar = Carga()
+    cache.obtener("producto", cargar)
+    cache.obtener("producto", cargar)
+    assert cargar.llamadas == 2
+    assert not cache.activa
+
+
+def test_claves_independientes(reloj):
+    cache = CacheListas(ttl=10)
+    cargar = Carga()
+    cache.obtener("producto", cargar)
+    cache.obtener("cliente", cargar)
+    cache.invalidar("cliente")
+    cache.obtener("producto", cargar)
+    assert cargar.llamadas == 2
+
+
+def test_invalidar_obliga_a_recargar(reloj):
+    cache = CacheListas(ttl=10)
+    cargar = Carga()
+    cache.obtener("producto", cargar)
+    cache.invalidar("producto")
+    assert cache.obtener("producto", cargar) == [{"codigo": "v2"}]
+
+
+def test_carga_anterior_a_invalidar_no_se_guarda(reloj):
+    cache = CacheListas(ttl=10)
+    datos, version = cache.leer("producto")
+    assert datos is None
+    # Mientras la lista viene de la API otro hilo crea un registro
+    cache.invalidar("producto")
+    cache.guardar("producto", [{"codigo": "viejo"}], version)
+    assert cache.leer("producto")[0] is None
+
+
+def test_version_cambia_con_invalidar(reloj):
+    cache = CacheListas(ttl=10)
+    antes = cache.version("producto")
+    cache.invalidar("producto")
+    assert cache.version("producto") != antes
+
+
+def test_stale_sirve_la_vencida_y_recarga_en_segundo_plano(reloj):
+    cache = CacheListas(ttl=10, stale=30)
+    continuar = threading.Event()
+    recargada = threading.Event()
+    llamadas = []
+
+    def cargar():
+        llamadas.append(1)
+        if len(llamadas) > 1:
+            continuar.wait(5)
+        return [{"codigo": f"v{len(llamadas)}"}]
+
+    cache.obtener("producto", cargar)
+    reloj.ahora += 15
+    # Vencida pero dentro de la ventana stale: se responde sin esperar a la recarga
+    assert cache.obtener("producto", cargar) == [{"codigo": "v1"}]
+    # Una sola recarga aunque se lea varias veces mientras tanto
+    assert cache.obtener("producto", cargar) == [{"codigo": "v1"}]
+
+    original = cache.guardar
+
+    def guardar(*argumentos):
+        original(*argumentos)
+        recargada.set()
+
+    cache.guardar = guardar
+    continuar.set()
+    assert recargada.wait(5)
+    assert cache.obtener("producto", cargar) == [{"codigo": "v2"}]
+    assert len(llamadas) == 2
+    assert "cache_recargas_total 1" in cache.metricas()
+    assert "cache_vencidas_servidas_total 2" in cache.metricas()
+
+
+def test_fuera_de_la_ventana_stale_se_carga_de_inmediato(reloj):
+    cache = CacheListas(ttl=10, stale=30)
+    cargar = Carga()
+    cache.obtener("producto", cargar)
+    reloj.ahora += 40
+    assert cache.obtener("producto", cargar) == [{"codigo": "v2"}]
+
+
+def test_stale_no_sirve_una_lista_invalidada(reloj):
+    cache = CacheListas(ttl=10, stale=30)
+    cargar = Carga()
+    cache.obtener("producto", cargar)
+    reloj.ahora += 15
+    cache.invalidar("producto")
+    assert cache.obtener("producto", cargar) == [{"codigo": "v2"}]
+
+
+def test_ultima_conocida_ignora_vencimiento_e_invalidacion(reloj):
+    cache = CacheListas(ttl=10)
+    assert cache.ultima_conocida("producto") is None
+    cache.obtener("producto", Carga())
+    cache.invalidar("producto")
+    reloj.ahora += 100
+    assert cache.ultima_conocida("producto") == [{"codigo": "v1"}]
+
+
+def test_max_filas_descarta_la_menos_usada(reloj):
+    cache = CacheListas(ttl=10, max_filas=3)
+    cache.obtener("producto", lambda: [1, 2])
+    cache.obtener("cliente", lambda: [3])
+    cache.obtener("producto", Carga())
+    cache.obtener("factura", lambda: [4])
+    assert cache.leer("cliente")[0] is None
+    assert cache.leer("producto")[0] == [1, 2]
+    # Una lista que no cabe no se guarda
+    cache.obtener("vendedor", lambda: [1, 2, 3, 4])
+    assert cache.leer("vendedor")[0] is None
+
+
+def test_almacen_compartido_entre_workers(tmp_path):
+    # Dos cachés con el mismo almacén mmap se comportan como dos workers
+    primera = CacheListas(ttl=10, almacen=AlmacenMmap(str(tmp_path)))
+    segunda = CacheListas(ttl=10, almacen=AlmacenMmap(str(tmp_path)))
+    cargar = Carga()
+    primera.obtener("producto", cargar)
+    assert segunda.obtener("producto", cargar) == [{"codigo": "v1"}]
+    assert cargar.llamadas == 1
+    segunda.invalidar("producto")
+    assert primera.obtener("producto", cargar) == [{"codigo": "v2"}]
@@ -0,0 +1,100 @@
+import pytest
+
+from circuito import Circuito, CircuitoAbierto, RegistroCircuitos
+
+
+def _abrir(circuito):
+    for _ in range(circuito.fallos_maximos):
+        circuito.antes()
+        circuito.fallo()
+
+
+def test_cerrado_deja_pasar_y_un_exito_reinicia_los_fallos(reloj):
+    circuito = Circuito("producto", fallos_maximos=3, espera=10)
+    for _ in range(2):
+        circuito.antes()
+        circuito.fallo()
+    circuito.antes()
+    circuito.exito()
+    assert circuito.estado == Circuito.CERRADO
+    assert circuito.fallos == 0
+    circuito.antes()
+    circuito.fallo()
+    assert circuito.estado == Circuito.CERRADO
+
+
+# El reloj monotónico puede empezar en 0 (p. ej. recién arrancada la máquina)
+@pytest.mark.parametrize("reloj", [0.0, 1000.0], indirect=True)
+def test_se_abre_tras_los_fallos_seguidos(reloj):
+    circuito = Circuito("producto", fallos_maximos=3, espera=10)
+    _abrir(circuito)
+    assert circuito.estado == Circuito.ABIERTO
+    assert circuito.aperturas == 1
+    with pytest.raises(CircuitoAbierto):
+        circuito.antes()
+    reloj.ahora += 9.9
+    with pytest.raises(CircuitoAbierto):
+        circuito.antes()
+    assert circuito.rechazadas == 2
+
+
+def test_semiabierto_deja_pasar_una_sola_prueba(reloj):
+    circuito = Circuito("producto", fallos_maximos=2, espera=10)
+    _abrir(circuito)
+    reloj.ahora += 10
+    circuito.antes()
+    assert circuito.estado == Circuito.SEMIABIERTO
+    with pytest.raises(CircuitoAbierto):
+        circuito.antes()
+    assert circuito.rechazadas == 1
+
+
+def test_prueba_exitosa_cierra_el_circuito(reloj):
+    circuito = Circuito("producto", fallos_maximos=2, espera=10)
+    _abrir(circuito)
+    reloj.ahora += 10
+    circuito.antes()
+    circuito.exito()
+    assert circuito.estado == Circuito.CERRADO
+    assert circuito.fallos == 0
+    circuito.antes()
+    circuito.antes()
+
+
+def test_prueba_fallida_vuelve_a_abrir(reloj):
+    circuito = Circuito("producto", fallos_maximos=2, espera=10)
+    _abrir(circuito)
+    reloj.ahora += 10
+    circuito.antes()
+    circuito.fallo()
+    assert circuito.estado == Circuito.ABIERTO
+    assert circuito.aperturas == 2
+    # La espera vuelve a contar desde el último fallo
+    reloj.ahora += 5
+    with pytest.raises(CircuitoAbierto):
+        circuito.antes()
+    reloj.ahora += 5
+    circuito.antes()
+    assert circuito.estado == Circuito.SEMIABIERTO
+
+
+def test_prueba_que_nunca_termina_permite_otra(reloj):
+    circuito = Circuito("producto", fallos_maximos=1, espera=10)
+    _abrir(circuito)
+    reloj.ahora += 10
+    circuito.antes()
+    # La prueba se canceló sin llamar a exito() ni a fallo()
+    reloj.ahora += 10
+    circuito.antes()
+    assert circuito.estado == Circuito.SEMIABIERTO
+
+
+def test_registro_un_circuito_por_recurso(reloj):
+    registro = RegistroCircuitos(fallos_maximos=1, espera=10)
+    assert registro.obtener("producto") is registro.obtener("producto")
+    registro.obtener("producto").fallo()
+    registro.obtener("cliente").antes()
+    metricas = registro.metricas()
+    assert 'api_circuito_estado{recurso="producto"} 1' in metricas
+    assert 'api_circuito_estado{recurso="cliente"} 0' in metricas
+    assert 'api_circuito_aperturas_total{recurso="producto"} 1' in metricas
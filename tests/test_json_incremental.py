@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+import pytest
+
+from json_incremental import DecodificadorLista, iterar_lista, iterar_lista_async
+
+DOCUMENTO = {
+    "mensaje": "ok",
+    "otros": [1, {"datos": ["no"]}],
+    "datos": [
+        {"codigo": "p1", "nombre": "Ñandú €", "stock": 12},
+        {"codigo": "p2", "valor": 4.5e10, "activo": True, "nota": None},
+        123,
+        "texto con \"comillas\" y , ] }"
+    ],
+    "total": 4
+}
+
+
+def _partes(contenido, tamano):
+    return [contenido[i:i + tamano] for i in range(0, len(contenido), tamano)]
+
+
+@pytest.mark.parametrize("tamano", [1, 2, 3, 7, 64, 10_000])
+@pytest.mark.parametrize("sangria", [None, 2])
+def test_cualquier_corte_de_fragmentos(tamano, sangria):
+    # Los cortes caen dentro de textos, números y caracteres UTF-8 de varios bytes
+    contenido = json.dumps(DOCUMENTO, ensure_ascii=False, indent=sangria).encode("utf-8")
+    assert list(iterar_lista(_partes(contenido, tamano))) == DOCUMENTO["datos"]
+
+
+def test_numero_al_final_de_un_fragmento_no_se_corta():
+    assert list(iterar_lista([b'{"datos": [12', b'34, 5.', b'25e1]}'])) == [1234, 52.5]
+
+
+def test_documento_que_es_una_lista():
+    assert list(iterar_lista([b'[{"a": 1},', b' 2]'])) == [{"a": 1}, 2]
+
+
+@pytest.mark.parametrize("contenido, esperado", [
+    (b"{}", []),
+    (b'{"datos": []}', []),
+    (b'{"otro": 1}', []),
+    (b'{"datos": 5, "x": [1]}', []),
+])
+def test_documentos_sin_elementos(contenido, esperado):
+    assert list(iterar_lista(_partes(contenido, 3))) == esperado
+
+
+def test_lo_que_sigue_a_la_lista_no_se_lee():
+    leidos = []
+
+    def fragmentos():
+        for fragmento in (b'{"datos": [1, 2]', b', "total": 2}', b"basura"):
+            leidos.append(fragmento)
+            yield fragmento
+
+    assert list(iterar_lista(fragmentos())) == [1, 2]
+    assert leidos == [b'{"datos": [1, 2]']
+
+
+@pytest.mark.parametrize("contenido", [
+    b"",
+    b"x",
+    b'{"datos": [1, 2',
+    b'{"datos": [1,]}',
+    b'{"datos" [1]}',
+    b'{"datos": [1 2]}',
+    b'{"datos": [{"a": }]}',
+])
+def test_json_invalido_lanza_value_error(contenido):
+    with pytest.raises(ValueError):
+        list(iterar_lista(_partes(contenido, 2)))
+
+
+def test_elementos_anteriores_al_error_se_producen():
+    elementos = iterar_lista([b'{"datos": [1, 2, ', b"x]}"])
+    assert next(elementos) == 1
+    assert next(elementos) == 2
+    with pytest.raises(ValueError):
+        next(elementos)
+
+
+def test_decodificador_por_partes():
+    decodificador = DecodificadorLista()
+    assert decodificador.alimentar(b'{"datos": [{"a"') == []
+    assert decodificador.alimentar(b': 1}, {"b": 2}, 3') == [{"a": 1}, {"b": 2}]
+    assert not decodificador.terminado
+    assert decodificador.alimentar(b"]}") == [3]
+    assert decodificador.terminado
+    assert decodificador.terminar() == []
+
+
+def test_version_asincrona():
+    contenido = json.dumps(DOCUMENTO).encode("utf-8")
+
+    async def fragmentos():
+        for parte in _partes(contenido, 5):
+            yield parte
+
+    async def recorrer():
+        return [elemento async for elemento in iterar_lista_async(fragmentos())]
+
+    assert asyncio.run(recorrer()) == DOCUMENTO["datos"]
@@ -0,0 +1,86 @@
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from entidades import ENTIDADES
+from modelos import Factura, Producto
+
+PRODUCTO = next(entidad for entidad in ENTIDADES if entidad.nombre == "producto")
+FACTURA = next(entidad for entidad in ENTIDADES if entidad.nombre == "factura")
+
+
+def test_desde_api_sin_conversiones():
+    producto = Producto.desde_api({"codigo": "p1", "nombre": "Caja", "stock": 3, "otro": "x"})
+    assert producto.codigo == "p1"
+    assert producto.stock == 3
+    assert producto.valorunitario is None
+
+
+def test_se_lee_como_diccionario():
+    producto = Producto("p1", "Caja", 1500, 3)
+    assert dict(producto) == {"codigo": "p1", "nombre": "Caja", "valorunitario": 1500, "stock": 3}
+    assert producto["stock"] == 3
+    assert producto.get("inexistente", "x") == "x"
+    assert list(producto.values()) == ["p1", "Caja", 1500, 3]
+    assert len(producto) == 4
+    with pytest.raises(KeyError):
+        producto["inexistente"]
+
+
+def test_los_modelos_no_tienen_dict():
+    assert not hasattr(Producto("p1", "Caja", 1, 1), "__dict__")
+
+
+def test_validar_convierte_los_tipos():
+    producto = Producto.validar({"codigo": " p1 ", "nombre": "Caja", "valorunitario": " 1500 ", "stock": 3.0})
+    assert producto == Producto("p1", "Caja", 1500, 3)
+    factura = Factura.validar({"codigo": 7, "fecha": "2024-01-31", "cliente": "c1", "total": "12.5"})
+    assert factura == Factura("7", "2024-01-31", "c1", 12.5)
+
+
+@pytest.mark.parametrize("fila, mensaje", [
+    ({"nombre": "Caja", "valorunitario": 1, "stock": 1}, "falta el código"),
+    ({"codigo": "  ", "nombre": "Caja", "valorunitario": 1, "stock": 1}, "falta el código"),
+    ({"codigo": "p1", "valorunitario": 1, "stock": 1}, "falta el campo 'nombre'"),
+    ({"codigo": "p1", "nombre": "Caja", "valorunitario": 1, "stock": "diez"}, "'stock' debe ser int"),
+    ({"codigo": "p1", "nombre": "Caja", "valorunitario": 1, "stock": 2.5}, "'stock' debe ser int"),
+    ({"codigo": "p1", "nombre": "Caja", "valorunitario": True, "stock": 1}, "'valorunitario' debe ser int"),
+    ({"codigo": "p1", "nombre": "Caja", "valorunitario": [1], "stock": 1}, "'valorunitario' debe ser int"),
+])
+def test_validar_rechaza_filas_invalidas(fila, mensaje):
+    with pytest.raises(ValueError, match=mensaje):
+        Producto.validar(fila)
+
+
+def test_leer_formulario():
+    formulario = MultiDict({"codigo": "p1", "nombre": "Caja", "valorunitario": "1500", "stock": "3"})
+    assert PRODUCTO.leer_formulario(formulario) == {
+        "codigo": "p1", "nombre": "Caja", "valorunitario": 1500, "stock": 3
+    }
+
+
+def test_leer_formulario_sin_codigo_para_actualizar():
+    formulario = MultiDict({"codigo": "f1", "fecha": "2024-01-31", "cliente": "c1", "total": "99.9"})
+    assert FACTURA.leer_formulario(formulario, con_codigo=False) == {
+        "fecha": "2024-01-31", "cliente": "c1", "total": 99.9
+    }
+
+
+@pytest.mark.parametrize("cambios, mensaje", [
+    ({"stock": ""}, "'stock' debe ser int"),
+    ({"valorunitario": "mil"}, "'valorunitario' debe ser int"),
+    ({"codigo": ""}, "falta el código"),
+])
+def test_leer_formulario_invalido(cambios, mensaje):
+    formulario = MultiDict({"codigo": "p1", "nombre": "Caja", "valorunitario": "1500", "stock": "3", **cambios})
+    with pytest.raises(ValueError, match=mensaje):
+        PRODUCTO.leer_formulario(formulario)
+
+
+def test_leer_formulario_campo_ausente():
+    with pytest.raises(ValueError, match="falta el campo 'stock'"):
+        PRODUCTO.leer_formulario(MultiDict({"codigo": "p1", "nombre": "Caja", "valorunitario": "1"}))
+
+
+def test_modelos_de_la_api():
+    filas = PRODUCTO.modelos([{"codigo": "p1", "nombre": "Caja", "valorunitario": 1, "stock": 2}])
+    assert filas == [Producto("p1", "Caja", 1, 2)]
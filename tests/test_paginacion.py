@@ -0,0 +1,123 @@
+import pytest
+
+from paginacion import leer_parametros, paginar
+
+FILAS = [
+    {"codigo": f"p{i:02d}", "nombre": f"Producto {i}", "stock": (i * 7) % 10}
+    for i in range(1, 24)
+]
+FILAS.append({"codigo": "z99", "nombre": "Sin stock", "stock": None})
+CONFIG = {"PAGINA_TAMANO": 50, "PAGINA_TAMANO_MAXIMO": 200}
+
+
+def _paginar(filas, como_iterador, **parametros):
+    return paginar(iter(filas) if como_iterador else list(filas), **parametros)
+
+
+@pytest.fixture(params=[False, True], ids=["lista", "iterador"])
+def como_iterador(request):
+    return request.param
+
+
+def test_primera_pagina(como_iterador):
+    pagina = _paginar(FILAS, como_iterador, pagina=1, tamano=10)
+    assert [fila["codigo"] for fila in pagina.filas] == [fila["codigo"] for fila in FILAS[:10]]
+    assert pagina.total == 24
+    assert pagina.paginas == 3
+    assert not pagina.tiene_anterior and pagina.tiene_siguiente
+
+
+def test_ultima_pagina_incompleta(como_iterador):
+    pagina = _paginar(FILAS, como_iterador, pagina=3, tamano=10)
+    assert pagina.filas == FILAS[20:]
+    assert pagina.tiene_anterior and not pagina.tiene_siguiente
+
+
+@pytest.mark.parametrize("orden", ["", "stock", "-stock"])
+def test_pagina_inexistente_muestra_la_ultima(como_iterador, orden):
+    pagina = _paginar(FILAS, como_iterador, pagina=99, tamano=10, orden=orden)
+    esperada = paginar(list(FILAS), pagina=3, tamano=10, orden=orden)
+    assert pagina.pagina == 3
+    assert pagina.filas == esperada.filas
+
+
+def test_sin_filas(como_iterador):
+    pagina = _paginar([], como_iterador, pagina=5, tamano=10)
+    assert pagina.filas == []
+    assert pagina.pagina == 1
+    assert pagina.total == 0
+    assert pagina.paginas == 1
+
+
+def test_orden_ascendente_y_descendente(como_iterador):
+    ascendente = _paginar(FILAS, como_iterador, pagina=1, tamano=30, orden="stock").filas
+    descendente = _paginar(FILAS, como_iterador, pagina=1, tamano=30, orden="-stock").filas
+    stocks = [fila["stock"] for fila in ascendente]
+    # Los valores vacíos van al final en orden ascendente
+    assert stocks[:-1] == sorted(stocks[:-1])
+    assert stocks[-1] is None
+    assert [fila["stock"] for fila in descendente][1:] == sorted(stocks[:-1], reverse=True)
+
+
+def test_orden_por_pagina_igual_al_orden_completo(como_iterador):
+    completo = paginar(list(FILAS), pagina=1, tamano=100, orden="-nombre").filas
+    segunda = _paginar(FILAS, como_iterador, pagina=2, tamano=7, orden="-nombre")
+    assert segunda.filas == completo[7:14]
+
+
+def test_orden_de_textos_sin_distinguir_mayusculas(como_iterador):
+    filas = [{"nombre": "beta"}, {"nombre": "Alfa"}, {"nombre": "gamma"}, {"nombre": 3}]
+    pagina = _paginar(filas, como_iterador, tamano=10, orden="nombre")
+    assert [fila["nombre"] for fila in pagina.filas] == [3, "Alfa", "beta", "gamma"]
+
+
+def test_filtro(como_iterador):
+    pagina = _paginar(FILAS, como_iterador, pagina=1, tamano=5, q="PRODUCTO 1")
+    # Producto 1 y Producto 10 ... 19
+    assert pagina.total == 11
+    assert len(pagina.filas) == 5
+    assert all("producto 1" in fila["nombre"].lower() for fila in pagina.filas)
+
+
+def test_filtro_sin_resultados(como_iterador):
+    pagina = _paginar(FILAS, como_iterador, pagina=2, tamano=5, q="inexistente")
+    assert pagina.filas == []
+    assert pagina.total == 0
+    assert pagina.pagina == 1
+
+
+def test_filtro_y_orden(como_iterador):
+    pagina = _paginar(FILAS, como_iterador, pagina=1, tamano=3, orden="-codigo", q="producto 2")
+    assert [fila["codigo"] for fila in pagina.filas] == ["p23", "p22", "p21"]
+    assert pagina.total == 5
+
+
+def test_iterador_se_recorre_una_vez():
+    leidas = []
+
+    def filas():
+        for fila in FILAS:
+            leidas.append(fila)
+            yield fila
+
+    pagina = paginar(filas(), pagina=2, tamano=5)
+    assert pagina.filas == FILAS[5:10]
+    assert leidas == FILAS
+
+
+def test_parametros_de_la_pagina():
+    pagina = paginar(list(FILAS), pagina=2, tamano=10, orden="-stock")
+    assert pagina.parametros() == {"page": 2, "size": 10, "sort": "-stock"}
+    assert pagina.parametros(page=3, q="x") == {"page": 3, "size": 10, "sort": "-stock", "q": "x"}
+
+
+@pytest.mark.parametrize("args, esperados", [
+    ({}, {"pagina": 1, "tamano": 50, "orden": "", "q": ""}),
+    ({"page": "3", "size": "20", "sort": " -stock ", "q": " caja "},
+     {"pagina": 3, "tamano": 20, "orden": "-stock", "q": "caja"}),
+    ({"page": "0", "size": "0"}, {"pagina": 1, "tamano": 1, "orden": "", "q": ""}),
+    ({"page": "-4", "size": "5000"}, {"pagina": 1, "tamano": 200, "orden": "", "q": ""}),
+    ({"page": "dos", "size": "x"}, {"pagina": 1, "tamano": 50, "orden": "", "q": ""}),
+])
+def test_leer_parametros_limita_los_valores(args, esperados):
+    assert leer_parametros(args, CONFIG) == esperados
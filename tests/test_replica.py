@@ -0,0 +1,56 @@
+from replica import ReplicaMemoria, ReplicaSQLite
+
+
+def _workers(tmp_path):
+    # Dos instancias sobre el mismo archivo se comportan como dos workers
+    ruta = str(tmp_path / "replica.sqlite3")
+    return ReplicaSQLite(ruta), ReplicaSQLite(ruta)
+
+
+def test_sqlite_escritura_de_otro_worker_descarta_la_sincronizacion(tmp_path):
+    a, b = _workers(tmp_path)
+    assert a.reemplazar("producto", [{"codigo": "p1"}], a.version("producto"))
+
+    version = a.version("producto")
+    b.guardar("producto", {"codigo": "p2"})
+    assert not a.reemplazar("producto", [{"codigo": "p1"}], version)
+    assert b.buscar("producto", "p2") == {"codigo": "p2"}
+
+    b.eliminar("producto", "p1")
+    assert a.version("producto") == version + 2
+    assert [fila["codigo"] for fila in a.listar("producto")] == ["p2"]
+
+
+def test_sqlite_cargada_y_solicitudes_compartidas(tmp_path):
+    a, b = _workers(tmp_path)
+    assert not b.cargada("cliente")
+    assert b._vencidos(["cliente"], 60) == ["cliente"]
+
+    a.reemplazar("cliente", [], a.version("cliente"))
+    assert b.cargada("cliente")
+    assert b._vencidos(["cliente"], 60) == []
+
+    a.solicitar("cliente")
+    assert b._vencidos(["cliente"], 60) == ["cliente"]
+
+
+def test_sqlite_un_solo_worker_con_turno(tmp_path, monkeypatch):
+    a, b = _workers(tmp_path)
+    monkeypatch.setattr("replica.os.getpid", lambda: 100)
+    assert a._tomar_turno()
+    monkeypatch.setattr("replica.os.getpid", lambda: 200)
+    assert not b._tomar_turno()
+
+    # Si el turno vence sin renovarse, otro worker lo toma
+    with b._conexion() as conexion:
+        conexion.execute("UPDATE sincronizador SET vence = 0")
+    assert b._tomar_turno()
+
+
+def test_memoria_descarta_sincronizacion_tras_escritura():
+    replica = ReplicaMemoria()
+    replica.reemplazar("producto", [{"codigo": "p1"}], 0)
+    version = replica.version("producto")
+    replica.guardar("producto", {"codigo": "p2"})
+    assert not replica.reemplazar("producto", [{"codigo": "p1"}], version)
+    assert [fila["codigo"] for fila in replica.listar("producto")] == ["p1", "p2"]
@@ -0,0 +1,30 @@
+import pytest
+
+from app import aplicacion
+from cliente_api import ClienteAPI
+from modelos import Producto
+
+
+@pytest.fixture
+def api_caida():
+    # Puerto sin servidor: cada petición falla y el circuito se abre con el primer fallo
+    anterior = aplicacion.extensions["cliente_api"]
+    aplicacion.extensions["cliente_api"] = ClienteAPI("http://127.0.0.1:9/api", reintentos=0, circuito_fallos=1)
+    cache = aplicacion.extensions["cache_listas"]
+    cache.guardar("producto", [Producto("p1", "Caja", 1500, 3)], cache.version("producto"))
+    cache.invalidar("producto")
+    yield aplicacion.test_client()
+    aplicacion.extensions["cliente_api"] = anterior
+    cache.invalidar("producto")
+
+
+@pytest.mark.parametrize("veces", [1, 2])
+def test_buscar_con_la_api_caida_muestra_la_ultima_lista(api_caida, veces):
+    for _ in range(veces):
+        respuesta = api_caida.post("/productos/buscar", data={"codigo_buscar": "p1"})
+    texto = respuesta.get_data(as_text=True)
+    assert respuesta.status_code == 200
+    assert "aviso-desactualizado" in texto
+    assert "Caja" in texto
+    assert "No se pudo buscar producto p1: la API no responde" in texto
+    assert "Error en la búsqueda" not in texto
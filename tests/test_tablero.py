@@ -0,0 +1,50 @@
+import pytest
+
+from app import aplicacion
+from cliente_api import ClienteAPI
+from entidades import ENTIDADES
+from tablero import Tablero
+
+RESUMENES = [{"entidad": "productos", "registros": 1}]
+
+
+def test_guarda_el_resumen_de_esas_versiones():
+    tablero = Tablero(ENTIDADES, ttl=10)
+    datos = tablero.guardar((1, 2), RESUMENES, 0.01)
+    assert tablero.leer((1, 2)) is datos
+    assert tablero.leer((1, 3)) is None
+
+
+def test_no_guarda_un_resumen_con_errores():
+    tablero = Tablero(ENTIDADES, ttl=10)
+    tablero.guardar((1, 2), [{"entidad": "productos", "error": "sin conexión"}], 0.01)
+    assert tablero.leer((1, 2)) is None
+
+
+def test_no_guarda_un_resumen_desactualizado():
+    tablero = Tablero(ENTIDADES, ttl=10)
+    datos = tablero.guardar((1, 2), RESUMENES, 0.01, desactualizados=True)
+    assert datos["desactualizados"] is True
+    assert tablero.leer((1, 2)) is None
+
+
+@pytest.fixture
+def api_caida():
+    # Puerto sin servidor; la caché solo tiene copias invalidadas de todas las listas
+    anterior = aplicacion.extensions["cliente_api"]
+    aplicacion.extensions["cliente_api"] = ClienteAPI("http://127.0.0.1:9/api", reintentos=0, circuito_fallos=1)
+    cache = aplicacion.extensions["cache_listas"]
+    for entidad in ENTIDADES:
+        cache.guardar(entidad.recurso, [], cache.version(entidad.recurso))
+        cache.invalidar(entidad.recurso)
+    yield aplicacion.test_client()
+    aplicacion.extensions["cliente_api"] = anterior
+    for entidad in ENTIDADES:
+        cache.invalidar(entidad.recurso)
+
+
+def test_tablero_con_la_api_caida_no_se_sirve_como_vigente(api_caida):
+    for _ in range(2):
+        respuesta = api_caida.get("/tablero")
+        assert "aviso-desactualizado" in respuesta.get_data(as_text=True)
+    assert api_caida.get("/api/v1/tablero").get_json()["desactualizados"] is True